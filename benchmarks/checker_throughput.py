@@ -0,0 +1,119 @@
+"""
+Benchmark of availability checker throughput against local stub HTTP servers.
+
+Compares the serial `requests.get` loop that was used in `get_response_from_resources`
+with the concurrent `AvailabilityChecker`. No database is involved, only probing.
+
+Usage:
+    python benchmarks/checker_throughput.py --urls 5000 --hosts 8 --latency 0.05
+"""
+import argparse
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+import requests
+from aiohttp import web
+
+sys.path.append(str(Path(__file__).parents[1].resolve()))
+
+from src.checker.engine import AvailabilityChecker, CheckTarget  # noqa: E402
+
+
+def start_stub_servers(hosts: int, latency: float) -> list:
+    """Start stub HTTP servers in a background event loop. Return their base urls."""
+    loop = asyncio.new_event_loop()
+    ports = []
+    started = threading.Event()
+
+    async def handle(request: web.Request) -> web.Response:
+        await asyncio.sleep(latency)
+        status = 404 if request.path.endswith("/missing") else 200
+        return web.Response(status=status, text="ok")
+
+    async def serve():
+        for _ in range(hosts):
+            stub_app = web.Application()
+            stub_app.router.add_get("/{tail:.*}", handle)
+            runner = web.AppRunner(stub_app, access_log=None)
+            await runner.setup()
+            site = web.TCPSite(runner, "127.0.0.1", 0, backlog=4096)
+            await site.start()
+            ports.append(runner.addresses[0][1])
+        started.set()
+
+    def run_loop():
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(serve())
+        loop.run_forever()
+
+    threading.Thread(target=run_loop, daemon=True).start()
+    started.wait()
+    return [f"http://127.0.0.1:{port}" for port in ports]
+
+
+def make_urls(base_urls: list, count: int) -> list:
+    return [
+        f"{base_urls[i % len(base_urls)]}/resource/{i}{'/missing' if i % 10 == 0 else ''}"
+        for i in range(count)
+    ]
+
+
+def bench_serial(urls: list) -> float:
+    """Serial loop with the same request semantics as the old task. Return urls per second."""
+    started_at = time.perf_counter()
+    for url in urls:
+        try:
+            requests.get(url)
+        except requests.RequestException:
+            pass
+    return len(urls) / (time.perf_counter() - started_at)
+
+
+def bench_concurrent(urls: list, concurrency: int, per_host_concurrency: int) -> float:
+    """Concurrent checker. Return urls per second."""
+    checker = AvailabilityChecker(
+        concurrency=concurrency,
+        per_host_concurrency=per_host_concurrency,
+        total_timeout=30,
+    )
+    results = []
+    targets = (CheckTarget(resource_id=i, url=url) for i, url in enumerate(urls))
+
+    started_at = time.perf_counter()
+    checker.check(targets, on_result=results.append)
+    elapsed = time.perf_counter() - started_at
+
+    assert len(results) == len(urls)
+    print(f"connections reused:    {checker.connection_stats.connection_reuse_rate:10.1%}")
+    return len(urls) / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--urls", type=int, default=5000, help="number of urls for concurrent checker")
+    parser.add_argument("--serial-urls", type=int, default=200, help="number of urls for serial loop")
+    parser.add_argument("--hosts", type=int, default=8, help="number of stub hosts")
+    parser.add_argument("--latency", type=float, default=0.05, help="stub response latency, seconds")
+    parser.add_argument("--concurrency", type=int, default=1000)
+    parser.add_argument("--per-host-concurrency", type=int, default=100)
+    args = parser.parse_args()
+
+    base_urls = start_stub_servers(args.hosts, args.latency)
+
+    serial_rate = bench_serial(make_urls(base_urls, args.serial_urls))
+    print(f"serial requests loop:  {serial_rate:10.1f} urls/s ({args.serial_urls} urls)")
+
+    concurrent_rate = bench_concurrent(
+        make_urls(base_urls, args.urls),
+        concurrency=args.concurrency,
+        per_host_concurrency=args.per_host_concurrency,
+    )
+    print(f"concurrent checker:    {concurrent_rate:10.1f} urls/s ({args.urls} urls)")
+    print(f"speedup:               {concurrent_rate / serial_rate:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Benchmark of peak memory of reading uploaded archives with urls.
+
+Compares the old reader, which put all lines of the csv file into a list,
+with streaming `ziploader.iter_line_chunks`. Every reader runs in a separate process,
+so its peak RSS is measured independently. Only reading is measured, no validation or DB.
+
+Usage:
+    python benchmarks/import_memory.py --lines 5000000
+"""
+import argparse
+import csv
+import io
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+from typing import Callable
+
+sys.path.append(str(Path(__file__).parents[1].resolve()))
+
+
+def make_archive(path: str, lines: int):
+    """Write synthetic archive with csv file of urls without keeping it in memory."""
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        with archive.open("urls.csv", "w", force_zip64=True) as csv_file:
+            for i in range(lines):
+                csv_file.write(f"https://host{i % 5000}.example.com/path/{i}?q={i * 7919 % 100003}\n".encode())
+
+
+def read_to_list(zip_file: str) -> int:
+    """The old reader: all lines are collected before processing starts."""
+    with zipfile.ZipFile(file=zip_file, mode="r") as zip_ref:
+        lines = []
+        with zip_ref.open("urls.csv") as csv_data:
+            for row in csv.reader(io.TextIOWrapper(csv_data, "utf-8")):
+                lines.append(row[0])
+    return len(lines)
+
+
+def read_streaming(zip_file: str, chunk_size: int, iter_line_chunks: Callable) -> int:
+    lines = 0
+    with open(zip_file, "rb") as file:
+        for chunk in iter_line_chunks(file, zip_file, chunk_size=chunk_size):
+            lines += len(chunk.lines)
+    return lines
+
+
+def run_reader(reader: str, zip_file: str, chunk_size: int):
+    """Run one reader in this process and print lines, duration and peak RSS."""
+    # app is imported by the reader module before measurement, so its memory is the same for both readers
+    from src.utils.ziploader import iter_line_chunks
+
+    baseline_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    started_at = time.perf_counter()
+    if reader == "list":
+        lines = read_to_list(zip_file)
+    else:
+        lines = read_streaming(zip_file, chunk_size, iter_line_chunks)
+    duration = time.perf_counter() - started_at
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # ru_maxrss is in kilobytes on Linux
+    print(f"{lines} {duration} {baseline_rss / 1024} {peak_rss / 1024}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lines", type=int, default=5_000_000, help="number of lines in synthetic csv file")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="lines in one chunk of streaming reader")
+    parser.add_argument("--reader", choices=["list", "streaming"], help=argparse.SUPPRESS)
+    parser.add_argument("--zip-file", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.reader:
+        run_reader(args.reader, args.zip_file, args.chunk_size)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        zip_file = str(Path(tmp_dir) / "urls.zip")
+        make_archive(zip_file, args.lines)
+        print(f"archive: {args.lines} lines, {Path(zip_file).stat().st_size / 2 ** 20:.1f} MiB compressed")
+
+        for reader in ("list", "streaming"):
+            output = subprocess.run(
+                [sys.executable, __file__, "--reader", reader, "--zip-file", zip_file,
+                 "--chunk-size", str(args.chunk_size)],
+                capture_output=True, text=True, check=True,
+            ).stdout.split()
+            lines, duration, baseline_rss, peak_rss = output[-4:]
+            print(
+                f"{reader + ' reader:':18} {int(lines) / float(duration):10.0f} lines/s, "
+                f"peak RSS {float(peak_rss):7.1f} MiB (+{float(peak_rss) - float(baseline_rss):.1f} MiB while reading)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark of progress reporting of file processing in Redis.
+
+Compares the old reporting, which rewrote the whole JSON response with the growing list
+of invalid urls on every line, with `ProcessingProgress`. Only reporting is measured,
+lines are not validated or saved. Requires a running Redis.
+
+Usage:
+    python benchmarks/import_progress.py --lines 1000000 --error-rate 0.1
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+from redis import Redis
+
+sys.path.append(str(Path(__file__).parents[1].resolve()))
+
+from src.service.progress import ProcessingProgress, get_processing_progress  # noqa: E402
+
+
+def is_error(line_number: int, error_rate: float) -> bool:
+    return (line_number * 7919) % 1000 < error_rate * 1000
+
+
+def bench_json_rewrites(redis_client: Redis, lines: int, error_rate: float) -> float:
+    """Per-line JSON rewrite of the old task. Return lines per second."""
+    error_urls = []
+    task_response = {"status": "in_process", "total": lines, "processed": 0, "errors": {"count": 0, "error_urls": []}}
+
+    started_at = time.perf_counter()
+    for i in range(lines):
+        if is_error(i, error_rate):
+            error_urls.append(f"invalid url {i}")
+        task_response["processed"] = i + 1
+        task_response["errors"]["count"] = len(error_urls)
+        task_response["errors"]["error_urls"] = error_urls
+        redis_client.set(name="benchmark-json", value=json.dumps(task_response))
+    return lines / (time.perf_counter() - started_at)
+
+
+def bench_progress(redis_client: Redis, lines: int, error_rate: float, chunk_size: int) -> float:
+    """Coalesced reporting with counters in hash. Return lines per second."""
+    progress = ProcessingProgress(storage_client=redis_client, task_id="benchmark-progress")
+    progress.start(status="in_process")
+
+    started_at = time.perf_counter()
+    with progress:
+        for offset in range(0, lines, chunk_size):
+            chunk = range(offset, min(offset + chunk_size, lines))
+            progress.add(
+                processed=len(chunk),
+                error_urls=[f"invalid url {i}" for i in chunk if is_error(i, error_rate)],
+            )
+    progress.finish(status="succeeded", total=lines)
+    elapsed = time.perf_counter() - started_at
+
+    assert get_processing_progress(redis_client, "benchmark-progress")["processed"] == lines
+    return lines / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lines", type=int, default=1_000_000, help="number of lines for coalesced reporting")
+    parser.add_argument("--json-lines", type=int, default=20_000, help="number of lines for per-line JSON rewrites")
+    parser.add_argument("--error-rate", type=float, default=0.1, help="share of invalid urls")
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    parser.add_argument("--redis-url", default="redis://localhost:6379")
+    args = parser.parse_args()
+
+    redis_client = Redis.from_url(args.redis_url)
+
+    json_rate = bench_json_rewrites(redis_client, args.json_lines, args.error_rate)
+    print(f"per-line JSON rewrites: {json_rate:12.0f} lines/s ({args.json_lines} lines)")
+
+    progress_rate = bench_progress(redis_client, args.lines, args.error_rate, args.chunk_size)
+    print(f"coalesced progress:     {progress_rate:12.0f} lines/s ({args.lines} lines)")
+    print(f"speedup:                {progress_rate / json_rate:12.0f}x")
+
+    redis_client.delete("benchmark-json", "benchmark-progress:progress", "benchmark-progress:error_urls")
+
+
+if __name__ == "__main__":
+    main()
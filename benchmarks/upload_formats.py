@@ -0,0 +1,110 @@
+"""
+Benchmark of throughput of uploaded files of every supported format.
+
+For every format a synthetic file with the same urls is saved to the upload store in chunks,
+as web nodes do, and read back by `ziploader.iter_line_chunks`, as import tasks do.
+Only storing and reading are measured, no validation or DB.
+Local directory store is used by default, redis store is measured too if redis url is given.
+
+Usage:
+    python benchmarks/upload_formats.py --lines 1000000 --redis-url redis://localhost:6379
+"""
+import argparse
+import gzip
+import io
+import json
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+from redis import Redis
+
+sys.path.append(str(Path(__file__).parents[1].resolve()))
+
+from src.service.upload_store import (LocalUploadStore,  # noqa: E402
+                                      RedisUploadStore)
+from src.utils import ziploader  # noqa: E402
+
+
+def make_urls(lines: int) -> list:
+    return [f"https://host{i % 5000}.example.com/path/{i}?q={i * 7919 % 100003}" for i in range(lines)]
+
+
+def make_csv(urls: list) -> bytes:
+    return "".join(f"{url}\n" for url in urls).encode()
+
+
+def make_ndjson(urls: list) -> bytes:
+    return "".join(json.dumps({"url": url}) + "\n" for url in urls).encode()
+
+
+def make_zip(files: dict) -> bytes:
+    file = io.BytesIO()
+    with zipfile.ZipFile(file, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, data in files.items():
+            archive.writestr(name, data)
+    return file.getvalue()
+
+
+def make_files(urls: list, members: int) -> dict:
+    """Build file of every format with the same urls. Return file contents by file name."""
+    part_size = -(-len(urls) // members)
+    parts = [urls[i:i + part_size] for i in range(0, len(urls), part_size)]
+
+    return {
+        "urls.zip": make_zip({"urls.csv": make_csv(urls)}),
+        f"urls-{members}-files.zip": make_zip({f"urls-{i}.csv": make_csv(part) for i, part in enumerate(parts)}),
+        "urls.csv.gz": gzip.compress(make_csv(urls)),
+        "urls.ndjson": make_ndjson(urls),
+        "urls.ndjson.gz": gzip.compress(make_ndjson(urls)),
+    }
+
+
+def bench_format(store, filename: str, data: bytes, chunk_size: int) -> tuple:
+    """Save file to store and read all its lines. Return upload MiB/s, lines/s of reading and number of lines."""
+    started_at = time.perf_counter()
+    store.save(filename, io.BytesIO(data))
+    upload_duration = time.perf_counter() - started_at
+
+    lines = 0
+    started_at = time.perf_counter()
+    with store.open(filename) as file:
+        for chunk in ziploader.iter_line_chunks(file, filename, chunk_size=chunk_size):
+            lines += len(chunk.lines)
+    read_duration = time.perf_counter() - started_at
+
+    store.delete(filename)
+    return len(data) / 2 ** 20 / upload_duration, lines / read_duration, lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lines", type=int, default=1_000_000, help="number of urls in every file")
+    parser.add_argument("--members", type=int, default=4, help="number of csv files in multi-file archive")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="lines in one chunk of reader")
+    parser.add_argument("--upload-chunk-size", type=int, default=2 ** 20, help="bytes written to store at once")
+    parser.add_argument("--redis-url", help="measure redis store too")
+    args = parser.parse_args()
+
+    files = make_files(make_urls(args.lines), args.members)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        stores = {"local": LocalUploadStore(folder=tmp_dir, chunk_size=args.upload_chunk_size)}
+        if args.redis_url:
+            stores["redis"] = RedisUploadStore(Redis.from_url(args.redis_url), chunk_size=args.upload_chunk_size)
+
+        for store_name, store in stores.items():
+            print(f"{store_name} store:")
+            for filename, data in files.items():
+                upload_rate, read_rate, lines = bench_format(store, filename, data, args.chunk_size)
+                assert lines == args.lines
+                print(
+                    f"  {filename:20} {len(data) / 2 ** 20:7.1f} MiB  "
+                    f"upload {upload_rate:8.1f} MiB/s  read {read_rate:10.0f} lines/s"
+                )
+
+
+if __name__ == "__main__":
+    main()
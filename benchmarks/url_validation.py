@@ -0,0 +1,72 @@
+"""
+Microbenchmark of validation and parsing of urls from uploaded files.
+
+Compares the per-line pydantic path, `ResourceAddRequestSchema.parse_obj` with `ValidationError`
+handling followed by `parse_url` building `ResourceNoUUIDSchema`, with batch `urlvalidator.parse_urls`.
+
+Usage:
+    python benchmarks/url_validation.py --lines 200000 --error-rate 0.1
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+from pydantic import ValidationError
+
+sys.path.append(str(Path(__file__).parents[1].resolve()))
+
+from src.schemes.web_resources import ResourceAddRequestSchema  # noqa: E402
+from src.utils.urlparser import parse_url  # noqa: E402
+from src.utils.urlvalidator import parse_urls  # noqa: E402
+
+
+def make_lines(count: int, error_rate: float) -> list:
+    rng = random.Random(0)
+    lines = []
+    for i in range(count):
+        if rng.random() < error_rate:
+            lines.append(rng.choice(["not a url", "ftp://example.com/file", "http://", f"example{i}.com"]))
+        else:
+            lines.append(f"https://host{i % 5000}.example.com/path/{i}?q={i * 7919 % 100003}")
+    return lines
+
+
+def bench_pydantic(lines: list) -> float:
+    """Per-line pydantic models and exceptions. Return lines per second."""
+    started_at = time.perf_counter()
+    for line in lines:
+        try:
+            validated_url = ResourceAddRequestSchema.parse_obj({"full_url": line})
+            parse_url(validated_url.full_url)
+        except ValidationError:
+            pass
+    return len(lines) / (time.perf_counter() - started_at)
+
+
+def bench_batch(lines: list) -> float:
+    """Batch validator. Return lines per second."""
+    started_at = time.perf_counter()
+    parse_urls(lines)
+    return len(lines) / (time.perf_counter() - started_at)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lines", type=int, default=200_000)
+    parser.add_argument("--error-rate", type=float, default=0.1, help="share of invalid urls")
+    args = parser.parse_args()
+
+    lines = make_lines(args.lines, args.error_rate)
+
+    pydantic_rate = bench_pydantic(lines)
+    print(f"pydantic per line:  {pydantic_rate:10.0f} lines/s")
+
+    batch_rate = bench_batch(lines)
+    print(f"batch validator:    {batch_rate:10.0f} lines/s")
+    print(f"speedup:            {batch_rate / pydantic_rate:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
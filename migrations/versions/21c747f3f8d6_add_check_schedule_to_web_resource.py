@@ -0,0 +1,35 @@
+"""add check schedule to web resource
+
+Revision ID: 21c747f3f8d6
+Revises: 32cf8128df4f
+Create Date: 2026-10-18 13:05:41.518306
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '21c747f3f8d6'
+down_revision = '32cf8128df4f'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('web_resource', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('check_interval', sa.Integer(), nullable=True))
+        # existing resources become due for check right after migration
+        batch_op.add_column(sa.Column(
+            'next_check_at',
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.text('now()'),
+        ))
+        batch_op.create_index(batch_op.f('ix_web_resource_next_check_at'), ['next_check_at'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('web_resource', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_web_resource_next_check_at'))
+        batch_op.drop_column('next_check_at')
+        batch_op.drop_column('check_interval')
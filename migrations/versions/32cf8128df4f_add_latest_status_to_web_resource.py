@@ -0,0 +1,47 @@
+"""add latest status to web resource
+
+Revision ID: 32cf8128df4f
+Revises: 02cbdcf38d93
+Create Date: 2026-10-18 12:50:12.402113
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '32cf8128df4f'
+down_revision = '02cbdcf38d93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('web_resource', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('last_status_code', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('last_is_available', sa.Boolean(), nullable=True))
+        batch_op.add_column(sa.Column('last_checked_at', sa.DateTime(timezone=True), nullable=True))
+        batch_op.create_index(batch_op.f('ix_web_resource_last_is_available'), ['last_is_available'], unique=False)
+
+    # backfill latest status of every resource from the status history
+    op.execute(
+        """
+        UPDATE web_resource
+        SET last_status_code = latest_status.status_code,
+            last_is_available = latest_status.is_available,
+            last_checked_at = latest_status.request_time
+        FROM (
+            SELECT DISTINCT ON (resource_id) resource_id, status_code, is_available, request_time
+            FROM web_resource_status
+            ORDER BY resource_id, request_time DESC, id DESC
+        ) AS latest_status
+        WHERE web_resource.id = latest_status.resource_id
+        """
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('web_resource', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_web_resource_last_is_available'))
+        batch_op.drop_column('last_checked_at')
+        batch_op.drop_column('last_is_available')
+        batch_op.drop_column('last_status_code')
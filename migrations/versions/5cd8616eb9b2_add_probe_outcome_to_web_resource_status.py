@@ -0,0 +1,31 @@
+"""add probe outcome to web resource status
+
+Revision ID: 5cd8616eb9b2
+Revises: 21c747f3f8d6
+Create Date: 2026-10-18 13:31:07.265940
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '5cd8616eb9b2'
+down_revision = '21c747f3f8d6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    ProbeOutcome = sa.Enum('RESPONDED', 'TIMEOUT', 'CONNECTION_ERROR', name='probeoutcome')
+    ProbeOutcome.create(op.get_bind())
+
+    with op.batch_alter_table('web_resource_status', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('outcome', ProbeOutcome, nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('web_resource_status', schema=None) as batch_op:
+        batch_op.drop_column('outcome')
+
+    ProbeOutcome = sa.Enum('RESPONDED', 'TIMEOUT', 'CONNECTION_ERROR', name='probeoutcome')
+    ProbeOutcome.drop(op.get_bind())
@@ -0,0 +1,26 @@
+"""add details to news feed item
+
+Revision ID: 6f0c2d9a1b47
+Revises: 94abaf5a29ce
+Create Date: 2026-10-18 15:02:11.318204
+
+"""
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '6f0c2d9a1b47'
+down_revision = '94abaf5a29ce'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('news_feed_item', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('details', postgresql.JSON(astext_type=sa.Text()), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('news_feed_item', schema=None) as batch_op:
+        batch_op.drop_column('details')
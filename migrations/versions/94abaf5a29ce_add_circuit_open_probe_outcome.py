@@ -0,0 +1,30 @@
+"""add circuit open probe outcome
+
+Revision ID: 94abaf5a29ce
+Revises: dd398e0ec849
+Create Date: 2026-10-18 14:12:36.180442
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '94abaf5a29ce'
+down_revision = 'dd398e0ec849'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("ALTER TYPE probeoutcome ADD VALUE IF NOT EXISTS 'CIRCUIT_OPEN'")
+
+
+def downgrade():
+    # postgres can not drop a value from enum type, so the type is recreated without it
+    op.execute("UPDATE web_resource_status SET outcome = 'CONNECTION_ERROR' WHERE outcome = 'CIRCUIT_OPEN'")
+    op.execute("ALTER TYPE probeoutcome RENAME TO probeoutcome_old")
+    op.execute("CREATE TYPE probeoutcome AS ENUM ('RESPONDED', 'TIMEOUT', 'CONNECTION_ERROR')")
+    op.execute(
+        "ALTER TABLE web_resource_status "
+        "ALTER COLUMN outcome TYPE probeoutcome USING outcome::text::probeoutcome"
+    )
+    op.execute("DROP TYPE probeoutcome_old")
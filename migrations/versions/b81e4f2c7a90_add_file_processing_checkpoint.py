@@ -0,0 +1,37 @@
+"""add file processing checkpoint
+
+Revision ID: b81e4f2c7a90
+Revises: 6f0c2d9a1b47
+Create Date: 2026-10-18 17:21:40.552817
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'b81e4f2c7a90'
+down_revision = '6f0c2d9a1b47'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'file_processing_checkpoint',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('request_id', sa.Integer(), nullable=False),
+        sa.Column('start_line', sa.Integer(), nullable=False),
+        sa.Column('stop_line', sa.Integer(), nullable=False),
+        sa.Column('next_line', sa.Integer(), nullable=False),
+        sa.Column('processed_count', sa.Integer(), nullable=False),
+        sa.Column('inserted_count', sa.Integer(), nullable=False),
+        sa.Column('errors_count', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['request_id'], ['file_processing_request.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('request_id', 'start_line')
+    )
+
+
+def downgrade():
+    op.drop_table('file_processing_checkpoint')
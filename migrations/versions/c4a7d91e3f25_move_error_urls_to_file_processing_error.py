@@ -0,0 +1,61 @@
+"""move error urls to file processing error
+
+Revision ID: c4a7d91e3f25
+Revises: b81e4f2c7a90
+Create Date: 2026-10-18 18:05:12.904310
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'c4a7d91e3f25'
+down_revision = 'b81e4f2c7a90'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'file_processing_error',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('request_id', sa.Integer(), nullable=False),
+        sa.Column('line_number', sa.Integer(), nullable=False),
+        sa.Column('line', sa.String(), nullable=False),
+        sa.Column('reason', sa.String(), nullable=False),
+        sa.ForeignKeyConstraint(['request_id'], ['file_processing_request.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('request_id', 'line_number')
+    )
+
+    # line numbers of errors were not stored before, so they are numbered in order of the array
+    op.execute(
+        """
+        INSERT INTO file_processing_error (request_id, line_number, line, reason)
+        SELECT id, error.ordinality, error.line, 'value_error'
+        FROM file_processing_request, unnest(error_urls) WITH ORDINALITY AS error(line, ordinality)
+        """
+    )
+
+    with op.batch_alter_table('file_processing_request', schema=None) as batch_op:
+        batch_op.drop_column('error_urls')
+
+
+def downgrade():
+    with op.batch_alter_table('file_processing_request', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('error_urls', sa.ARRAY(sa.String()), nullable=True))
+
+    op.execute(
+        """
+        UPDATE file_processing_request
+        SET error_urls = errors.lines
+        FROM (
+            SELECT request_id, array_agg(line ORDER BY line_number) AS lines
+            FROM file_processing_error
+            GROUP BY request_id
+        ) AS errors
+        WHERE file_processing_request.id = errors.request_id
+        """
+    )
+
+    op.drop_table('file_processing_error')
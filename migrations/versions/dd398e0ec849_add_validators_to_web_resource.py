@@ -0,0 +1,27 @@
+"""add validators to web resource
+
+Revision ID: dd398e0ec849
+Revises: 5cd8616eb9b2
+Create Date: 2026-10-18 13:48:52.904117
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = 'dd398e0ec849'
+down_revision = '5cd8616eb9b2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('web_resource', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('etag', sa.String(), nullable=True))
+        batch_op.add_column(sa.Column('last_modified', sa.String(), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('web_resource', schema=None) as batch_op:
+        batch_op.drop_column('last_modified')
+        batch_op.drop_column('etag')
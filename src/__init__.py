@@ -23,5 +23,5 @@ from src.api import routes as api_routes
 
 app.register_blueprint(blueprint=bp)
 socketio.init_app(app)
-celery_socketio.init_app(app)
+celery_socketio.init_app(app, message_queue=app.config["SOCKETIO_MESSAGE_QUEUE"])
 app.logger.info("app started")
@@ -1,14 +1,17 @@
 from dataclasses import asdict
 
 from flask import Response, jsonify, request, url_for
+from flask_socketio import emit, join_room
 from pydantic import ValidationError
 
 from src import app, bp, celery_socketio, log_buffer, socketio
 from src.repositories.processing_requests import ProcessingRequestRepository
 from src.repositories.web_resources import WebResourceRepository
 from src.service import exceptions, handlers
+from src.service.progress import PROGRESS_NAMESPACE, progress_room
 from src.service.web_resources import WebResourceService
-from src.utils.helpers import convert_to_serializable, make_int
+from src.utils.helpers import (conditional_response, convert_to_serializable,
+                               make_int)
 from src.web.app import db
 
 
@@ -21,17 +24,21 @@ def get_resources():
     availability = request.args.get('availability')
     page = make_int(request.args.get('page', default=1, type=int))
     per_page = make_int(request.args.get('per_page', default=10, type=int))
+    # keyset pagination is used if cursor is given, empty cursor is the first page
+    cursor = make_int(request.args.get('cursor'))
 
-    response = handlers.handle_get_resources_with_filters(
+    response = handlers.handle_get_cached_resources_with_filters(
         domain_zone=domain_zone,
         resource_id=resource_id,
         availability=availability,
         page=page,
         per_page=per_page,
         uuid=uuid,
+        cursor=cursor,
+        use_cursor='cursor' in request.args,
     )
 
-    return jsonify(response.dict())
+    return conditional_response(Response(response, mimetype="application/json"))
 
 
 @bp.route("/resources", methods=['POST'])
@@ -65,7 +72,7 @@ def create_url():
         try:
             processing_request = handlers.handle_post_url_file(request.files)
             app.logger.info(
-                f"201 - User posted ZIP archive with URLs on {url_for('.create_url')}"
+                f"201 - User posted file with URLs on {url_for('.create_url')}"
             )
             return jsonify(asdict(processing_request)), 201
         except ValidationError as e:
@@ -75,13 +82,15 @@ def create_url():
                 'message': errors,
             }
             return jsonify(response), 400
+        except exceptions.InvalidFileFormatError as e:
+            return jsonify({'error': 'Validation error', 'message': str(e)}), 400
 
     else:
         app.logger.info(
             f"400 - User made bad request to {url_for('.create_url')}"
         )
         return jsonify(
-            {"Error": "Invalid request format. Send URL via JSON or zip archive via multipart/form-data."}
+            {"Error": "Invalid request format. Send URL via JSON or file with urls via multipart/form-data."}
         ), 400
 
 
@@ -108,13 +117,59 @@ def get_status_of_processing_request(request_id: int):
             request_id=request_id,
             storage_client=app.extensions["redis"],
         )
-        return jsonify(status_info)
+        return conditional_response(jsonify(status_info))
+
+    except exceptions.ResourceNotFoundError:
+        app.logger.info(f"404 - GET request to {request.url} with non-existing ID")
+        return jsonify({"Error": "Request with the given ID was not found."}), 404
+
+
+@bp.route("/processing-requests/<int:request_id>/errors", methods=["GET"])
+def get_errors_of_processing_request(request_id: int):
+    """Router for getting invalid lines of processed file, paginated by line number."""
+    cursor = make_int(request.args.get("cursor"))
+    limit = make_int(request.args.get("limit", default=100, type=int)) or 100
+
+    try:
+        response = handlers.handle_get_request_errors(
+            request_id=request_id,
+            cursor=cursor,
+            limit=min(limit, 1000),
+        )
+        return jsonify(response.dict())
 
     except exceptions.ResourceNotFoundError:
         app.logger.info(f"404 - GET request to {request.url} with non-existing ID")
         return jsonify({"Error": "Request with the given ID was not found."}), 404
 
 
+@bp.route("/checker/circuit-breakers", methods=["GET"])
+def get_circuit_breakers():
+    """Router for getting open circuit breakers of the availability checker."""
+    response = handlers.handle_get_circuit_breakers(
+        storage_client=app.extensions["redis"],
+    )
+    return jsonify(response.dict())
+
+
+@bp.route("/url-filter", methods=["GET"])
+def get_url_filter_stats():
+    """Router for getting stats of the bloom filter used to skip lookups of new urls."""
+    response = handlers.handle_get_url_filter_stats(
+        storage_client=app.extensions["redis"],
+    )
+    return jsonify(response.dict())
+
+
+@bp.route("/response-cache", methods=["GET"])
+def get_response_cache_stats():
+    """Router for getting hit rate and latency of the cache of resource lists."""
+    response = handlers.handle_get_response_cache_stats(
+        storage_client=app.extensions["redis"],
+    )
+    return jsonify(response.dict())
+
+
 @bp.route("/resources/<uuid:resource_uuid>", methods=["POST"])
 def post_image_for_resource(resource_uuid: str):
     """Router for posting images for resource with the given UUID."""
@@ -166,3 +221,30 @@ def connect():
     logs = log_buffer
     celery_socketio.emit(event="init_logs", data={"logs": logs}, namespace="/logs")
     socketio.emit(event="init_logs", data={"logs": logs}, namespace="/logs")
+
+
+@socketio.on("join", namespace=PROGRESS_NAMESPACE)
+@celery_socketio.on("join", namespace=PROGRESS_NAMESPACE)
+def join_processing_request(data):
+    """Subscribe client to progress of file processing. Current status is sent first, then updates."""
+    request_id = make_int(data.get("request_id"))
+    if request_id is None:
+        return
+
+    try:
+        status_info = handlers.handle_get_request_status(
+            request_id=request_id,
+            storage_client=app.extensions["redis"],
+        )
+    except exceptions.ResourceNotFoundError:
+        return
+
+    # updates carry counters summed by redis, so an update pushed before the status does not skew it
+    join_room(progress_room(request_id))
+    # counters of processing that is not started yet are not set
+    emit("status", {
+        **status_info,
+        "processed": status_info["processed"] or 0,
+        "progress": status_info["progress"] or 0,
+        "errors": {**status_info["errors"], "count": status_info["errors"]["count"] or 0},
+    })
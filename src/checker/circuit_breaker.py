@@ -0,0 +1,139 @@
+import json
+import time
+from dataclasses import asdict, dataclass
+from enum import Enum
+from typing import Dict, Optional
+
+import redis.asyncio as redis
+
+from src.db.models import ProbeOutcome
+
+CIRCUIT_BREAKERS_KEY = "checker:circuit_breakers"
+
+# outcomes meaning that host itself could not be reached
+CONNECTION_FAILURE_OUTCOMES = {ProbeOutcome.TIMEOUT, ProbeOutcome.CONNECTION_ERROR}
+
+
+class BreakerState(Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+@dataclass
+class DomainBreaker:
+    """State of circuit breaker for one domain."""
+    state: str = BreakerState.CLOSED.value
+    consecutive_failures: int = 0
+    opened_at: Optional[float] = None
+    probe_in_flight: bool = False
+
+
+class DomainCircuitBreaker:
+    """
+    Circuit breakers keyed by domain.
+    Breaker of a domain opens after `failure_threshold` consecutive connection-level failures,
+    and while it is open probes of the domain are short-circuited without network I/O.
+    After `cooldown` seconds one probe is let through (half-open state): its success closes
+    the breaker and its failure opens it again.
+
+    States of open breakers and counts of short-circuited probes are published to Redis,
+    if redis url is given, so they can be shown by API and picked up by other workers.
+    Breaker must be opened with `async with` inside the event loop that uses it.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        cooldown: float = 300,
+        redis_url: Optional[str] = None,
+        key: str = CIRCUIT_BREAKERS_KEY,
+    ):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.redis_url = redis_url
+        self.key = key
+        self.hits_key = f"{key}:hits"
+        self._breakers: Dict[str, DomainBreaker] = {}
+        self._hits: Dict[str, int] = {}
+        self._redis: Optional[redis.Redis] = None
+
+    async def __aenter__(self) -> "DomainCircuitBreaker":
+        if self.redis_url:
+            self._redis = redis.from_url(self.redis_url)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        if self._redis:
+            if self._hits:
+                async with self._redis.pipeline(transaction=False) as pipe:
+                    for domain, hits in self._hits.items():
+                        pipe.hincrby(self.hits_key, domain, hits)
+                    await pipe.execute()
+            await self._redis.close()
+            await self._redis.connection_pool.disconnect()
+            self._redis = None
+        self._hits = {}
+
+    async def allow(self, domain: str) -> bool:
+        """Check whether a probe of the domain should be made. Count short-circuited probe otherwise."""
+        breaker = await self._get_breaker(domain)
+
+        if breaker.state == BreakerState.OPEN.value and time.time() - breaker.opened_at >= self.cooldown:
+            breaker.state = BreakerState.HALF_OPEN.value
+            await self._publish(domain, breaker)
+
+        if breaker.state == BreakerState.CLOSED.value:
+            return True
+
+        if breaker.state == BreakerState.HALF_OPEN.value and not breaker.probe_in_flight:
+            breaker.probe_in_flight = True
+            return True
+
+        self._hits[domain] = self._hits.get(domain, 0) + 1
+        return False
+
+    async def record(self, domain: str, outcome: ProbeOutcome):
+        """Update breaker of the domain with outcome of the probe."""
+        breaker = await self._get_breaker(domain)
+        breaker.probe_in_flight = False
+
+        if outcome not in CONNECTION_FAILURE_OUTCOMES:
+            self._breakers[domain] = DomainBreaker()
+            if breaker.state != BreakerState.CLOSED.value:
+                await self._publish(domain, self._breakers[domain])
+            return
+
+        breaker.consecutive_failures += 1
+
+        if breaker.state == BreakerState.HALF_OPEN.value or (
+            breaker.state == BreakerState.CLOSED.value
+            and breaker.consecutive_failures >= self.failure_threshold
+        ):
+            breaker.state = BreakerState.OPEN.value
+            breaker.opened_at = time.time()
+            await self._publish(domain, breaker)
+
+    async def _get_breaker(self, domain: str) -> DomainBreaker:
+        """Get breaker of the domain, restoring breaker opened by another worker from Redis."""
+        if domain not in self._breakers:
+            breaker = DomainBreaker()
+            if self._redis:
+                published = await self._redis.hget(self.key, domain)
+                if published:
+                    breaker = DomainBreaker(**json.loads(published))
+                    breaker.probe_in_flight = False
+            # breaker could be created by concurrent probe while Redis was queried
+            self._breakers.setdefault(domain, breaker)
+
+        return self._breakers[domain]
+
+    async def _publish(self, domain: str, breaker: DomainBreaker):
+        """Save state of breaker to Redis. Closed breakers are removed."""
+        if not self._redis:
+            return
+
+        if breaker.state == BreakerState.CLOSED.value:
+            await self._redis.hdel(self.key, domain)
+        else:
+            await self._redis.hset(self.key, domain, json.dumps(asdict(breaker)))
@@ -0,0 +1,331 @@
+import asyncio
+from contextlib import AsyncExitStack, asynccontextmanager, nullcontext
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Optional
+from urllib.parse import urlsplit
+
+import aiohttp
+from aiohttp import hdrs
+
+from src.checker.circuit_breaker import DomainCircuitBreaker
+from src.checker.head_support import HeadSupportCache
+from src.db.models import ProbeOutcome
+
+if TYPE_CHECKING:
+    from src.checker.politeness import DomainRateLimiter
+
+
+@dataclass
+class CheckTarget:
+    """Resource that should be probed by the checker."""
+    resource_id: int
+    url: str
+    was_available: Optional[bool] = None
+    domain: Optional[str] = None
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+@dataclass
+class CheckResult:
+    """
+    Result of a single availability probe. Status code is None if no response was received.
+    Validators are the ones that should be sent with the next conditional request.
+    Resource skipped by an open circuit breaker was not contacted, so its status is not changed.
+    """
+    resource_id: int
+    status_code: Optional[int]
+    is_available: bool
+    was_available: Optional[bool] = None
+    outcome: ProbeOutcome = ProbeOutcome.RESPONDED
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    @property
+    def status_changed(self) -> bool:
+        return self.outcome != ProbeOutcome.CIRCUIT_OPEN and self.was_available != self.is_available
+
+
+ResultCallback = Callable[[CheckResult], None]
+
+# status codes meaning that server does not support HEAD method
+HEAD_REJECTED_STATUS_CODES = {405, 501}
+
+
+@dataclass
+class ConnectionStats:
+    """Counters of connection reuse and DNS cache usage during one checker run."""
+    connections_created: int = 0
+    connections_reused: int = 0
+    dns_cache_hits: int = 0
+    dns_cache_misses: int = 0
+
+    @property
+    def connection_reuse_rate(self) -> float:
+        total = self.connections_created + self.connections_reused
+        return self.connections_reused / total if total else 0
+
+    @property
+    def dns_cache_hit_rate(self) -> float:
+        total = self.dns_cache_hits + self.dns_cache_misses
+        return self.dns_cache_hits / total if total else 0
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        """Make aiohttp trace config that updates these counters."""
+        trace_config = aiohttp.TraceConfig()
+
+        def make_counter(field_name: str):
+            async def increment(session, trace_config_ctx, params):
+                setattr(self, field_name, getattr(self, field_name) + 1)
+            return increment
+
+        trace_config.on_connection_create_end.append(make_counter("connections_created"))
+        trace_config.on_connection_reuseconn.append(make_counter("connections_reused"))
+        trace_config.on_dns_cache_hit.append(make_counter("dns_cache_hits"))
+        trace_config.on_dns_cache_miss.append(make_counter("dns_cache_misses"))
+        return trace_config
+
+
+def is_available_status(status_code: int) -> bool:
+    """Check whether the given HTTP status code means that resource is available."""
+    return status_code in range(200, 400)
+
+
+class AvailabilityChecker:
+    """
+    Concurrent availability checker running all probes on a single event loop.
+    Number of probes in flight is limited globally and for every host.
+    If rate limiter is given, probes of every domain also respect its shared limits.
+    Probe waits for limits of its domain before it takes a global slot, so probes of a throttled domain
+    do not keep global slots idle. Up to `max_pending` targets are read ahead while they wait.
+
+    Every probe is bounded by connect, read and total deadlines (seconds).
+    After headers at most `max_body_bytes` of body are read and the rest is dropped
+    with the connection, so large files are never downloaded.
+
+    If `head_first` is True, resource is probed with HEAD request, and GET is made only
+    for domains rejecting HEAD. GET is conditional if validators of resource are known.
+
+    All probes of one run share a connection pool: idle connections to every host are kept alive
+    for `keepalive_timeout` seconds and resolved hosts are cached for `dns_cache_ttl` seconds.
+    Reuse of connections and DNS cache are counted in `connection_stats` of the last run.
+
+    Probes of domains with open circuit breaker are not made, such resources are reported
+    as unavailable with `CIRCUIT_OPEN` outcome, which does not count as a failed check.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = 1000,
+        per_host_concurrency: int = 10,
+        connect_timeout: float = 5,
+        read_timeout: float = 10,
+        total_timeout: float = 20,
+        max_body_bytes: int = 65536,
+        head_first: bool = True,
+        head_support: Optional[HeadSupportCache] = None,
+        circuit_breaker: Optional[DomainCircuitBreaker] = None,
+        rate_limiter: Optional["DomainRateLimiter"] = None,
+        keepalive_timeout: float = 30,
+        dns_cache_ttl: int = 300,
+        max_pending: int = 10000,
+    ):
+        self.concurrency = concurrency
+        self.per_host_concurrency = per_host_concurrency
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.total_timeout = total_timeout
+        self.max_body_bytes = max_body_bytes
+        self.head_first = head_first
+        self.head_support = head_support or HeadSupportCache()
+        self.circuit_breaker = circuit_breaker or DomainCircuitBreaker()
+        self.rate_limiter = rate_limiter
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+        self.max_pending = max_pending
+        self.connection_stats = ConnectionStats()
+
+    def check(self, targets: Iterable[CheckTarget], on_result: ResultCallback) -> None:
+        """Probe all targets and pass every result to the callback. Blocks until all probes are done."""
+        asyncio.run(self.run(targets, on_result))
+
+    async def run(self, targets: Iterable[CheckTarget], on_result: ResultCallback) -> None:
+        """
+        Probe all targets and pass every result to the callback as soon as it is ready.
+        Targets are consumed lazily, so the iterable may be a generator over a DB cursor.
+        """
+        # targets waiting for their domains and probes in flight
+        pending_slots = asyncio.Semaphore(self.max_pending)
+        probe_slots = asyncio.Semaphore(self.concurrency)
+        pending = set()
+        self.connection_stats = ConnectionStats()
+
+        domain_concurrency = self.per_host_concurrency
+        if self.rate_limiter:
+            domain_concurrency = min(domain_concurrency, self.rate_limiter.max_in_flight)
+        domain_slots: Dict[str, asyncio.Semaphore] = {}
+        domain_users: Dict[str, int] = {}
+
+        @asynccontextmanager
+        async def domain_slot(domain: str):
+            """Hold one of slots of the domain in this worker. Slots of domains without probes are dropped."""
+            semaphore = domain_slots.setdefault(domain, asyncio.Semaphore(domain_concurrency))
+            domain_users[domain] = domain_users.get(domain, 0) + 1
+            try:
+                async with semaphore:
+                    yield
+            finally:
+                domain_users[domain] -= 1
+                if not domain_users[domain]:
+                    del domain_users[domain]
+                    del domain_slots[domain]
+
+        connector = aiohttp.TCPConnector(
+            limit=self.concurrency,
+            limit_per_host=self.per_host_concurrency,
+            keepalive_timeout=self.keepalive_timeout,
+            use_dns_cache=True,
+            ttl_dns_cache=self.dns_cache_ttl,
+        )
+        timeout = aiohttp.ClientTimeout(
+            total=self.total_timeout,
+            sock_connect=self.connect_timeout,
+            sock_read=self.read_timeout,
+        )
+
+        async with AsyncExitStack() as stack:
+            session = await stack.enter_async_context(
+                aiohttp.ClientSession(
+                    connector=connector,
+                    timeout=timeout,
+                    trace_configs=[self.connection_stats.trace_config()],
+                )
+            )
+            await stack.enter_async_context(self.head_support)
+            await stack.enter_async_context(self.circuit_breaker)
+            if self.rate_limiter:
+                await stack.enter_async_context(self.rate_limiter)
+
+            async def probe_and_report(target: CheckTarget):
+                try:
+                    domain = self._get_domain(target)
+
+                    async with domain_slot(domain):
+                        if await self.circuit_breaker.allow(domain):
+                            async with self._politeness_limit(target), probe_slots:
+                                result = await self.probe(session, target)
+                            await self.circuit_breaker.record(domain, result.outcome)
+
+                        else:
+                            result = CheckResult(
+                                resource_id=target.resource_id,
+                                status_code=None,
+                                is_available=False,
+                                was_available=target.was_available,
+                                outcome=ProbeOutcome.CIRCUIT_OPEN,
+                                etag=target.etag,
+                                last_modified=target.last_modified,
+                            )
+
+                    on_result(result)
+                finally:
+                    pending_slots.release()
+
+            for target in targets:
+                await pending_slots.acquire()
+                task = asyncio.create_task(probe_and_report(target))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+
+            if pending:
+                await asyncio.gather(*pending)
+
+    @staticmethod
+    def _get_domain(target: CheckTarget) -> str:
+        return target.domain or urlsplit(target.url).netloc
+
+    def _politeness_limit(self, target: CheckTarget):
+        if self.rate_limiter and target.domain:
+            return self.rate_limiter.limit(target.domain)
+        return nullcontext()
+
+    async def probe(self, session: aiohttp.ClientSession, target: CheckTarget) -> CheckResult:
+        """Make request to the target url and convert the response to check result."""
+        domain = self._get_domain(target)
+
+        result = CheckResult(
+            resource_id=target.resource_id,
+            status_code=None,
+            is_available=False,
+            was_available=target.was_available,
+            etag=target.etag,
+            last_modified=target.last_modified,
+        )
+
+        try:
+            if self.head_first and not await self.head_support.rejects_head(domain):
+                async with session.head(target.url, allow_redirects=True) as response:
+                    self._update_result(result, response)
+
+                if result.status_code not in HEAD_REJECTED_STATUS_CODES:
+                    return result
+
+                await self.head_support.mark_rejecting(domain)
+
+            async with session.get(target.url, headers=self._conditional_headers(target)) as response:
+                self._update_result(result, response)
+                await self._read_body_head(response)
+
+        except asyncio.TimeoutError:
+            result.outcome = ProbeOutcome.TIMEOUT
+
+        except (aiohttp.ClientError, ValueError):
+            result.outcome = ProbeOutcome.CONNECTION_ERROR
+
+        if result.outcome != ProbeOutcome.RESPONDED:
+            result.status_code = None
+            result.is_available = False
+
+        return result
+
+    @staticmethod
+    def _conditional_headers(target: CheckTarget) -> Dict[str, str]:
+        headers = {}
+        if target.etag:
+            headers[hdrs.IF_NONE_MATCH] = target.etag
+        if target.last_modified:
+            headers[hdrs.IF_MODIFIED_SINCE] = target.last_modified
+        return headers
+
+    @staticmethod
+    def _update_result(result: CheckResult, response: aiohttp.ClientResponse):
+        """Set status and validators of the response to result."""
+        result.status_code = response.status
+        result.is_available = is_available_status(response.status)
+
+        etag = response.headers.get(hdrs.ETAG)
+        last_modified = response.headers.get(hdrs.LAST_MODIFIED)
+
+        if response.status in range(200, 300):
+            result.etag = etag
+            result.last_modified = last_modified
+        elif response.status == 304:
+            # not modified response may omit validators, then the known ones stay valid
+            result.etag = etag or result.etag
+            result.last_modified = last_modified or result.last_modified
+
+    async def _read_body_head(self, response: aiohttp.ClientResponse):
+        """
+        Read at most `max_body_bytes` of response body.
+        Connection is reused only if the whole body fits the limit, otherwise it is closed on release.
+        Status code is already known, so errors while reading body do not change the result.
+        """
+        remaining = self.max_body_bytes
+        try:
+            while remaining > 0:
+                chunk = await response.content.read(remaining)
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            pass
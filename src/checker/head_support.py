@@ -0,0 +1,51 @@
+from typing import Dict, Optional
+
+import redis.asyncio as redis
+
+
+class HeadSupportCache:
+    """
+    Domains known to reject HEAD requests.
+    Knowledge is kept in process memory and, if redis url is given, shared with other workers
+    through Redis keys that expire after `ttl` seconds, so domains are re-tested from time to time.
+    Cache must be opened with `async with` inside the event loop that uses it.
+    """
+
+    def __init__(
+        self,
+        redis_url: Optional[str] = None,
+        ttl: int = 604800,
+        key_prefix: str = "checker:head_rejected",
+    ):
+        self.redis_url = redis_url
+        self.ttl = ttl
+        self.key_prefix = key_prefix
+        self._rejects_head: Dict[str, bool] = {}
+        self._redis: Optional[redis.Redis] = None
+
+    async def __aenter__(self) -> "HeadSupportCache":
+        if self.redis_url:
+            self._redis = redis.from_url(self.redis_url)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        if self._redis:
+            await self._redis.close()
+            await self._redis.connection_pool.disconnect()
+            self._redis = None
+
+    async def rejects_head(self, domain: str) -> bool:
+        """Check whether the domain is known to reject HEAD requests."""
+        if domain not in self._rejects_head:
+            rejects_head = False
+            if self._redis:
+                rejects_head = bool(await self._redis.exists(f"{self.key_prefix}:{domain}"))
+            self._rejects_head[domain] = rejects_head
+
+        return self._rejects_head[domain]
+
+    async def mark_rejecting(self, domain: str):
+        """Remember that the domain rejects HEAD requests."""
+        self._rejects_head[domain] = True
+        if self._redis:
+            await self._redis.set(f"{self.key_prefix}:{domain}", 1, ex=self.ttl)
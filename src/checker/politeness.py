@@ -0,0 +1,134 @@
+import asyncio
+import uuid
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from itertools import islice
+from typing import Iterable, Iterator, Optional
+
+import redis.asyncio as redis
+
+from src.checker.engine import CheckTarget
+
+# Take one of `max_in_flight` slots of the domain and one token of its bucket at once.
+# Bucket is refilled with `rate` tokens per second up to `burst` tokens.
+# Return "0" if both were taken, otherwise number of seconds to wait before the next attempt:
+# time until the next token, or interval between requests if all slots are busy,
+# since a slot can be released at any moment.
+# Redis server time is used, so buckets are shared correctly by all workers.
+# Every slot is a lease in a sorted set scored by its expiration time, expired leases are dropped
+# before slots are counted, so a slot leaked by a killed worker comes back after `slot_ttl` seconds
+# even if the domain is never idle.
+TAKE_SCRIPT = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) + tonumber(now_parts[2]) / 1000000
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local max_in_flight = tonumber(ARGV[3])
+local slot_ttl = tonumber(ARGV[4])
+
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+local tokens = tonumber(bucket[1]) or burst
+local updated_at = tonumber(bucket[2]) or now
+
+tokens = math.min(burst, tokens + (now - updated_at) * rate)
+
+redis.call('ZREMRANGEBYSCORE', KEYS[2], '-inf', now)
+
+local wait = 0
+if redis.call('ZCARD', KEYS[2]) >= max_in_flight then
+    wait = 1 / rate
+elseif tokens < 1 then
+    wait = (1 - tokens) / rate
+else
+    tokens = tokens - 1
+    redis.call('ZADD', KEYS[2], now + slot_ttl, ARGV[5])
+    -- set of leases outlives all of them
+    redis.call('EXPIRE', KEYS[2], math.ceil(slot_ttl) + 1)
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated_at', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return tostring(wait)
+"""
+
+
+def interleave_by_domain(targets: Iterable[CheckTarget], window: int = 1000) -> Iterator[CheckTarget]:
+    """
+    Reorder targets so that consecutive targets belong to different domains.
+    Targets are read in windows of the given size and taken from every domain of the window in turn,
+    so the input may be a lazy generator.
+    """
+    targets = iter(targets)
+
+    while True:
+        by_domain = OrderedDict()
+        for target in islice(targets, window):
+            by_domain.setdefault(target.domain, deque()).append(target)
+
+        if not by_domain:
+            return
+
+        while by_domain:
+            for domain in list(by_domain):
+                domain_targets = by_domain[domain]
+                yield domain_targets.popleft()
+                if not domain_targets:
+                    del by_domain[domain]
+
+
+class DomainRateLimiter:
+    """
+    Per-domain politeness limits shared by all workers through Redis:
+    number of requests per second (token bucket) and number of requests in flight.
+    Limiter must be opened with `async with` inside the event loop that uses it.
+
+    Slot of a request in flight is leased for `slot_ttl` seconds, which must be longer than any probe.
+    """
+
+    def __init__(
+        self,
+        redis_url: str,
+        requests_per_second: float = 5,
+        burst: int = 10,
+        max_in_flight: int = 4,
+        slot_ttl: int = 60,
+        key_prefix: str = "checker:domain",
+    ):
+        self.redis_url = redis_url
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self.max_in_flight = max_in_flight
+        self.slot_ttl = slot_ttl
+        self.key_prefix = key_prefix
+        self._redis: Optional[redis.Redis] = None
+
+    async def __aenter__(self) -> "DomainRateLimiter":
+        self._redis = redis.from_url(self.redis_url)
+        self._take = self._redis.register_script(TAKE_SCRIPT)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self._redis.close()
+        await self._redis.connection_pool.disconnect()
+        self._redis = None
+
+    @asynccontextmanager
+    async def limit(self, domain: str):
+        """
+        Wait until a request to the domain is allowed and hold in-flight slot while it is made.
+        Every attempt is one script call, and the next one is made after the wait computed by it.
+        """
+        slot_key = f"{self.key_prefix}:{domain}:in_flight"
+        bucket_key = f"{self.key_prefix}:{domain}:bucket"
+        lease = uuid.uuid4().hex
+
+        while wait := float(await self._take(
+            keys=[bucket_key, slot_key],
+            args=[self.requests_per_second, self.burst, self.max_in_flight, self.slot_ttl, lease],
+        )):
+            await asyncio.sleep(wait)
+
+        try:
+            yield
+        finally:
+            await self._redis.zrem(slot_key, lease)
@@ -0,0 +1,88 @@
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List
+
+from src import app
+from src.checker.engine import CheckResult
+from src.service import db
+
+
+class CheckResultSink:
+    """
+    Buffer for check results that writes them to DB in batches.
+    Buffer is flushed when it reaches `batch_size` results or when `flush_interval` seconds
+    passed since the previous flush, and once more when the sink is closed.
+    Next check time of resources is scheduled with the given interval bounds and backoff factor.
+
+    Results are added from the event loop of the checker, so batches are written by a writer thread
+    with its own app context and DB session, and probes in flight are not blocked while a batch is written.
+    Batches are written one by one in the order of flushes. Closing the sink waits until all of them
+    are written and raises the error of a failed write.
+    """
+
+    def __init__(
+        self,
+        batch_size: int = 500,
+        flush_interval: float = 5,
+        min_interval: int = 600,
+        max_interval: int = 259200,
+        backoff_factor: float = 2,
+    ):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff_factor = backoff_factor
+        self._buffer: List[CheckResult] = []
+        self._flushed_at = time.monotonic()
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="check-result-writer")
+        self._writes: List[Future] = []
+
+    def __enter__(self) -> "CheckResultSink":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def add(self, result: CheckResult):
+        """Add result to buffer and flush the buffer if needed."""
+        self._buffer.append(result)
+
+        if (
+            len(self._buffer) >= self.batch_size
+            or time.monotonic() - self._flushed_at >= self.flush_interval
+        ):
+            self.flush()
+
+    def flush(self):
+        """Pass all buffered results to the writer thread without waiting for them to be written."""
+        # error of a write that has already failed is raised as soon as possible
+        for write in self._writes:
+            if write.done():
+                write.result()
+        self._writes = [write for write in self._writes if not write.done()]
+
+        if self._buffer:
+            self._writes.append(self._writer.submit(self._write, self._buffer))
+            self._buffer = []
+        self._flushed_at = time.monotonic()
+
+    def close(self):
+        """Flush the buffer and wait until all batches are written."""
+        try:
+            self.flush()
+            for write in self._writes:
+                write.result()
+        finally:
+            self._writes = []
+            self._writer.shutdown(wait=True)
+
+    def _write(self, results: List[CheckResult]):
+        """Write results to DB in one transaction."""
+        with app.app_context():
+            db.save_check_results(
+                results=results,
+                min_interval=self.min_interval,
+                max_interval=self.max_interval,
+                backoff_factor=self.backoff_factor,
+            )
@@ -43,5 +43,4 @@ def convert_processing_request_db_model_to_dto(
         total_count=processing_request.total_count,
         processed_count=processing_request.processed_count,
         errors_count=processing_request.errors_count,
-        error_urls=processing_request.error_urls,
     )
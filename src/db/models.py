@@ -5,7 +5,6 @@ from typing import List, TypedDict
 from sqlalchemy.dialects.postgresql import JSON, UUID
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-from sqlalchemy.types import ARRAY
 
 from src.web.app import db
 
@@ -30,6 +29,13 @@ class EventType(Enum):
     PHOTO_ADDED = "photo_added"
 
 
+class ProbeOutcome(Enum):
+    RESPONDED = "responded"
+    TIMEOUT = "timeout"
+    CONNECTION_ERROR = "connection_error"
+    CIRCUIT_OPEN = "circuit_open"
+
+
 class WebResource(db.Model):
     """Model for urls."""
     id = db.Column(db.Integer, primary_key=True)
@@ -41,6 +47,13 @@ class WebResource(db.Model):
     url_path = db.Column(db.String)
     query_params = db.Column(JSON)
     unavailable_count = db.Column(db.Integer, default=0)
+    last_status_code = db.Column(db.Integer, nullable=True)
+    last_is_available = db.Column(db.Boolean, nullable=True, index=True)
+    last_checked_at = db.Column(db.DateTime(timezone=True), nullable=True)
+    check_interval = db.Column(db.Integer, nullable=True)  # seconds, None until the first check
+    next_check_at = db.Column(db.DateTime(timezone=True), server_default=func.now(), nullable=False, index=True)
+    etag = db.Column(db.String, nullable=True)  # validators for conditional requests of checker
+    last_modified = db.Column(db.String, nullable=True)
     screenshot = db.Column(db.LargeBinary, nullable=True)
     status_codes = relationship("WebResourceStatus", back_populates="resource")
     news_feed_items = relationship("NewsFeedItem", back_populates="resource")
@@ -53,6 +66,7 @@ class WebResourceStatus(db.Model):
     status_code = db.Column(db.Integer, nullable=True)
     request_time = db.Column(db.DateTime(timezone=True), server_default=func.now())
     is_available = db.Column(db.Boolean)
+    outcome = db.Column(db.Enum(ProbeOutcome), nullable=True)
     resource = relationship("WebResource", back_populates="status_codes", lazy="joined")
 
 
@@ -64,7 +78,24 @@ class FileProcessingRequest(db.Model):
     total_count = db.Column(db.Integer, nullable=True, default=None)
     processed_count = db.Column(db.Integer, nullable=True, default=None)
     errors_count = db.Column(db.Integer, nullable=True, default=None)
-    error_urls = db.Column(ARRAY(db.String), default=[])
+    checkpoints = relationship("FileProcessingCheckpoint", back_populates="processing_request")
+    errors = relationship("FileProcessingError", back_populates="processing_request")
+
+
+class FileProcessingCheckpoint(db.Model):
+    """Model for durable progress of processing of one line range of file."""
+    __table_args__ = (db.UniqueConstraint("request_id", "start_line"),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    request_id = db.Column(db.Integer, db.ForeignKey(FileProcessingRequest.id), nullable=False)
+    start_line = db.Column(db.Integer, nullable=False)
+    stop_line = db.Column(db.Integer, nullable=False)
+    next_line = db.Column(db.Integer, nullable=False)  # the first line of range that is not processed yet
+    processed_count = db.Column(db.Integer, nullable=False, default=0)
+    inserted_count = db.Column(db.Integer, nullable=False, default=0)
+    errors_count = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    processing_request = relationship("FileProcessingRequest", back_populates="checkpoints")
 
 
 class NewsFeedItem(db.Model):
@@ -73,4 +104,17 @@ class NewsFeedItem(db.Model):
     event_type = db.Column(db.Enum(EventType), nullable=False)
     resource_id = db.Column(db.Integer, db.ForeignKey(WebResource.id))
     resource = relationship("WebResource", back_populates="news_feed_items")
+    details = db.Column(JSON, nullable=True)  # data of events that outlive their resource, e.g. deleted urls
     timestamp = db.Column(db.DateTime(timezone=True), server_default=func.now())
+
+
+class FileProcessingError(db.Model):
+    """Model for invalid lines of file. Table is append-only."""
+    __table_args__ = (db.UniqueConstraint("request_id", "line_number"),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    request_id = db.Column(db.Integer, db.ForeignKey(FileProcessingRequest.id), nullable=False)
+    line_number = db.Column(db.Integer, nullable=False)  # number of line in file starting from 1
+    line = db.Column(db.String, nullable=False)
+    reason = db.Column(db.String, nullable=False)  # type of validation error as pydantic names it
+    processing_request = relationship("FileProcessingRequest", back_populates="errors")
@@ -3,7 +3,8 @@ from celery.schedules import crontab
 from flask import Flask
 
 from src import create_app
-from src.tasks import delete_unavailable_resources, get_response_from_resources
+from src.tasks import (delete_unavailable_resources, rebuild_url_filter,
+                       schedule_due_checks)
 
 flask_app: Flask = create_app()
 celery: Celery = flask_app.extensions["celery"]
@@ -11,14 +12,11 @@ celery: Celery = flask_app.extensions["celery"]
 
 @celery.on_after_configure.connect
 def setup_periodic_making_requests(sender: Celery, **kwargs):
-    """Add periodic task for getting responses from all resources from DB and deleting unavailable ones."""
+    """Add periodic tasks for checking due resources, deleting unavailable ones and rebuilding url filter."""
     sender.add_periodic_task(
-        schedule=crontab(
-            minute="0",
-            hour=flask_app.config["PERIODIC_TASKS"]["GET_RESPONSES_FROM_URLS"]["RUN_SCHEDULE_HOUR"]
-        ),
-        sig=get_response_from_resources,
-        name="get_response_from_resources",
+        schedule=flask_app.config["PERIODIC_TASKS"]["SCHEDULE_DUE_CHECKS"]["RUN_EVERY_SECONDS"],
+        sig=schedule_due_checks,
+        name="schedule_due_checks",
     )
 
     sender.add_periodic_task(
@@ -29,6 +27,15 @@ def setup_periodic_making_requests(sender: Celery, **kwargs):
         sig=delete_unavailable_resources,
         name="delete_unavailable",
         kwargs={
-            "times_unavailable": flask_app.config["PERIODIC_TASKS"]["DLETE_UNAVAILABLE_URLS"]["MAX_RETRIES"]
+            "unavailable_count": flask_app.config["PERIODIC_TASKS"]["DELETE_UNAVAILABLE_URLS"]["MAX_RETRIES"]
         }
     )
+
+    sender.add_periodic_task(
+        schedule=crontab(
+            minute="30",
+            hour=flask_app.config["PERIODIC_TASKS"]["REBUILD_URL_FILTER"]["RUN_SCHEDULE_HOUR"]
+        ),
+        sig=rebuild_url_filter,
+        name="rebuild_url_filter",
+    )
@@ -1,11 +1,14 @@
 from typing import Optional
 
+from sqlalchemy.exc import IntegrityError
+
 from src.db import models
 from src.db.converters import (convert_web_resource_db_model_to_dto,
                                convert_web_resource_dto_to_db_model)
 from src.repositories.base import SqlAlchemyRepository
 from src.schemes.web_resources import ResourceBaseSchema
-from src.service.exceptions import ResourceNotFoundError
+from src.service.exceptions import AlreadyExistsError, ResourceNotFoundError
+from src.service.response_cache import invalidate_cached_responses
 
 
 class WebResourceRepository(SqlAlchemyRepository):
@@ -26,6 +29,7 @@ class WebResourceRepository(SqlAlchemyRepository):
 
         self.session.delete(resource)
         self.session.commit()
+        invalidate_cached_responses()
 
     def delete_by_id(self, id: int):
         """Delete WebResource with given id."""
@@ -36,6 +40,7 @@ class WebResourceRepository(SqlAlchemyRepository):
 
         self.session.delete(resource)
         self.session.commit()
+        invalidate_cached_responses()
 
     def get_by_full_url(self, full_url: str) -> Optional[ResourceBaseSchema]:
         """Get WebResource by given full url. Return None otherwise."""
@@ -46,10 +51,15 @@ class WebResourceRepository(SqlAlchemyRepository):
             return None
 
     def add_one(self, web_resource: ResourceBaseSchema):
-        """Create new web resource in DB."""
+        """Create new web resource in DB. Raise exception if resource with the same url exists."""
         db_resource = convert_web_resource_dto_to_db_model(web_resource)
         self.session.add(db_resource)
-        self.session.commit()
+        try:
+            self.session.commit()
+        except IntegrityError:
+            self.session.rollback()
+            raise AlreadyExistsError
+        invalidate_cached_responses()
         return convert_web_resource_db_model_to_dto(db_resource)
 
     def update_resource_availability_counter(
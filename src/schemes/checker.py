@@ -0,0 +1,17 @@
+from datetime import datetime
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class CircuitBreakerSchema(BaseModel):
+    domain: str
+    state: str
+    consecutive_failures: int
+    opened_at: Optional[datetime]
+    short_circuited: int
+
+
+class ListCircuitBreakerSchema(BaseModel):
+    circuit_breakers: List[CircuitBreakerSchema]
+    short_circuited_total: int
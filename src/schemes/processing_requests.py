@@ -1,6 +1,8 @@
 from dataclasses import dataclass
 from typing import List, Optional
 
+from pydantic import BaseModel
+
 from src.web.schemes import OkResponseSchema
 
 
@@ -11,4 +13,14 @@ class ProcessingRequestSchema:
     total_count: Optional[int]
     processed_count: Optional[int]
     errors_count: Optional[int]
-    error_urls: List[str]
\ No newline at end of file
+
+
+class FileProcessingErrorSchema(BaseModel):
+    line_number: int
+    line: str
+    reason: str
+
+
+class ListFileProcessingErrorSchema(BaseModel):
+    errors: List[FileProcessingErrorSchema]
+    next_cursor: Optional[int]
@@ -0,0 +1,14 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class ResponseCacheStatsSchema(BaseModel):
+    enabled: bool
+    ttl: int
+    generation: int
+    hits: int
+    misses: int
+    hit_rate: float
+    average_hit_ms: Optional[float]
+    average_miss_ms: Optional[float]
@@ -0,0 +1,18 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class UrlFilterStatsSchema(BaseModel):
+    enabled: bool
+    is_built: bool
+    capacity: int
+    error_rate: float
+    size: int
+    hashes: int
+    estimated_urls: Optional[int]
+    checks: int
+    found: int
+    false_positives: int
+    hit_rate: float
+    false_positive_rate: float
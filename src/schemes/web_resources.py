@@ -5,6 +5,7 @@ from typing import List, Optional
 from pydantic import UUID4, AnyHttpUrl, BaseModel, root_validator, validator
 from werkzeug.datastructures import FileStorage
 
+from src.utils import ziploader
 from src.web.schemes import OkResponseSchema
 
 
@@ -50,14 +51,14 @@ class FileRequestSchema(BaseModel):
         arbitrary_types_allowed = True
 
 
-class ZipFileRequestSchema(FileRequestSchema):
+class UploadedFileRequestSchema(FileRequestSchema):
     @validator('file')
     def validate_file(cls, file):
         if file is None or file.filename == '':
             raise ValueError('File cannot be empty')
 
-        if not file.filename.lower().endswith('.zip'):
-            raise ValueError('Invalid file type. Only ZIP files are allowed.')
+        if ziploader.get_file_format(file.filename) is None:
+            raise ValueError('Invalid file type. Only ZIP, CSV, CSV.GZ, NDJSON and NDJSON.GZ files are allowed.')
 
         return file
 
@@ -95,7 +96,7 @@ class ResourceAddResponseSchema(ResourceBaseSchema, ResourceShortSchema):
 
 
 class ListResourceSchema(BaseModel):
-    resources: List[ResourceAddResponseSchema]
+    items: List[ResourceAddResponseSchema]
 
 
 class PaginatedListResourceSchema(ListResourceSchema):
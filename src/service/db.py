@@ -1,15 +1,22 @@
-from typing import List, Optional, TypedDict
+from typing import Iterator, List, Optional, Set, Tuple, TypedDict
 
 from flask import url_for
-from sqlalchemy import desc
+from sqlalchemy import (Boolean, Integer, String, case, cast, column, delete,
+                        func, insert, literal_column, or_, select, table,
+                        update, values)
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.orm import joinedload
 from sqlalchemy.orm.query import Query
 from werkzeug.datastructures import FileStorage
 
-from src.db.models import (EventType, FileProcessingRequest, NewsFeedItem,
-                           StatusOption, WebResource, WebResourceStatus)
+from src.checker.engine import CheckResult, CheckTarget
+from src.db.models import (EventType, FileProcessingCheckpoint,
+                           FileProcessingError, FileProcessingRequest,
+                           NewsFeedItem, ProbeOutcome, StatusOption,
+                           WebResource, WebResourceStatus)
 from src.service import exceptions
-from src.utils.urlparser import parse_url
+from src.service.response_cache import invalidate_cached_responses
+from src.utils.urlparser import UrlPartsDict, parse_url
 from src.web.app import db
 
 
@@ -19,6 +26,25 @@ class PaginatedItemDict(TypedDict):
     _links: dict
 
 
+class FileProcessingTotalsDict(TypedDict):
+    processed: int
+    inserted: int
+    errors: int
+    is_completed: bool
+
+
+class FileProcessingErrorDict(TypedDict):
+    line_number: int
+    line: str
+    reason: str
+
+
+class DeletedRowsDict(TypedDict):
+    resources: int
+    statuses: int
+    news_feed_items: int
+
+
 def create_web_resource(validated_url: str) -> WebResource:
     """Save WebResource instance in database. If it already exists raise AlreadyExistsError."""
     response = parse_url(url=validated_url)
@@ -28,7 +54,7 @@ def create_web_resource(validated_url: str) -> WebResource:
         protocol=response.protocol,
         domain=response.domain,
         domain_zone=response.domain_zone,
-        url_path=response.path,
+        url_path=response.url_path,
         query_params=response.query_params,
     )
 
@@ -41,6 +67,7 @@ def create_web_resource(validated_url: str) -> WebResource:
     else:
         db.session.add(web_resource)
         db.session.commit()
+        invalidate_cached_responses()
 
         create_newsfeed_item(
             resource=web_resource,
@@ -51,42 +78,37 @@ def create_web_resource(validated_url: str) -> WebResource:
 
 
 def get_web_resources_query(
-    left_join: bool = False,
+    with_status: bool = False,
     domain_zone: Optional[str] = None,
     resource_id: Optional[int] = None,
     resource_uuid: Optional[str] = None,
     is_available: Optional[str] = None,
     unavailable_count: Optional[int] = None,
+    min_id: Optional[int] = None,
+    max_id: Optional[int] = None,
 ) -> Query:
     """
     Get all WebResource instances from database with the given criteria.
-    If left join is True then return query with relative data (status codes).
+    If with_status is True then return query with rows containing the latest status of resource.
     Else return query with all Web resources."""
 
-    if not left_join:
+    if not with_status:
         query = db.session.query(WebResource)
 
     else:
-        # base query
+        # latest status is stored in WebResource itself, so status history is not joined
         query = db.session.query(
             WebResource.id,
             WebResource.uuid,
             WebResource.full_url,
-            WebResourceStatus.status_code,
-            WebResourceStatus.is_available,
+            WebResource.last_status_code.label("status_code"),
+            WebResource.last_is_available.label("is_available"),
             WebResource.domain_zone,
             WebResource.domain,
             WebResource.screenshot,
             WebResource.protocol,
-        ).join(
-            WebResourceStatus,
-            WebResource.id == WebResourceStatus.resource_id,
-            isouter=True
         ).order_by(
             WebResource.id.desc(),
-            desc(WebResourceStatus.request_time)  # Сортируем по убыванию времени статуса
-        ).distinct(
-            WebResource.id
         )
 
         # applying filters to query
@@ -104,14 +126,174 @@ def get_web_resources_query(
         }
 
         query = query.filter(
-            WebResourceStatus.is_available.is_(availability_dict.get(is_available))
+            WebResource.last_is_available.is_(availability_dict.get(is_available))
         )
     if unavailable_count:
         query = query.filter(WebResource.unavailable_count >= unavailable_count)
+    if min_id is not None:
+        query = query.filter(WebResource.id >= min_id)
+    if max_id is not None:
+        query = query.filter(WebResource.id <= max_id)
 
     return query
 
 
+def iter_check_targets(
+    min_id: Optional[int] = None,
+    max_id: Optional[int] = None,
+    resource_ids: Optional[List[int]] = None,
+    batch_size: int = 1000,
+) -> Iterator[CheckTarget]:
+    """
+    Yield check targets for resources with ids in the given range or with the given ids.
+    Only columns needed for probing are selected, in keyset batches ordered by id,
+    so memory usage does not depend on number of resources or length of their status history.
+    Keyset batches are used instead of a server-side cursor, so no transaction is kept open
+    while results are committed by the writer of check results.
+    """
+    last_seen_id = None
+
+    while True:
+        query = db.session.query(
+            WebResource.id,
+            WebResource.full_url,
+            WebResource.last_is_available,
+            WebResource.domain,
+            WebResource.etag,
+            WebResource.last_modified,
+        )
+
+        if last_seen_id is not None:
+            query = query.filter(WebResource.id > last_seen_id)
+        elif min_id is not None:
+            query = query.filter(WebResource.id >= min_id)
+        if max_id is not None:
+            query = query.filter(WebResource.id <= max_id)
+        if resource_ids is not None:
+            query = query.filter(WebResource.id.in_(resource_ids))
+
+        rows = query.order_by(
+            WebResource.id
+        ).limit(
+            batch_size
+        ).all()
+
+        for resource_id, full_url, last_is_available, domain, etag, last_modified in rows:
+            yield CheckTarget(
+                resource_id=resource_id,
+                url=full_url,
+                was_available=last_is_available,
+                domain=domain,
+                etag=etag,
+                last_modified=last_modified,
+            )
+
+        if len(rows) < batch_size:
+            return
+
+        last_seen_id = rows[-1].id
+
+
+def iter_web_resource_urls(batch_size: int = 10000) -> Iterator[str]:
+    """Yield urls of all resources, read in keyset batches ordered by id."""
+    last_seen_id = 0
+
+    while True:
+        rows = db.session.execute(
+            select(
+                WebResource.id,
+                WebResource.full_url,
+            ).where(
+                WebResource.id > last_seen_id
+            ).order_by(
+                WebResource.id
+            ).limit(
+                batch_size
+            )
+        ).all()
+
+        for _, full_url in rows:
+            yield full_url
+
+        if len(rows) < batch_size:
+            return
+
+        last_seen_id = rows[-1].id
+
+
+def get_existing_full_urls(full_urls: List[str]) -> Set[str]:
+    """Return those of the given urls that are already saved in the database."""
+    if not full_urls:
+        return set()
+
+    return set(
+        db.session.scalars(
+            select(WebResource.full_url).where(WebResource.full_url.in_(full_urls))
+        )
+    )
+
+
+def claim_due_web_resources(limit: int, claim_timeout: int) -> List[int]:
+    """
+    Find resources which next check time has come and return their ids ordered by domain.
+    Claimed resources are postponed by `claim_timeout` seconds, so they are not claimed again
+    while being checked, and become due again if their check is lost.
+    """
+    due_ids = db.session.query(
+        WebResource.id
+    ).filter(
+        WebResource.next_check_at <= func.now()
+    ).order_by(
+        WebResource.next_check_at
+    ).limit(
+        limit
+    ).with_for_update(
+        skip_locked=True
+    ).scalar_subquery()
+
+    claimed_resources = db.session.execute(
+        update(WebResource).where(
+            WebResource.id.in_(due_ids)
+        ).values(
+            next_check_at=func.now() + claim_timeout * literal_column("INTERVAL '1 second'"),
+        ).returning(
+            WebResource.id,
+            WebResource.domain,
+        ).execution_options(
+            synchronize_session=False
+        )
+    ).all()
+
+    db.session.commit()
+
+    claimed_resources.sort(key=lambda resource: (resource.domain, resource.id))
+    return [resource.id for resource in claimed_resources]
+
+
+def get_web_resource_id_ranges(chunk_size: int) -> List[Tuple[int, int]]:
+    """
+    Split ids of all WebResource instances into consecutive ranges.
+    Every range contains at most `chunk_size` resources, regardless of gaps in ids.
+    """
+    numbered_ids = db.session.query(
+        WebResource.id.label("id"),
+        func.row_number().over(order_by=WebResource.id).label("row_number"),
+    ).subquery()
+
+    chunk_number = (numbered_ids.c.row_number - 1) // chunk_size
+
+    id_ranges = db.session.query(
+        func.min(numbered_ids.c.id),
+        func.max(numbered_ids.c.id),
+    ).group_by(
+        chunk_number
+    ).order_by(
+        func.min(numbered_ids.c.id)
+    ).all()
+
+    return [(first_id, last_id) for first_id, last_id in id_ranges]
+
+
 # def delete_web_resource_by_id(resource_id: int):
 #     """Get WebResource object from DB and deletes it if it was found. Raise exception otherwise."""
 #     resource = WebResource.query.filter_by(id=resource_id).first()
@@ -123,49 +305,199 @@ def get_web_resources_query(
 #     db.session.commit()
 
 
-# def delete_web_resource(resource: WebResource):
-#     """Delete web resource from DB."""
-#     db.session.delete(resource)
-#     db.session.commit()
+def delete_unavailable_web_resources(unavailable_count: int, batch_size: int) -> DeletedRowsDict:
+    """
+    Delete at most `batch_size` resources that were unavailable at least `unavailable_count` times in a row,
+    together with their statuses and newsfeed items, and add one RESOURCE_DELETED newsfeed item
+    with urls of all deleted resources. Everything is done by set-based statements in one transaction.
+
+    Resources locked by other transactions, e.g. by saving of check results, are skipped
+    and deleted by the next batch or run.
+    """
+    batch_ids = db.session.scalars(
+        select(
+            WebResource.id
+        ).where(
+            WebResource.unavailable_count >= unavailable_count
+        ).order_by(
+            WebResource.id
+        ).limit(
+            batch_size
+        ).with_for_update(
+            skip_locked=True
+        )
+    ).all()
 
-#     create_newsfeed_item(
-#         resource=resource,
-#         event=NewsFeedItem.EventType.RESOURCE_DELETED,
-#     )
+    if not batch_ids:
+        db.session.commit()
+        return {"resources": 0, "statuses": 0, "news_feed_items": 0}
 
+    deleted_statuses = db.session.execute(
+        delete(WebResourceStatus).where(
+            WebResourceStatus.resource_id.in_(batch_ids)
+        ).execution_options(
+            synchronize_session=False
+        )
+    )
 
-def save_status_code_for_web_resource_response(
-    resource: WebResource,
-    status_code: int,
-    is_available: bool,
-):
-    """Save new record for WebResourceStatus in DB."""
-    status = WebResourceStatus(
-        status_code=status_code,
-        resource=resource,
-        is_available=is_available,
+    deleted_news_feed_items = db.session.execute(
+        delete(NewsFeedItem).where(
+            NewsFeedItem.resource_id.in_(batch_ids)
+        ).execution_options(
+            synchronize_session=False
+        )
+    )
+
+    deleted_urls = db.session.scalars(
+        delete(WebResource).where(
+            WebResource.id.in_(batch_ids)
+        ).returning(
+            WebResource.full_url
+        ).execution_options(
+            synchronize_session=False
+        )
+    ).all()
+
+    # deleted resources can not be referenced, so their urls are kept in details of the event
+    db.session.execute(
+        insert(NewsFeedItem),
+        [
+            {
+                "event_type": EventType.RESOURCE_DELETED,
+                "details": {"unavailable_count": unavailable_count, "urls": deleted_urls},
+            }
+        ],
     )
-    db.session.add(status)
+
     db.session.commit()
+    invalidate_cached_responses()
+
+    return {
+        "resources": len(deleted_urls),
+        "statuses": deleted_statuses.rowcount,
+        "news_feed_items": deleted_news_feed_items.rowcount,
+    }
 
 
-def update_counter_for_resource_availability(resource: WebResource, is_available: bool):
-    """Increment or reset counter in WebResource model."""
-    if is_available:
-        resource.unavailable_count = 0
-    else:
-        resource.unavailable_count += 1
-    db.session.add(resource)
+def save_check_results(
+    results: List[CheckResult],
+    min_interval: int,
+    max_interval: int,
+    backoff_factor: float,
+):
+    """
+    Save results of availability checks for multiple resources in one transaction.
+    Statuses and newsfeed items are inserted with multi-row inserts, availability counters,
+    the latest status and the next check time of resources are updated
+    with a single UPDATE ... FROM (VALUES ...).
+
+    Check interval of a resource is reset to `min_interval` after the first check
+    and after every status change, and grows `backoff_factor` times up to `max_interval`
+    while the status stays the same.
+
+    Resources skipped by an open circuit breaker were not contacted: their statuses are saved,
+    but counters, the latest status and the interval of resources are kept, only the next check is scheduled.
+    """
+    db.session.execute(
+        insert(WebResourceStatus),
+        [
+            {
+                "resource_id": result.resource_id,
+                "status_code": result.status_code,
+                "is_available": result.is_available,
+                "outcome": result.outcome,
+            }
+            for result in results
+        ],
+    )
+
+    checked_resources = values(
+        column("id", Integer),
+        column("status_code", Integer),
+        column("is_available", Boolean),
+        column("etag", String),
+        column("last_modified", String),
+        column("outcome", String),
+        name="checked_resources",
+    ).data(
+        [
+            (
+                result.resource_id,
+                result.status_code,
+                result.is_available,
+                result.etag,
+                result.last_modified,
+                result.outcome.value,
+            )
+            for result in results
+        ]
+    )
+
+    # SET expressions below see the values of columns from before the update
+    not_probed = checked_resources.c.outcome == ProbeOutcome.CIRCUIT_OPEN.value
+    status_changed = WebResource.last_is_available.is_distinct_from(checked_resources.c.is_available)
+    check_interval = case(
+        (not_probed, func.coalesce(WebResource.check_interval, min_interval)),
+        (or_(WebResource.check_interval.is_(None), status_changed), min_interval),
+        else_=func.least(
+            cast(WebResource.check_interval * backoff_factor, Integer),
+            max_interval,
+        ),
+    )
+
+    db.session.execute(
+        update(WebResource).where(
+            WebResource.id == checked_resources.c.id
+        ).values(
+            unavailable_count=case(
+                (not_probed, WebResource.unavailable_count),
+                (checked_resources.c.is_available, 0),
+                else_=func.coalesce(WebResource.unavailable_count, 0) + 1,
+            ),
+            # NULLs of VALUES are typed as text if no result of the batch has a status code
+            last_status_code=case(
+                (not_probed, WebResource.last_status_code),
+                else_=cast(checked_resources.c.status_code, Integer),
+            ),
+            last_is_available=case(
+                (not_probed, WebResource.last_is_available),
+                else_=checked_resources.c.is_available,
+            ),
+            # same transaction timestamp as server default of WebResourceStatus.request_time
+            last_checked_at=case(
+                (not_probed, WebResource.last_checked_at),
+                else_=func.now(),
+            ),
+            check_interval=check_interval,
+            etag=checked_resources.c.etag,
+            last_modified=checked_resources.c.last_modified,
+            next_check_at=func.now() + check_interval * literal_column("INTERVAL '1 second'"),
+        ).execution_options(
+            synchronize_session=False
+        )
+    )
+
+    # add newsfeed items for resources which status has changed from the last time
+    status_changed_items = [
+        {"resource_id": result.resource_id, "event_type": EventType.STATUS_CHANGED}
+        for result in results if result.status_changed
+    ]
+    if status_changed_items:
+        db.session.execute(insert(NewsFeedItem), status_changed_items)
+
     db.session.commit()
+    # statuses of resources are shown in cached lists
+    invalidate_cached_responses()
 
 
-# def get_resource_by_uuid(uuid_: str) -> WebResource | NoReturn:
-#     resource = WebResource.query.filter_by(uuid=uuid_).first()
+def get_resource_by_uuid(uuid_: str) -> WebResource:
+    """Get WebResource instance with the given uuid. Raise ResourceNotFoundError if there is no such resource."""
+    resource = WebResource.query.filter_by(uuid=uuid_).first()
 
-#     if not resource:
-#         raise exceptions.NotFoundError
+    if not resource:
+        raise exceptions.ResourceNotFoundError
 
-#     return resource
+    return resource
 
 
 def add_image_to_resource(web_resource: WebResource, image: FileStorage):
@@ -173,6 +505,7 @@ def add_image_to_resource(web_resource: WebResource, image: FileStorage):
     web_resource.screenshot = image.read()
     db.session.add(web_resource)
     db.session.commit()
+    invalidate_cached_responses()
 
     # create_newsfeed_item(
     #     resource=resource,
@@ -195,43 +528,146 @@ def get_file_processing_request_by_id(request_id: int) -> Optional[FileProcessin
     return processing_request
 
 
-def extract_duplicates(urls: List[str]) -> List[str]:
-
-    existing_resources = db.session.query(WebResource).filter(
-        WebResource.full_url.in_(urls)
-    ).all()
+def insert_web_resources(web_resources: List[UrlPartsDict]) -> int:
+    """
+    Insert resources and their RESOURCE_ADDED newsfeed items without committing the transaction.
+    Duplicates are resolved by the unique index with INSERT ... ON CONFLICT (full_url) DO NOTHING,
+    rows are sent in multi-row batches and ids are returned only for the inserted rows.
+    """
+    if not web_resources:
+        return 0
 
-    # extract it full url field
-    existing_urls = [obj.full_url for obj in existing_resources]
+    # the same url can occur in the given list several times
+    rows = list({web_resource["full_url"]: web_resource for web_resource in web_resources}.values())
 
-    # filter all urls that need to be save
-    urls_to_save = [url for url in urls if url not in existing_urls]
+    inserted_ids = db.session.scalars(
+        postgresql.insert(WebResource).on_conflict_do_nothing(
+            index_elements=[WebResource.full_url]
+        ).returning(
+            WebResource.id
+        ),
+        rows,
+    ).all()
 
-    return urls_to_save
+    if inserted_ids:
+        db.session.execute(
+            insert(NewsFeedItem),
+            [{"resource_id": resource_id, "event_type": EventType.RESOURCE_ADDED} for resource_id in inserted_ids],
+        )
 
+    return len(inserted_ids)
+
+
+def get_or_create_file_processing_checkpoint(
+    request_id: int,
+    start_line: int,
+    stop_line: int,
+) -> FileProcessingCheckpoint:
+    """Get checkpoint of the line range of file, create checkpoint at the start of range if it does not exist."""
+    db.session.execute(
+        postgresql.insert(FileProcessingCheckpoint).values(
+            request_id=request_id,
+            start_line=start_line,
+            stop_line=stop_line,
+            next_line=start_line,
+        ).on_conflict_do_nothing(
+            index_elements=[FileProcessingCheckpoint.request_id, FileProcessingCheckpoint.start_line]
+        )
+    )
+    db.session.commit()
 
-def bulk_create_web_resources(validated_urls: List[str]):
-    """Parse and save multiple WebResource instances in the database using bulk_create."""
-    web_resources = []
+    return FileProcessingCheckpoint.query.filter_by(request_id=request_id, start_line=start_line).one()
 
-    urls_to_save = extract_duplicates(urls=validated_urls)
 
-    # find in DB those WebResources instances that already exist
+def save_processed_lines(
+    checkpoint: FileProcessingCheckpoint,
+    web_resources: List[UrlPartsDict],
+    errors: List[FileProcessingErrorDict],
+    processed_count: int,
+) -> int:
+    """
+    Insert resources parsed from the next lines of range and invalid lines among them,
+    and move checkpoint past these lines in one transaction. Return number of inserted resources.
+    Raise CheckpointMovedError if checkpoint was moved by another task processing the same range,
+    e.g. by a redelivered copy of the task, the transaction is rolled back then.
+    """
+    inserted_count = insert_web_resources(web_resources)
+
+    if errors:
+        db.session.execute(
+            postgresql.insert(FileProcessingError).on_conflict_do_nothing(
+                index_elements=[FileProcessingError.request_id, FileProcessingError.line_number]
+            ),
+            [{"request_id": checkpoint.request_id, **error} for error in errors],
+        )
 
-    for url in urls_to_save:
-        parsed_url = parse_url(url=url)
-        web_resource = WebResource(
-            full_url=url,
-            protocol=parsed_url.protocol,
-            domain=parsed_url.domain,
-            domain_zone=parsed_url.domain_zone,
-            url_path=parsed_url.path,
-            query_params=parsed_url.query_params,
+    moved = db.session.execute(
+        update(FileProcessingCheckpoint).where(
+            FileProcessingCheckpoint.id == checkpoint.id,
+            FileProcessingCheckpoint.next_line == checkpoint.next_line,
+        ).values(
+            next_line=FileProcessingCheckpoint.next_line + processed_count,
+            processed_count=FileProcessingCheckpoint.processed_count + processed_count,
+            inserted_count=FileProcessingCheckpoint.inserted_count + inserted_count,
+            errors_count=FileProcessingCheckpoint.errors_count + len(errors),
+        ).execution_options(
+            synchronize_session=False
         )
-        web_resources.append(web_resource)
+    )
+
+    if moved.rowcount != 1:
+        db.session.rollback()
+        raise exceptions.CheckpointMovedError
 
-    db.session.bulk_save_objects(web_resources)
     db.session.commit()
+    db.session.refresh(checkpoint)
+    if inserted_count:
+        invalidate_cached_responses()
+
+    return inserted_count
+
+
+def get_file_processing_totals(request_id: int) -> FileProcessingTotalsDict:
+    """Sum counters of all checkpoints of the file processing request."""
+    totals = db.session.query(
+        func.coalesce(func.sum(FileProcessingCheckpoint.processed_count), 0),
+        func.coalesce(func.sum(FileProcessingCheckpoint.inserted_count), 0),
+        func.coalesce(func.sum(FileProcessingCheckpoint.errors_count), 0),
+        func.coalesce(func.bool_and(FileProcessingCheckpoint.next_line >= FileProcessingCheckpoint.stop_line), True),
+    ).filter(
+        FileProcessingCheckpoint.request_id == request_id
+    ).one()
+
+    processed_count, inserted_count, errors_count, is_completed = totals
+    return {
+        "processed": processed_count,
+        "inserted": inserted_count,
+        "errors": errors_count,
+        "is_completed": is_completed,
+    }
+
+
+def get_file_processing_errors(
+    request_id: int,
+    after_line_number: Optional[int] = None,
+    limit: int = 100,
+) -> List[FileProcessingError]:
+    """
+    Get invalid lines of the file processing request ordered by line number.
+    Lines are paginated by keyset: the next page starts after the last line number of the previous one.
+    """
+    query = FileProcessingError.query.filter(
+        FileProcessingError.request_id == request_id
+    ).order_by(
+        FileProcessingError.line_number
+    ).limit(
+        limit
+    )
+
+    if after_line_number is not None:
+        query = query.filter(FileProcessingError.line_number > after_line_number)
+
+    return query.all()
 
 
 def update_processing_request(
@@ -240,7 +676,6 @@ def update_processing_request(
     total_count: Optional[int] = None,
     processed_count: Optional[int] = None,
     errors_count: Optional[int] = None,
-    error_urls: Optional[List[str]] = None,
     status: Optional[StatusOption] = None,
 ):
     """Update the given fields in the given processing request in DB."""
@@ -257,9 +692,6 @@ def update_processing_request(
     if errors_count is not None:
         processing_request.errors_count = errors_count
 
-    if error_urls is not None:
-        processing_request.error_urls = error_urls
-
     if status is not None:
         processing_request.status = status
 
@@ -267,24 +699,22 @@ def update_processing_request(
     db.session.commit()
 
 
-# def create_newsfeed_item(resource, event):
-#     """Create new NewsFeedItem in DB with the given event for the given resource."""
+def create_newsfeed_item(resource, event):
+    """Create new NewsFeedItem in DB with the given event for the given resource."""
 
-#     news_item = NewsFeedItem(
-#         event_type=event,
-#         resource=resource
-#     )
+    news_item = NewsFeedItem(
+        event_type=event,
+        resource=resource
+    )
 
-#     db.session.add(news_item)
-#     db.session.commit()
+    db.session.add(news_item)
+    db.session.commit()
 
 
 def get_resource_page(resource_uuid: str):
     """Get all WebResource data including related."""
-    try:
-        get_resource_by_uuid(resource_uuid)
-    except exceptions.NotFoundError:
-        raise
+    # raise ResourceNotFoundError if resource does not exist
+    get_resource_by_uuid(resource_uuid)
 
     # Join the News and StatusCode tables with the WebResource table
     query = db.session.query(WebResource, NewsFeedItem, WebResourceStatus).\
@@ -329,3 +759,61 @@ def paginate_query(query, page, per_page, endpoint, **kwargs) -> PaginatedItemDi
         }
     }
     return data
+
+
+def estimate_web_resources_count() -> Optional[int]:
+    """
+    Estimate number of resources from table statistics of postgres, which are updated by autovacuum and ANALYZE.
+    Return None if the table has not been analyzed yet.
+    """
+    pg_class = table("pg_class", column("reltuples"), column("relname"))
+
+    estimate = db.session.execute(
+        select(
+            pg_class.c.reltuples
+        ).where(
+            pg_class.c.relname == WebResource.__table__.name
+        )
+    ).scalar()
+
+    if estimate is None or estimate < 0:
+        return None
+    return int(estimate)
+
+
+def paginate_query_by_cursor(
+    query,
+    cursor: Optional[int],
+    per_page: int,
+    endpoint: str,
+    total_items: Optional[int] = None,
+    **kwargs,
+) -> PaginatedItemDict:
+    """
+    Paginate query of resources ordered by id descending by keyset. Cursor is id of the last resource
+    of the previous page, so only rows of the page are read at any depth and nothing is counted.
+    Total number of items is not known, an estimate can be given instead.
+    """
+    if cursor is not None:
+        query = query.filter(WebResource.id < cursor)
+
+    rows = query.limit(per_page + 1).all()
+    items = [row._asdict() for row in rows[:per_page]]
+    next_cursor = items[-1]["id"] if len(rows) > per_page else None
+
+    data: PaginatedItemDict = {
+        'items': items,
+        '_meta': {
+            'per_page': per_page,
+            'cursor': cursor,
+            'next_cursor': next_cursor,
+            'total_items': total_items,
+        },
+        '_links': {
+            'self': url_for(endpoint, cursor=cursor or '', per_page=per_page, **kwargs),
+            'next': url_for(endpoint, cursor=next_cursor, per_page=per_page,
+                            **kwargs) if next_cursor is not None else None,
+            'first': url_for(endpoint, cursor='', per_page=per_page, **kwargs),
+        }
+    }
+    return data
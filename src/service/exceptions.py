@@ -16,3 +16,7 @@ class InvalidFileFormatError(Exception):
 
 class NoCSVFileError(Exception):
     pass
+
+
+class CheckpointMovedError(Exception):
+    pass
@@ -1,33 +1,44 @@
 import json
 import os
+from datetime import datetime, timezone
 from typing import Optional
 
 from pydantic import ValidationError
 from werkzeug.datastructures.structures import ImmutableMultiDict
 
 from src import app
+from src.checker.circuit_breaker import CIRCUIT_BREAKERS_KEY
 from src.db import models
 from src.repositories.processing_requests import ProcessingRequestRepository
 from src.repositories.web_resources import WebResourceRepository
+from src.schemes.checker import CircuitBreakerSchema, ListCircuitBreakerSchema
+from src.schemes.processing_requests import (FileProcessingErrorSchema,
+                                             ListFileProcessingErrorSchema,
+                                             ProcessingRequestSchema)
+from src.schemes.response_cache import ResponseCacheStatsSchema
+from src.schemes.url_filter import UrlFilterStatsSchema
 from src.schemes.web_resources import (FileRequestSchema,
                                        PaginatedListResourceSchema,
                                        ResourceAddRequestSchema,
                                        ResourceAddResponseSchema,
-                                       ResourceBaseSchema,
                                        ResourcePageResponseSchema,
                                        ResourcePageSchema,
-                                       ZipFileRequestSchema)
-from src.service import exceptions
+                                       UploadedFileRequestSchema)
+from src.service import db, exceptions
+from src.service.progress import get_processing_progress
+from src.service.response_cache import ResponseCache, make_response_cache
+from src.service.url_filter import UrlBloomFilter
 from src.service.web_resources import WebResourceService
-from src.tasks import FileProcessingTaskResponse, process_zip_archive
+from src.tasks import FileProcessingTaskResponse, make_url_filter
 from src.utils import ziploader
-from src.web.app import db
+from src.web.app import db as sqlalchemy_db
 
 
 def handle_post_url_json(body) -> ResourceAddResponseSchema:
     resource_service = WebResourceService(
-        WebResourceRepository(db.session),
-        ProcessingRequestRepository(db.session),
+        WebResourceRepository(sqlalchemy_db.session),
+        ProcessingRequestRepository(sqlalchemy_db.session),
+        url_filter=make_url_filter(),
     )
     try:
         resource_add_schema = ResourceAddRequestSchema(**body)
@@ -43,19 +54,30 @@ def handle_post_url_json(body) -> ResourceAddResponseSchema:
         raise e
 
 
-def handle_post_url_file(files) -> int:
+def handle_post_url_file(files) -> ProcessingRequestSchema:
     resource_service = WebResourceService(
-        WebResourceRepository(db.session),
-        ProcessingRequestRepository(db.session),
+        WebResourceRepository(sqlalchemy_db.session),
+        ProcessingRequestRepository(sqlalchemy_db.session),
     )
     try:
-        validated_data = ZipFileRequestSchema(**files)
+        validated_data = UploadedFileRequestSchema(**files)
         return resource_service.create_resources_from_file(validated_data)
 
     except ValidationError as e:
         raise e
 
 
+def handle_post_url_form(url: str) -> models.WebResource:
+    """Create resource from url validated by the web form and add its url to the bloom filter."""
+    web_resource = db.create_web_resource(validated_url=url)
+
+    url_filter = make_url_filter()
+    if url_filter is not None:
+        url_filter.add([web_resource.full_url])
+
+    return web_resource
+
+
 def handle_add_image_for_web_resource(files: ImmutableMultiDict, resource_uuid: str) -> None:
     try:
         web_resource = db.get_resource_by_uuid(resource_uuid)
@@ -76,28 +98,110 @@ def handle_get_request_status(request_id, storage_client) -> FileProcessingTaskR
         raise exceptions.ResourceNotFoundError
 
     if processing_request.status == models.StatusOption.INPROCESS:
-        task_id = processing_request.task_id
-        status_info_from_storage = storage_client.get(name=task_id)
+        status_info = get_processing_progress(storage_client=storage_client, task_id=processing_request.task_id)
 
-        if status_info_from_storage:
-            status_info = json.loads(status_info_from_storage)
+        if status_info:
             return FileProcessingTaskResponse(**status_info)
-        else:
-            # TODO: unexpected case but should be handled
-            ...
 
-    else:
-        status_info: FileProcessingTaskResponse = {
-            "status": processing_request.status.value,
-            "processed": processing_request.processed_count,
-            "total": processing_request.total_count,
-            "errors": {
-                "count": processing_request.errors_count,
-                "error_urls": processing_request.error_urls,
-            }
+    # progress of processing that is not started yet or is not in redis is read from DB
+    status_info: FileProcessingTaskResponse = {
+        "status": processing_request.status.value,
+        "processed": processing_request.processed_count,
+        "total": processing_request.total_count,
+        "progress": 1.0 if processing_request.status == models.StatusOption.SUCCEEDED else 0.0,
+        "errors": {
+            "count": processing_request.errors_count,
+            # all invalid lines are paginated by the errors endpoint
+            "error_urls": [
+                error.line for error in db.get_file_processing_errors(
+                    request_id=request_id,
+                    limit=app.config["FILE_PROCESSING"]["PROGRESS"]["ERRORS_SAMPLE_SIZE"],
+                )
+            ],
         }
+    }
 
-        return status_info
+    return status_info
+
+
+def handle_get_request_errors(request_id: int, cursor: Optional[int], limit: int) -> ListFileProcessingErrorSchema:
+    """Get page of invalid lines of the processing request that starts after line number given as cursor."""
+    processing_request = db.get_file_processing_request_by_id(request_id)
+
+    if not processing_request:
+        raise exceptions.ResourceNotFoundError
+
+    # one more row is fetched to know whether there is the next page
+    errors = db.get_file_processing_errors(request_id=request_id, after_line_number=cursor, limit=limit + 1)
+    has_next = len(errors) > limit
+    errors = errors[:limit]
+
+    return ListFileProcessingErrorSchema(
+        errors=[
+            FileProcessingErrorSchema(line_number=error.line_number, line=error.line, reason=error.reason)
+            for error in errors
+        ],
+        next_cursor=errors[-1].line_number if has_next else None,
+    )
+
+
+def handle_get_circuit_breakers(storage_client) -> ListCircuitBreakerSchema:
+    """Get open circuit breakers of the checker and counts of probes they short-circuited."""
+    short_circuited = {
+        domain.decode(): int(count)
+        for domain, count in storage_client.hgetall(f"{CIRCUIT_BREAKERS_KEY}:hits").items()
+    }
+
+    circuit_breakers = []
+    for domain, state_json in storage_client.hgetall(CIRCUIT_BREAKERS_KEY).items():
+        domain = domain.decode()
+        state = json.loads(state_json)
+        circuit_breakers.append(
+            CircuitBreakerSchema(
+                domain=domain,
+                state=state["state"],
+                consecutive_failures=state["consecutive_failures"],
+                opened_at=datetime.fromtimestamp(state["opened_at"], tz=timezone.utc) if state["opened_at"] else None,
+                short_circuited=short_circuited.get(domain, 0),
+            )
+        )
+
+    return ListCircuitBreakerSchema(
+        circuit_breakers=sorted(circuit_breakers, key=lambda breaker: breaker.domain),
+        short_circuited_total=sum(short_circuited.values()),
+    )
+
+
+def handle_get_url_filter_stats(storage_client) -> UrlFilterStatsSchema:
+    """Get size of the bloom filter of urls and rates of its hits and false positives."""
+    filter_conf = app.config["URL_FILTER"]
+    url_filter = UrlBloomFilter(
+        storage_client=storage_client,
+        capacity=filter_conf["CAPACITY"],
+        error_rate=filter_conf["ERROR_RATE"],
+    )
+    return UrlFilterStatsSchema(enabled=filter_conf["ENABLED"], **url_filter.get_stats())
+
+
+def handle_get_response_cache_stats(storage_client) -> ResponseCacheStatsSchema:
+    """Get hit rate of the cache of responses and average latency of hits and misses."""
+    cache_conf = app.config["RESPONSE_CACHE"]
+    response_cache = ResponseCache(storage_client=storage_client, ttl=cache_conf["TTL"])
+    return ResponseCacheStatsSchema(enabled=cache_conf["ENABLED"], **response_cache.get_stats())
+
+
+def handle_get_cached_resources_with_filters(**filters) -> bytes:
+    """
+    Get serialized page of resources with the given filters, see `handle_get_resources_with_filters`.
+    Page is read from the cache of responses if it is enabled.
+    """
+    def build() -> bytes:
+        return app.json.dumps(handle_get_resources_with_filters(**filters).dict()).encode()
+
+    response_cache = make_response_cache()
+    if response_cache is None:
+        return build()
+    return response_cache.get_or_build("resources", filters, build)
 
 
 def handle_get_resources_with_filters(
@@ -107,26 +211,52 @@ def handle_get_resources_with_filters(
     uuid: Optional[str],
     page: Optional[int],
     per_page: Optional[int],
+    cursor: Optional[int] = None,
+    use_cursor: bool = False,
+    endpoint: str = 'main.get_resources',
 ) -> PaginatedListResourceSchema:
+    """
+    Get page of resources with the given filters. Pages are numbered by default,
+    with `use_cursor` the page after resource with id `cursor` is read by keyset
+    and total number of resources is estimated, only when there are no filters.
+    """
 
     query = db.get_web_resources_query(
-        left_join=True,
+        with_status=True,
         domain_zone=domain_zone,
         resource_id=resource_id,
         resource_uuid=uuid,
         is_available=availability,
     )
 
-    paginated_resource_list = db.paginate_query(
-        query,
-        page,
-        per_page,
-        'main.get_resources',
-    )
+    if use_cursor:
+        filters = {
+            'domain_zone': domain_zone,
+            'availability': availability,
+            'id': resource_id,
+            'uuid': uuid,
+        }
+        filters = {key: value for key, value in filters.items() if value}
+
+        paginated_resource_list = db.paginate_query_by_cursor(
+            query,
+            cursor,
+            per_page,
+            endpoint,
+            total_items=None if filters else db.estimate_web_resources_count(),
+            **filters,
+        )
+    else:
+        paginated_resource_list = db.paginate_query(
+            query,
+            page,
+            per_page,
+            endpoint,
+        )
 
     paginated_resources_with_meta_data = PaginatedListResourceSchema(
         items=[
-            ResourceBaseSchema(**item).dict() for item in paginated_resource_list["items"]
+            ResourceAddResponseSchema(**item) for item in paginated_resource_list["items"]
         ],
         meta=paginated_resource_list.get('_meta'),
         links=paginated_resource_list.get('_links')
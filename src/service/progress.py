@@ -0,0 +1,154 @@
+import time
+from typing import Callable, List, Optional
+
+from redis import Redis
+
+# socketio namespace where progress of file processing is pushed to clients
+PROGRESS_NAMESPACE = "/processing-requests"
+
+
+def progress_room(request_id: int) -> str:
+    """Name of socketio room of clients watching processing of the file."""
+    return f"processing-request:{request_id}"
+
+
+def progress_key(task_id: str) -> str:
+    return f"{task_id}:progress"
+
+
+def error_urls_key(task_id: str) -> str:
+    return f"{task_id}:error_urls"
+
+
+class ProcessingProgress:
+    """
+    Progress of file processing stored in Redis.
+    Counters are kept in a hash and incremented with HINCRBY, the first `errors_sample_size` invalid urls
+    are kept in a list as a sample, so every update costs the same whatever the size of file.
+    All invalid lines are stored in the database, not in Redis.
+    Updates are buffered and written in one pipeline when `flush_every_lines` lines were processed
+    or `flush_interval` seconds passed since the previous write, and once more when progress is closed.
+    Several tasks can report progress of the same file, their counters are summed.
+
+    Every write is also passed to `on_update`, e.g. to push it to clients watching the file.
+    Update contains counters summed by Redis, so it is exact whichever task sent it,
+    and only invalid urls added since the previous write.
+    """
+
+    def __init__(
+        self,
+        storage_client: Redis,
+        task_id: str,
+        flush_every_lines: int = 10000,
+        flush_interval: float = 1,
+        errors_sample_size: int = 10,
+        on_update: Optional[Callable[[dict], None]] = None,
+    ):
+        self.storage_client = storage_client
+        self.progress_key = progress_key(task_id)
+        self.error_urls_key = error_urls_key(task_id)
+        self.flush_every_lines = flush_every_lines
+        self.flush_interval = flush_interval
+        self.errors_sample_size = errors_sample_size
+        self.on_update = on_update
+        self._processed = 0
+        self._errors = 0
+        self._error_urls: List[str] = []
+        self._error_urls_sent = 0
+        self._flushed_at = time.monotonic()
+
+    def __enter__(self) -> "ProcessingProgress":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.flush()
+
+    def start(self, status: str, total: Optional[int] = None, processed: int = 0, errors: int = 0):
+        """Reset progress of the file. Counters of resumed processing start from the given values."""
+        mapping = {"status": status, "processed": processed, "errors": errors, "progress": 0}
+        if total is not None:
+            mapping["total"] = total
+
+        pipe = self.storage_client.pipeline(transaction=False)
+        pipe.delete(self.progress_key, self.error_urls_key)
+        pipe.hset(self.progress_key, mapping=mapping)
+        pipe.execute()
+
+        self._publish({**mapping, "error_urls": []})
+
+    def add(self, processed: int, error_urls: List[str]):
+        """Count processed lines and invalid urls among them and flush updates if needed."""
+        self._processed += processed
+        self._errors += len(error_urls)
+
+        # urls over the sample are only counted
+        free_slots = self.errors_sample_size - self._error_urls_sent - len(self._error_urls)
+        if free_slots > 0:
+            self._error_urls.extend(error_urls[:free_slots])
+
+        if (
+            self._processed >= self.flush_every_lines
+            or time.monotonic() - self._flushed_at >= self.flush_interval
+        ):
+            self.flush()
+
+    def flush(self):
+        """Write buffered updates to Redis in one round trip."""
+        if self._processed or self._errors:
+            pipe = self.storage_client.pipeline(transaction=False)
+            pipe.hincrby(self.progress_key, "processed", self._processed)
+            pipe.hincrby(self.progress_key, "errors", self._errors)
+            if self._error_urls:
+                pipe.rpush(self.error_urls_key, *self._error_urls)
+                # list is shared with other tasks processing the same file
+                pipe.ltrim(self.error_urls_key, 0, self.errors_sample_size - 1)
+            processed, errors, *_ = pipe.execute()
+
+            self._publish({"processed": processed, "errors": errors, "error_urls": self._error_urls})
+
+            self._error_urls_sent += len(self._error_urls)
+            self._processed = 0
+            self._errors = 0
+            self._error_urls = []
+
+        self._flushed_at = time.monotonic()
+
+    def finish(self, status: str, total: Optional[int] = None):
+        """Flush updates and set final status of processing."""
+        self.flush()
+        mapping = {"status": status, "progress": 1}
+        if total is not None:
+            mapping["total"] = total
+        self.storage_client.hset(self.progress_key, mapping=mapping)
+        self._publish({**mapping, "error_urls": []})
+
+    def _publish(self, update: dict):
+        if self.on_update is not None:
+            self.on_update(update)
+
+
+def get_processing_progress(storage_client: Redis, task_id: str) -> Optional[dict]:
+    """Read progress of file processing from Redis. Return None if there is no progress of the task."""
+    pipe = storage_client.pipeline(transaction=False)
+    pipe.hgetall(progress_key(task_id))
+    pipe.lrange(error_urls_key(task_id), 0, -1)
+    progress, error_urls = pipe.execute()
+
+    if not progress:
+        return None
+
+    progress = {key.decode(): value.decode() for key, value in progress.items()}
+    total = int(progress["total"]) if "total" in progress else None
+    processed = int(progress["processed"])
+
+    return {
+        "status": progress["status"],
+        "total": total,
+        "processed": processed,
+        # when total is known progress is exact, otherwise lines of file are still counted
+        "progress": min(processed / total, 1.0) if total else float(progress["progress"]),
+        "errors": {
+            "count": int(progress["errors"]),
+            "error_urls": [url.decode() for url in error_urls],
+        },
+    }
@@ -0,0 +1,114 @@
+import hashlib
+import json
+import time
+from typing import Callable, Optional
+
+from redis import Redis
+
+from src import app
+
+RESPONSE_CACHE_KEY = "response_cache"
+
+
+class ResponseCache:
+    """
+    Cache of serialized API responses in Redis, keyed by name of the response and its normalized parameters.
+
+    Every key contains the current generation of the cache, so all responses are invalidated at once
+    by incrementing the generation after data is changed. Responses of old generations are not read anymore
+    and expire after `ttl` seconds. Generation is read before the response is built, so a response built
+    while data is changed is stored under the old generation and can not hide the change.
+
+    Numbers of hits and misses and time spent on them are counted in Redis.
+    """
+
+    def __init__(self, storage_client: Redis, ttl: int = 60, key: str = RESPONSE_CACHE_KEY):
+        self.storage_client = storage_client
+        self.ttl = ttl
+        self.key = key
+        self.generation_key = f"{key}:generation"
+        self.stats_key = f"{key}:stats"
+
+    @staticmethod
+    def normalize_params(params: dict) -> str:
+        """Serialize parameters in stable order, parameters without value are dropped."""
+        params = {name: value for name, value in params.items() if value is not None and value != ""}
+        return json.dumps(params, sort_keys=True, default=str)
+
+    def _response_key(self, name: str, generation: int, params: dict) -> str:
+        digest = hashlib.blake2b(self.normalize_params(params).encode(), digest_size=16).hexdigest()
+        return f"{self.key}:{name}:{generation}:{digest}"
+
+    def get_generation(self) -> int:
+        return int(self.storage_client.get(self.generation_key) or 0)
+
+    def get_or_build(self, name: str, params: dict, build: Callable[[], bytes]) -> bytes:
+        """Read response from cache or build it and store it in cache if it is missing."""
+        started_at = time.perf_counter()
+
+        response_key = self._response_key(name, self.get_generation(), params)
+        response = self.storage_client.get(response_key)
+        is_hit = response is not None
+
+        pipe = self.storage_client.pipeline(transaction=False)
+        if not is_hit:
+            response = build()
+            pipe.set(response_key, response, ex=self.ttl)
+
+        duration = time.perf_counter() - started_at
+        pipe.hincrby(self.stats_key, "hits" if is_hit else "misses", 1)
+        pipe.hincrbyfloat(self.stats_key, "hit_seconds" if is_hit else "miss_seconds", duration)
+        pipe.execute()
+
+        return response
+
+    def invalidate(self):
+        """Invalidate all cached responses. Has to be called after changes are committed."""
+        self.storage_client.incr(self.generation_key)
+
+    def get_stats(self) -> dict:
+        """Read counters of the cache and compute hit rate and average latency of hits and misses."""
+        pipe = self.storage_client.pipeline(transaction=False)
+        pipe.get(self.generation_key)
+        pipe.hgetall(self.stats_key)
+        generation, stats = pipe.execute()
+
+        stats = {key.decode(): float(value) for key, value in stats.items()}
+        hits = int(stats.get("hits", 0))
+        misses = int(stats.get("misses", 0))
+
+        average_hit_ms: Optional[float] = None
+        if hits:
+            average_hit_ms = stats.get("hit_seconds", 0) / hits * 1000
+        average_miss_ms: Optional[float] = None
+        if misses:
+            average_miss_ms = stats.get("miss_seconds", 0) / misses * 1000
+
+        return {
+            "ttl": self.ttl,
+            "generation": int(generation or 0),
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+            "average_hit_ms": average_hit_ms,
+            "average_miss_ms": average_miss_ms,
+        }
+
+
+def make_response_cache() -> Optional[ResponseCache]:
+    """Create cache of API responses with the TTL from app config. Return None if it is disabled."""
+    cache_conf = app.config["RESPONSE_CACHE"]
+    if not cache_conf["ENABLED"]:
+        return None
+
+    return ResponseCache(storage_client=app.extensions["redis"], ttl=cache_conf["TTL"])
+
+
+def invalidate_cached_responses():
+    """
+    Invalidate cached responses if the cache is enabled in app config.
+    Called by every DB write of resources after it is committed.
+    """
+    response_cache = make_response_cache()
+    if response_cache is not None:
+        response_cache.invalidate()
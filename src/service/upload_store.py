@@ -0,0 +1,166 @@
+import io
+import os
+import uuid
+from abc import ABC, abstractmethod
+from typing import BinaryIO
+
+from redis import Redis
+
+
+class UploadStore(ABC):
+    """
+    Storage of uploaded files shared by web nodes and workers. Upload is written in chunks
+    of `chunk_size` bytes as it is received, and becomes visible under its key only when it is complete.
+    Stored file is opened as seekable binary file, so zip archives can be read without copying.
+    """
+
+    def __init__(self, chunk_size: int = 1024 * 1024):
+        self.chunk_size = chunk_size
+
+    @abstractmethod
+    def save(self, key: str, stream: BinaryIO) -> int:
+        """Save stream under the given key. Return size of saved file."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def open(self, key: str) -> BinaryIO:
+        """Open stored file for reading. Raise FileNotFoundError if there is no file with the key."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def delete(self, key: str):
+        raise NotImplementedError
+
+
+class LocalUploadStore(UploadStore):
+    """Uploads stored in local directory, which can be a volume mounted to web nodes and workers."""
+
+    def __init__(self, folder: str, chunk_size: int = 1024 * 1024):
+        super().__init__(chunk_size=chunk_size)
+        self.folder = folder
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.folder, os.path.basename(key))
+
+    def save(self, key: str, stream: BinaryIO) -> int:
+        os.makedirs(self.folder, exist_ok=True)
+        path = self._path(key)
+        partial_path = f"{path}.{uuid.uuid4().hex}.partial"
+
+        size = 0
+        try:
+            with open(partial_path, "wb") as file:
+                while chunk := stream.read(self.chunk_size):
+                    file.write(chunk)
+                    size += len(chunk)
+            os.replace(partial_path, path)
+        finally:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+
+        return size
+
+    def open(self, key: str) -> BinaryIO:
+        return open(self._path(key), "rb")
+
+    def delete(self, key: str):
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+
+class RedisUploadStore(UploadStore):
+    """
+    Uploads stored in Redis strings. Chunks are appended with APPEND and read back with GETRANGE,
+    so stored file is read in ranges like an object in object storage, without loading it at once.
+    Size of upload is limited by the max size of Redis string, 512 MB.
+    """
+
+    def __init__(self, storage_client: Redis, chunk_size: int = 1024 * 1024, ttl: int = 7 * 24 * 3600):
+        super().__init__(chunk_size=chunk_size)
+        self.storage_client = storage_client
+        self.ttl = ttl
+
+    @staticmethod
+    def _key(key: str) -> str:
+        return f"upload:{key}"
+
+    def save(self, key: str, stream: BinaryIO) -> int:
+        partial_key = f"{self._key(key)}:{uuid.uuid4().hex}:partial"
+
+        size = 0
+        try:
+            while chunk := stream.read(self.chunk_size):
+                pipe = self.storage_client.pipeline(transaction=False)
+                pipe.append(partial_key, chunk)
+                # left by a request that was interrupted
+                pipe.expire(partial_key, self.ttl)
+                pipe.execute()
+                size += len(chunk)
+
+            pipe = self.storage_client.pipeline(transaction=True)
+            # empty upload still gets a key
+            pipe.append(partial_key, b"")
+            pipe.rename(partial_key, self._key(key))
+            pipe.expire(self._key(key), self.ttl)
+            pipe.execute()
+        except Exception:
+            self.storage_client.delete(partial_key)
+            raise
+
+        return size
+
+    def open(self, key: str) -> BinaryIO:
+        pipe = self.storage_client.pipeline(transaction=False)
+        pipe.exists(self._key(key))
+        pipe.strlen(self._key(key))
+        exists, size = pipe.execute()
+        if not exists:
+            raise FileNotFoundError(f"Upload {key} is not found.")
+
+        return io.BufferedReader(
+            _RedisRangeReader(self.storage_client, self._key(key), size),
+            buffer_size=self.chunk_size,
+        )
+
+    def delete(self, key: str):
+        self.storage_client.delete(self._key(key))
+
+
+class _RedisRangeReader(io.RawIOBase):
+    """Seekable raw file that reads Redis string with GETRANGE."""
+
+    def __init__(self, storage_client: Redis, key: str, size: int):
+        self.storage_client = storage_client
+        self.key = key
+        self.size = size
+        self.position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self.position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self.position
+        elif whence == io.SEEK_END:
+            offset += self.size
+        self.position = max(0, offset)
+        return self.position
+
+    def readinto(self, buffer) -> int:
+        length = min(len(buffer), self.size - self.position)
+        if length <= 0:
+            return 0
+
+        data = self.storage_client.getrange(self.key, self.position, self.position + length - 1)
+        buffer[:len(data)] = data
+        self.position += len(data)
+        return len(data)
+
@@ -0,0 +1,177 @@
+import hashlib
+import math
+import uuid
+from itertools import islice
+from typing import Iterable, List, Optional
+
+from redis import Redis
+
+URL_FILTER_KEY = "url_filter"
+
+# redis string can not be longer than 512 MB
+MAX_SIZE = 2 ** 32
+
+# seconds, filter left by a worker that died while building it is dropped after it
+BUILD_TIMEOUT = 3600
+
+
+class UrlBloomFilter:
+    """
+    Bloom filter of urls of all WebResource instances, stored in Redis bitmap and shared by all workers.
+    Url that is not in filter is definitely not in the database, url that is in filter is probably there
+    and has to be checked exactly. Filter never forgets urls, so deleted resources become false positives
+    until the filter is rebuilt.
+
+    Filter that is not built yet is treated as containing every url, so nothing is skipped.
+    Rebuild requested while another one is pending is not queued again, see `request_rebuild`.
+    Numbers of checks, urls found in filter and false positives are counted in Redis.
+    """
+
+    def __init__(
+        self,
+        storage_client: Redis,
+        capacity: int = 10_000_000,
+        error_rate: float = 0.01,
+        key: str = URL_FILTER_KEY,
+    ):
+        self.storage_client = storage_client
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.key = key
+        self.stats_key = f"{key}:stats"
+        self.rebuild_pending_key = f"{key}:rebuild_pending"
+
+        # optimal number of bits and hash functions for the capacity and the rate of false positives
+        self.size = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        if self.size > MAX_SIZE:
+            raise ValueError(f"Filter of {self.size} bits does not fit in redis string.")
+
+    def _positions(self, url: str) -> List[int]:
+        """Positions of bits of url, derived from two halves of one digest by double hashing."""
+        digest = hashlib.blake2b(url.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return [(first + i * second) % self.size for i in range(self.hashes)]
+
+    def _queue_bits(self, pipe, key: str, url: str, set_bits: bool = False):
+        """Queue one BITFIELD command that reads or sets all bits of url."""
+        args = []
+        for position in self._positions(url):
+            args += ["SET", "u1", position, 1] if set_bits else ["GET", "u1", position]
+        pipe.execute_command("BITFIELD", key, *args)
+
+    def is_built(self) -> bool:
+        return bool(self.storage_client.exists(self.key))
+
+    def request_rebuild(self) -> bool:
+        """
+        Mark rebuild of filter as pending. Return False if it is pending already, so the caller
+        does not queue another one. Mark is removed by the rebuild or expires if the rebuild is lost.
+        """
+        return bool(self.storage_client.set(self.rebuild_pending_key, 1, nx=True, ex=BUILD_TIMEOUT))
+
+    def might_contain(self, urls: List[str]) -> List[bool]:
+        """Check urls in one round trip. Return False for urls that are definitely not in the database."""
+        if not urls:
+            return []
+
+        pipe = self.storage_client.pipeline(transaction=False)
+        pipe.exists(self.key)
+        for url in urls:
+            self._queue_bits(pipe, self.key, url)
+        is_built, *bits = pipe.execute()
+
+        if not is_built:
+            return [True] * len(urls)
+
+        found = [all(url_bits) for url_bits in bits]
+
+        pipe = self.storage_client.pipeline(transaction=False)
+        pipe.hincrby(self.stats_key, "checks", len(urls))
+        pipe.hincrby(self.stats_key, "found", sum(found))
+        pipe.execute()
+
+        return found
+
+    def record_false_positives(self, count: int):
+        """
+        Count urls found in filter that turned out to be missing in the database.
+        Checks are not counted until filter is built, so false positives are not counted either.
+        """
+        if count and self.is_built():
+            self.storage_client.hincrby(self.stats_key, "false_positives", count)
+
+    def add(self, urls: List[str]):
+        """Add urls saved in the database. Nothing is added until filter is built."""
+        if not urls or not self.is_built():
+            return
+
+        pipe = self.storage_client.pipeline(transaction=False)
+        for url in urls:
+            self._queue_bits(pipe, self.key, url, set_bits=True)
+        pipe.execute()
+
+    def rebuild(self, urls: Iterable[str], batch_size: int = 10000) -> int:
+        """
+        Build new filter from all urls of the database and replace the current one with it at once.
+        Urls inserted while filter is built may be missed, the unique index of `full_url` still rejects them.
+        Return number of added urls.
+        """
+        build_key = f"{self.key}:build:{uuid.uuid4().hex}"
+
+        # bitmap is allocated at once, so an empty database gives a built filter too
+        pipe = self.storage_client.pipeline(transaction=False)
+        pipe.setbit(build_key, self.size - 1, 0)
+        # left by a worker that died while building
+        pipe.expire(build_key, BUILD_TIMEOUT)
+        pipe.execute()
+
+        added = 0
+        urls = iter(urls)
+        while batch := list(islice(urls, batch_size)):
+            pipe = self.storage_client.pipeline(transaction=False)
+            for url in batch:
+                self._queue_bits(pipe, build_key, url, set_bits=True)
+            pipe.execute()
+            added += len(batch)
+
+        pipe = self.storage_client.pipeline(transaction=True)
+        pipe.persist(build_key)
+        pipe.rename(build_key, self.key)
+        pipe.delete(self.stats_key)
+        pipe.delete(self.rebuild_pending_key)
+        pipe.execute()
+
+        return added
+
+    def get_stats(self) -> dict:
+        """Read counters of the filter and estimate number of urls in it from the number of set bits."""
+        pipe = self.storage_client.pipeline(transaction=False)
+        pipe.exists(self.key)
+        pipe.bitcount(self.key)
+        pipe.hgetall(self.stats_key)
+        is_built, set_bits, stats = pipe.execute()
+
+        stats = {key.decode(): int(value) for key, value in stats.items()}
+        checks = stats.get("checks", 0)
+        found = stats.get("found", 0)
+        false_positives = stats.get("false_positives", 0)
+
+        estimated_urls: Optional[int] = None
+        if is_built:
+            estimated_urls = round(-self.size / self.hashes * math.log(1 - min(set_bits, self.size - 1) / self.size))
+
+        return {
+            "is_built": bool(is_built),
+            "capacity": self.capacity,
+            "error_rate": self.error_rate,
+            "size": self.size,
+            "hashes": self.hashes,
+            "estimated_urls": estimated_urls,
+            "checks": checks,
+            "found": found,
+            "false_positives": false_positives,
+            "hit_rate": found / checks if checks else 0.0,
+            "false_positive_rate": false_positives / found if found else 0.0,
+        }
@@ -1,13 +1,13 @@
-import os
+from typing import Optional
 
-from src import app
 from src.repositories.processing_requests import ProcessingRequestRepository
 from src.repositories.web_resources import WebResourceRepository
 from src.schemes.processing_requests import ProcessingRequestSchema
-from src.schemes.web_resources import ResourceBaseSchema, ZipFileRequestSchema
+from src.schemes.web_resources import ResourceBaseSchema, UploadedFileRequestSchema
 from src.service import exceptions
 from src.service.exceptions import ResourceNotFoundError
-from src.tasks import process_zip_archive
+from src.service.url_filter import UrlBloomFilter
+from src.tasks import make_upload_store, process_uploaded_file
 from src.utils import ziploader
 from src.utils.urlparser import parse_url
 
@@ -17,39 +17,47 @@ class WebResourceService:
     def __init__(
         self,
         resource_repo: WebResourceRepository,
-        processing_request_repo: ProcessingRequestRepository
+        processing_request_repo: ProcessingRequestRepository,
+        url_filter: Optional[UrlBloomFilter] = None,
     ):
         self.resource_repo = resource_repo
         self.processing_requests_repo = processing_request_repo
+        self.url_filter = url_filter
 
     def create_resource_from_url(self, valid_url: str) -> ResourceBaseSchema:
         """
         Create single web resource in DB.
         Raise exception if already exists.
+        Url missing in the filter is not looked up, the unique index rejects it if filter is stale.
         """
         parsed_url = parse_url(valid_url)
-        existing_resource = self.resource_repo.get_by_full_url(parsed_url.full_url)
-        if not existing_resource:
-            web_resource = self.resource_repo.add_one(parsed_url)
-            # TODO: добавить создание объекта новости
-            return web_resource
-        else:
-            raise exceptions.AlreadyExistsError
-
-    def create_resources_from_file(self, valid_file: ZipFileRequestSchema) -> ProcessingRequestSchema:
-        """Create a task for processing multiple web resources from the file."""
+
+        if self.url_filter is None or self.url_filter.might_contain([parsed_url.full_url])[0]:
+            existing_resource = self.resource_repo.get_by_full_url(parsed_url.full_url)
+            if existing_resource:
+                raise exceptions.AlreadyExistsError
+            if self.url_filter is not None:
+                self.url_filter.record_false_positives(1)
+
+        web_resource = self.resource_repo.add_one(parsed_url)
+        # TODO: добавить создание объекта новости
+        if self.url_filter is not None:
+            self.url_filter.add([parsed_url.full_url])
+        return web_resource
+
+    def create_resources_from_file(self, valid_file: UploadedFileRequestSchema) -> ProcessingRequestSchema:
+        """
+        Create a task for processing multiple web resources from the file.
+        File is streamed to the upload store shared with workers in chunks, without reading it at once.
+        """
         if not ziploader.allowed_file(valid_file.file.filename):
             raise exceptions.InvalidFileFormatError("File format is not in allowed extensions.")
-        filename = ziploader.make_uuid_filename(valid_file.file.filename)
-        valid_file.file.save(
-            os.path.join(
-                app.config["UPLOAD_FOLDER"],
-                filename,
-            )
-        )
+        upload_key = ziploader.make_uuid_filename(valid_file.file.filename)
+        make_upload_store().save(upload_key, valid_file.file.stream)
+
         processing_request = self.processing_requests_repo.add_one()
-        process_zip_archive.delay(
-            zip_file=filename,
+        process_uploaded_file.delay(
+            upload_key=upload_key,
             request_id=processing_request.id
         )
         return processing_request
@@ -1,20 +1,25 @@
-import json
 import os
-from typing import List, Optional, TypedDict
+import time
+from typing import Iterable, List, Optional, Set, TypedDict
 
-import requests
-from celery import current_task, shared_task
+from celery import chord, current_task, shared_task
 from celery.utils.log import get_logger
-from flask_socketio import SocketIO
-from pydantic import ValidationError
-from redis import Redis
 
-from src import app
-from src.db.models import EventType, StatusOption
+from src import app, celery_socketio
+from src.checker.circuit_breaker import DomainCircuitBreaker
+from src.checker.engine import AvailabilityChecker, CheckResult, CheckTarget
+from src.checker.head_support import HeadSupportCache
+from src.checker.politeness import DomainRateLimiter, interleave_by_domain
+from src.checker.sink import CheckResultSink
+from src.db.models import StatusOption
 from src.service import db, exceptions
-from src.utils import ziploader
-
-socketio = SocketIO()
+from src.service.progress import (PROGRESS_NAMESPACE, ProcessingProgress,
+                                  progress_room)
+from src.service.upload_store import (LocalUploadStore, RedisUploadStore,
+                                      UploadStore)
+from src.service.url_filter import UrlBloomFilter
+from src.utils import urlvalidator, ziploader
+from src.utils.urlparser import UrlPartsDict
 
 logger = get_logger(__name__)
 
@@ -28,67 +33,345 @@ class FileProcessingErrorsDict(TypedDict):
 class FileProcessingTaskResponse(TypedDict):
     """Class that represens result of file processing."""
     status: str
-    total: int
+    total: Optional[int]
     processed: int
+    progress: float
     errors: FileProcessingErrorsDict
 
 
+class ImportChunkSummary(TypedDict):
+    """Class that represents result of processing one line range of the file."""
+    start_line: int
+    stop_line: int
+    resumed_from: int
+    processed: int
+    inserted: int
+    errors: int
+    duration: float
+    error: Optional[str]
+
+
+class CheckChunkSummary(TypedDict):
+    """Class that represents result of checking one chunk of resources."""
+    first_id: int
+    last_id: int
+    checked: int
+    available: int
+    unavailable: int
+    status_changed: int
+    connections_created: int
+    connections_reused: int
+    dns_cache_hits: int
+    dns_cache_misses: int
+    duration: float
+    error: Optional[str]
+
+
+class SweepSummary(TypedDict):
+    """Class that represents result of checking all resources."""
+    chunks: int
+    failed_chunks: int
+    checked: int
+    available: int
+    unavailable: int
+    status_changed: int
+    connection_reuse_rate: float
+    dns_cache_hit_rate: float
+    duration: float
+
+
+class DeletionSummary(TypedDict):
+    """Class that represents result of deleting unavailable resources."""
+    batches: int
+    resources: int
+    statuses: int
+    news_feed_items: int
+    rows_per_second: float
+    duration: float
+
+
 @shared_task
 def get_response_from_resources():
-    """Get all urls from DB, make requests and write response status codes to DB."""
+    """
+    Split all resources from DB into id ranges and check them in parallel chunk tasks.
+    Summaries of all chunks are collected by the chord callback.
+    Full sweep is run on demand, periodic checks are made by `schedule_due_checks`.
+    """
+    started_at = time.time()
 
-    # for future: distribute all urls between multiple celery workers.
+    id_ranges = db.get_web_resource_id_ranges(
+        chunk_size=app.config["CHECKER"]["CHUNK_SIZE"]
+    )
 
-    resources_from_db = db.get_web_resources_query().all()
+    if not id_ranges:
+        logger.info("Availability sweep skipped: there are no resources in DB.")
+        return
 
-    for resource in resources_from_db:
+    sweep = chord([
+        check_resources_chunk.s(first_id=first_id, last_id=last_id)
+        for first_id, last_id in id_ranges
+    ])
+    sweep(summarize_sweep.s(started_at=started_at))
 
-        last_availability = resource.status_codes[-1].is_available if resource.status_codes else None
+    logger.info(f"Availability sweep started with {len(id_ranges)} chunks.")
 
-        try:
-            response = requests.get(resource.full_url)
-            status_code = response.status_code
-            is_available = True if status_code in range(200, 400) else False
-
-        except requests.RequestException:
-            is_available = False
-            status_code = 404
-
-        finally:
-            db.update_counter_for_resource_availability(
-                resource=resource,
-                is_available=is_available
-            )
-            db.save_status_code_for_web_resource_response(
-                resource=resource,
-                status_code=response.status_code,
-                is_available=is_available,
-            )
 
-            # add newsfeed item if status has changed from the last time
-            if last_availability != is_available:
-                db.create_newsfeed_item(
-                    resource=resource,
-                    event=EventType.STATUS_CHANGED,
-                )
+@shared_task
+def schedule_due_checks():
+    """
+    Claim resources which next check time has come and check them in parallel chunk tasks.
+    Check interval of every resource adapts to its stability, see `db.save_check_results`.
+    """
+    started_at = time.time()
+    scheduling_conf = app.config["CHECKER"]["SCHEDULING"]
+
+    # ids are grouped by domain, so probes of one host share connections of one worker
+    due_ids = db.claim_due_web_resources(
+        limit=scheduling_conf["MAX_DUE_PER_RUN"],
+        claim_timeout=scheduling_conf["CLAIM_TIMEOUT"],
+    )
+
+    if not due_ids:
+        return
+
+    chunk_size = app.config["CHECKER"]["CHUNK_SIZE"]
+    checks = chord([
+        check_resources_by_ids.s(resource_ids=due_ids[i:i + chunk_size])
+        for i in range(0, len(due_ids), chunk_size)
+    ])
+    checks(summarize_sweep.s(started_at=started_at))
+
+    logger.info(f"Scheduled checks for {len(due_ids)} due resources.")
+
+
+@shared_task(ignore_result=False)
+def check_resources_chunk(first_id: int, last_id: int) -> CheckChunkSummary:
+    """Get urls with ids in the given range from DB, make requests and write response status codes to DB."""
+    targets = db.iter_check_targets(
+        min_id=first_id,
+        max_id=last_id,
+        batch_size=app.config["CHECKER"]["FETCH_BATCH_SIZE"],
+    )
+    return check_targets(targets, first_id=first_id, last_id=last_id)
+
+
+@shared_task(ignore_result=False)
+def check_resources_by_ids(resource_ids: List[int]) -> CheckChunkSummary:
+    """Get urls with the given ids from DB, make requests and write response status codes to DB."""
+    targets = db.iter_check_targets(
+        resource_ids=resource_ids,
+        batch_size=app.config["CHECKER"]["FETCH_BATCH_SIZE"],
+    )
+    return check_targets(targets, first_id=min(resource_ids), last_id=max(resource_ids))
+
+
+def check_targets(targets: Iterable[CheckTarget], first_id: int, last_id: int) -> CheckChunkSummary:
+    """Check all targets, write results to DB in batches and return summary for the chunk."""
+    started_at = time.monotonic()
+
+    summary: CheckChunkSummary = {
+        "first_id": first_id,
+        "last_id": last_id,
+        "checked": 0,
+        "available": 0,
+        "unavailable": 0,
+        "status_changed": 0,
+        "connections_created": 0,
+        "connections_reused": 0,
+        "dns_cache_hits": 0,
+        "dns_cache_misses": 0,
+        "duration": 0,
+        "error": None,
+    }
+
+    checker_conf = app.config["CHECKER"]
+    scheduling_conf = checker_conf["SCHEDULING"]
+    result_sink = CheckResultSink(
+        batch_size=checker_conf["RESULT_BATCH_SIZE"],
+        flush_interval=checker_conf["RESULT_FLUSH_INTERVAL"],
+        min_interval=scheduling_conf["MIN_INTERVAL"],
+        max_interval=scheduling_conf["MAX_INTERVAL"],
+        backoff_factor=scheduling_conf["BACKOFF_FACTOR"],
+    )
+
+    def save_check_result(result: CheckResult):
+        result_sink.add(result)
+
+        summary["checked"] += 1
+        summary["available" if result.is_available else "unavailable"] += 1
+        summary["status_changed"] += int(result.status_changed)
+
+    # spread probes of the same domain over the chunk
+    targets = interleave_by_domain(
+        targets,
+        window=checker_conf["POLITENESS"]["INTERLEAVE_WINDOW"],
+    )
+
+    checker = make_availability_checker()
+
+    try:
+        with result_sink:
+            checker.check(targets, on_result=save_check_result)
+
+    except Exception as e:
+        # chunk failure must not break the whole sweep, it is reported in summary instead
+        logger.exception(f"Failed to check resources with ids from {first_id} to {last_id}.")
+        summary["error"] = repr(e)
+
+    connection_stats = checker.connection_stats
+    summary["connections_created"] = connection_stats.connections_created
+    summary["connections_reused"] = connection_stats.connections_reused
+    summary["dns_cache_hits"] = connection_stats.dns_cache_hits
+    summary["dns_cache_misses"] = connection_stats.dns_cache_misses
+
+    summary["duration"] = time.monotonic() - started_at
+    return summary
 
 
 @shared_task
-def delete_unavailable_resources(unavailable_count: int):
-    unavailable_resources = db.get_web_resources_query(
-        unavailable_count=unavailable_count,
+def summarize_sweep(chunk_summaries: List[CheckChunkSummary], started_at: float) -> SweepSummary:
+    """Chord callback that merges summaries of all chunks of the availability sweep."""
+    connections_created = sum(chunk["connections_created"] for chunk in chunk_summaries)
+    connections_reused = sum(chunk["connections_reused"] for chunk in chunk_summaries)
+    dns_cache_hits = sum(chunk["dns_cache_hits"] for chunk in chunk_summaries)
+    dns_cache_misses = sum(chunk["dns_cache_misses"] for chunk in chunk_summaries)
+
+    sweep_summary: SweepSummary = {
+        "chunks": len(chunk_summaries),
+        "failed_chunks": sum(1 for chunk in chunk_summaries if chunk["error"]),
+        "checked": sum(chunk["checked"] for chunk in chunk_summaries),
+        "available": sum(chunk["available"] for chunk in chunk_summaries),
+        "unavailable": sum(chunk["unavailable"] for chunk in chunk_summaries),
+        "status_changed": sum(chunk["status_changed"] for chunk in chunk_summaries),
+        "connection_reuse_rate": connections_reused / max(connections_created + connections_reused, 1),
+        "dns_cache_hit_rate": dns_cache_hits / max(dns_cache_hits + dns_cache_misses, 1),
+        "duration": time.time() - started_at,
+    }
+
+    logger.info(
+        "Availability sweep finished in {duration:.1f}s: {checked} checked, {unavailable} unavailable, "
+        "{status_changed} changed status, {failed_chunks} of {chunks} chunks failed, "
+        "{connection_reuse_rate:.0%} connections reused, {dns_cache_hit_rate:.0%} DNS cache hits.".format(
+            **sweep_summary
+        )
     )
 
-    for resource in unavailable_resources:
-        db.delete_web_resource(resource=resource)
+    return sweep_summary
+
+
+def make_availability_checker() -> AvailabilityChecker:
+    """Create availability checker with the limits from app config."""
+    checker_conf = app.config["CHECKER"]
+    politeness_conf = checker_conf["POLITENESS"]
+
+    redis_url = "redis://{}:6379".format(os.getenv("BROKER_URL_HOST"))
+
+    rate_limiter = None
+    if politeness_conf["ENABLED"]:
+        rate_limiter = DomainRateLimiter(
+            redis_url=redis_url,
+            requests_per_second=politeness_conf["REQUESTS_PER_SECOND"],
+            burst=politeness_conf["BURST"],
+            max_in_flight=politeness_conf["MAX_IN_FLIGHT"],
+            slot_ttl=politeness_conf["SLOT_TTL"],
+        )
+
+    return AvailabilityChecker(
+        concurrency=checker_conf["CONCURRENCY"],
+        per_host_concurrency=checker_conf["PER_HOST_CONCURRENCY"],
+        connect_timeout=checker_conf["TIMEOUTS"]["CONNECT"],
+        read_timeout=checker_conf["TIMEOUTS"]["READ"],
+        total_timeout=checker_conf["TIMEOUTS"]["TOTAL"],
+        max_body_bytes=checker_conf["MAX_BODY_BYTES"],
+        head_first=checker_conf["HEAD_FIRST"],
+        head_support=HeadSupportCache(
+            redis_url=redis_url,
+            ttl=checker_conf["HEAD_REJECTION_TTL"],
+        ),
+        circuit_breaker=DomainCircuitBreaker(
+            failure_threshold=checker_conf["CIRCUIT_BREAKER"]["FAILURE_THRESHOLD"],
+            cooldown=checker_conf["CIRCUIT_BREAKER"]["COOLDOWN"],
+            redis_url=redis_url,
+        ),
+        rate_limiter=rate_limiter,
+        keepalive_timeout=checker_conf["CONNECTION_POOL"]["KEEPALIVE_TIMEOUT"],
+        dns_cache_ttl=checker_conf["CONNECTION_POOL"]["DNS_CACHE_TTL"],
+        max_pending=checker_conf["MAX_PENDING"],
+    )
 
 
 @shared_task
-def process_zip_archive(zip_file: str, request_id: int):
+def delete_unavailable_resources(unavailable_count: int) -> DeletionSummary:
     """
-    Celery task that processes urls from the file.
-    This task iterates over the lines of the file and writes the result in redis on each step.
-    At the end of processing it saves the final result in DB.
+    Delete resources that were unavailable at least `unavailable_count` times in a row
+    with their statuses and newsfeed items, in batches of bounded size.
+    """
+    started_at = time.monotonic()
+    batch_size = app.config["PERIODIC_TASKS"]["DELETE_UNAVAILABLE_URLS"]["BATCH_SIZE"]
+
+    summary: DeletionSummary = {
+        "batches": 0,
+        "resources": 0,
+        "statuses": 0,
+        "news_feed_items": 0,
+        "rows_per_second": 0,
+        "duration": 0,
+    }
+
+    while True:
+        deleted = db.delete_unavailable_web_resources(
+            unavailable_count=unavailable_count,
+            batch_size=batch_size,
+        )
+        if not deleted["resources"]:
+            break
+
+        summary["batches"] += 1
+        summary["resources"] += deleted["resources"]
+        summary["statuses"] += deleted["statuses"]
+        summary["news_feed_items"] += deleted["news_feed_items"]
+
+        if deleted["resources"] < batch_size:
+            break
+
+    summary["duration"] = time.monotonic() - started_at
+    deleted_rows = summary["resources"] + summary["statuses"] + summary["news_feed_items"]
+    summary["rows_per_second"] = deleted_rows / max(summary["duration"], 1e-6)
+
+    logger.info(
+        "Deleted {resources} unavailable resources with {statuses} statuses and {news_feed_items} "
+        "newsfeed items in {batches} batches, {duration:.1f}s ({rows_per_second:.0f} rows/s).".format(**summary)
+    )
+
+    return summary
+
+
+@shared_task
+def rebuild_url_filter() -> int:
+    """Build bloom filter of urls from all resources, dropping urls of deleted ones. Return number of urls."""
+    url_filter = make_url_filter()
+    if url_filter is None:
+        return 0
+
+    started_at = time.monotonic()
+    batch_size = app.config["URL_FILTER"]["REBUILD_BATCH_SIZE"]
+    added = url_filter.rebuild(db.iter_web_resource_urls(batch_size=batch_size), batch_size=batch_size)
+
+    logger.info(f"Url filter rebuilt from {added} resources in {time.monotonic() - started_at:.1f}s.")
+    return added
+
+
+@shared_task(acks_late=True, reject_on_worker_lost=True)
+def process_uploaded_file(upload_key: str, request_id: int):
+    """
+    Celery task that processes urls from the file saved in upload store under the given key.
+    This task counts lines of the file and splits them into line ranges processed by parallel chunk tasks.
+    Chunk tasks write their progress in redis, see `ProcessingProgress`, and the chord callback
+    saves the final result in DB.
+
+    Task is acknowledged after it is finished, so it is redelivered if worker dies, and it can be
+    retried manually with the same arguments. Retried task reuses the counted total and chunk tasks
+    resume from their checkpoints, see `process_uploaded_file_chunk`.
     """
 
     # get celery task ID
@@ -96,87 +379,288 @@ def process_zip_archive(zip_file: str, request_id: int):
 
     processing_request = db.get_file_processing_request_by_id(request_id=request_id)
 
-    try:
+    if processing_request.status == StatusOption.SUCCEEDED:
+        logger.info(f"Processing of file of request {request_id} is already finished.")
+        return
 
-        # TODO: move to separate function
+    # failed processing is retried from checkpoints, lines that were saved are not processed again
+    if processing_request.status == StatusOption.FAILED:
+        logger.info(f"Processing of file of request {request_id} failed before and is resumed.")
 
-        lines_from_csv = ziploader.get_lines_from_csv(
-            zip_file=os.path.join(app.config["UPLOAD_FOLDER"], zip_file)
-        )
+    processing_progress = make_processing_progress(task_id=task_id, request_id=request_id)
+
+    # until filter is built every url is looked up in the database,
+    # the rebuild is queued once for all files uploaded meanwhile
+    url_filter = make_url_filter()
+    if url_filter is not None and not url_filter.is_built() and url_filter.request_rebuild():
+        rebuild_url_filter.delay()
+
+    # total is known if processing is resumed
+    total_count = processing_request.total_count
+
+    # put initial processing result in redis, total is unknown until lines are counted
+    processing_progress.start(status=StatusOption.INPROCESS.value)
+
+    db.update_processing_request(
+        processing_request=processing_request,
+        status=StatusOption.INPROCESS,
+        task_id=task_id,
+    )
+
+    if total_count is None:
+        try:
+            with make_upload_store().open(upload_key) as file:
+                total_count = ziploader.count_lines(file=file, filename=upload_key)
+
+        except (exceptions.NoCSVFileError, exceptions.InvalidFileFormatError, FileNotFoundError) as e:
+            # this log will be sent to celery, not to app
+            # TODO: change this behaviour
+            logger.info(f"Celery task failed cause uploaded file could not be read: {e}")
+            processing_progress.finish(status=StatusOption.FAILED.value)
+            db.update_processing_request(
+                processing_request=processing_request,
+                status=StatusOption.FAILED,
+                task_id=task_id,
+            )
+            return
+
+        db.update_processing_request(processing_request=processing_request, total_count=total_count)
+
+    # counters of resumed processing start from what is already saved in checkpoints
+    totals = db.get_file_processing_totals(request_id=request_id)
+    processing_progress.start(
+        status=StatusOption.INPROCESS.value,
+        total=total_count,
+        processed=totals["processed"],
+        errors=totals["errors"],
+    )
 
-        # initialize counters
-        total_lines_number = len(lines_from_csv)
-        processed_count = 0
-        errors_count = 0
-        error_urls = []
-
-        validated_urls: List[str] = []
-
-        redis_client: Redis = app.extensions["redis"]
-
-        # put initial processing result with zeros in redis
-        task_response: FileProcessingTaskResponse = {
-            "status": StatusOption.INPROCESS.value,
-            "total": total_lines_number,
-            "processed": processed_count,
-            "errors": {
-                "count": errors_count,
-                "error_urls": error_urls
-            }
-        }
-
-        task_response_json = json.dumps(task_response)
-        redis_client.set(name=task_id, value=task_response_json)
-
-        db.update_processing_request(
-            processing_request=processing_request,
-            status=StatusOption.INPROCESS,
+    lines_per_task = app.config["FILE_PROCESSING"]["LINES_PER_TASK"]
+    line_ranges = [
+        (start_line, min(start_line + lines_per_task, total_count))
+        for start_line in range(0, total_count, lines_per_task)
+    ]
+
+    # empty file still goes through one chunk, so the result is saved by the same callback
+    processing = chord([
+        process_uploaded_file_chunk.s(
+            upload_key=upload_key,
+            request_id=request_id,
             task_id=task_id,
+            start_line=start_line,
+            stop_line=stop_line,
         )
+        for start_line, stop_line in line_ranges or [(0, 0)]
+    ])
+    processing(merge_uploaded_file_chunks.s(
+        upload_key=upload_key,
+        request_id=request_id,
+        task_id=task_id,
+        total_count=total_count,
+    ))
+
+    logger.info(f"Processing of {total_count} lines of file started with {len(line_ranges)} chunks.")
+
+
+@shared_task(ignore_result=False, acks_late=True, reject_on_worker_lost=True)
+def process_uploaded_file_chunk(
+    upload_key: str,
+    request_id: int,
+    task_id: str,
+    start_line: int,
+    stop_line: int,
+) -> ImportChunkSummary:
+    """
+    Validate lines of the file in the given range and save valid urls in DB in batches.
+    Every batch is committed together with the checkpoint of the range, so a redelivered
+    or retried task resumes from the first line that is not saved yet.
+    Progress is added to progress of the whole file, which is stored under id of the parent task.
+    """
+    started_at = time.monotonic()
+
+    checkpoint = db.get_or_create_file_processing_checkpoint(
+        request_id=request_id,
+        start_line=start_line,
+        stop_line=stop_line,
+    )
 
-        for line in lines_from_csv:
+    summary: ImportChunkSummary = {
+        "start_line": start_line,
+        "stop_line": stop_line,
+        "resumed_from": checkpoint.next_line,
+        "processed": 0,
+        "inserted": 0,
+        "errors": 0,
+        "duration": 0,
+        "error": None,
+    }
+
+    processing_progress = make_processing_progress(task_id=task_id, request_id=request_id)
+    url_filter = make_url_filter()
+    seen_urls: Set[str] = set()
 
-            try:
-                # try to validate url and add it to list with valid urls for further bulk create in db
-                validated_url = schemes.ResourceCreateRequestSchema.parse_obj({"url": line})
-                validated_urls.append(validated_url.url)
+    try:
+        with make_upload_store().open(upload_key) as file, processing_progress:
+            chunks = ziploader.iter_line_chunks(
+                file=file,
+                filename=upload_key,
+                chunk_size=app.config["FILE_PROCESSING"]["CHUNK_SIZE"],
+                start_line=checkpoint.next_line,
+                stop_line=stop_line,
+            )
 
-            except ValidationError:
-                # increment counter is URL is invalid
-                errors_count += 1
-                error_urls.append(line)
+            for chunk in chunks:
+                # urls are validated by the same rules as in ResourceAddRequestSchema
+                parsed_urls = urlvalidator.parse_urls(chunk.lines)
+                new_resources = drop_known_urls(parsed_urls.valid, seen_urls=seen_urls, url_filter=url_filter)
+
+                db.save_processed_lines(
+                    checkpoint=checkpoint,
+                    web_resources=new_resources,
+                    errors=[
+                        {
+                            "line_number": chunk.line_offset + invalid_url.index + 1,
+                            "line": invalid_url.line,
+                            "reason": invalid_url.reason,
+                        }
+                        for invalid_url in parsed_urls.invalid
+                    ],
+                    processed_count=len(chunk.lines),
+                )
 
-            finally:
-                processed_count += 1
+                if url_filter is not None:
+                    url_filter.add([web_resource["full_url"] for web_resource in new_resources])
 
-            # update fields in response for redis
-            task_response["processed"] = processed_count
-            task_response["errors"]["count"] = errors_count
-            task_response["errors"]["error_urls"] = error_urls
+                processing_progress.add(
+                    processed=len(chunk.lines),
+                    error_urls=[invalid_url.line for invalid_url in parsed_urls.invalid],
+                )
 
-            # сonvert task response dictionary to JSON
-            task_response_json = json.dumps(task_response)
+    except exceptions.CheckpointMovedError:
+        logger.info(f"Lines from {start_line} to {stop_line} of file {upload_key} are processed by another task.")
+
+    except Exception as e:
+        # chunk failure is reported in summary, so the callback of chord still saves the result
+        logger.exception(f"Failed to process lines from {start_line} to {stop_line} of file {upload_key}.")
+        summary["error"] = repr(e)
+
+    # counters include lines processed before the task was resumed
+    summary["processed"] = checkpoint.processed_count
+    summary["inserted"] = checkpoint.inserted_count
+    summary["errors"] = checkpoint.errors_count
+    summary["duration"] = time.monotonic() - started_at
+    return summary
+
+
+@shared_task(acks_late=True, reject_on_worker_lost=True)
+def merge_uploaded_file_chunks(
+    chunk_summaries: List[ImportChunkSummary],
+    upload_key: str,
+    request_id: int,
+    task_id: str,
+    total_count: int,
+):
+    """Chord callback that saves the result of processing of all chunks of the file in DB."""
+    totals = db.get_file_processing_totals(request_id=request_id)
+
+    failed_chunks = sum(1 for chunk in chunk_summaries if chunk["error"])
+    status = StatusOption.SUCCEEDED if totals["is_completed"] and not failed_chunks else StatusOption.FAILED
+
+    processing_progress = make_processing_progress(task_id=task_id, request_id=request_id)
+    processing_progress.finish(status=status.value, total=total_count)
+
+    db.update_processing_request(
+        processing_request=db.get_file_processing_request_by_id(request_id=request_id),
+        total_count=total_count,
+        processed_count=totals["processed"],
+        errors_count=totals["errors"],
+        status=status,
+    )
 
-            # set task response JSON in Redis
-            redis_client.set(name=task_id, value=task_response_json)
+    # file of failed processing is kept, so processing can be retried
+    if status == StatusOption.SUCCEEDED:
+        make_upload_store().delete(upload_key)
 
-        db.bulk_create_web_resources(validated_urls=validated_urls)
+    logger.info(
+        f"Processing of file finished: {totals['processed']} of {total_count} lines processed, "
+        f"{totals['inserted']} resources added, {totals['errors']} invalid urls, "
+        f"{failed_chunks} of {len(chunk_summaries)} chunks failed, "
+        f"{sum(1 for chunk in chunk_summaries if chunk['resumed_from'] > chunk['start_line'])} chunks resumed."
+    )
 
-        db.update_processing_request(
-            processing_request=processing_request,
-            total_count=total_lines_number,
-            processed_count=processed_count,
-            errors_count=errors_count,
-            error_urls=error_urls,
-            status=StatusOption.SUCCEEDED,
-        )
 
-    except exceptions.NoCSVFileError:
-        # this log will be sent to celery, not to app
-        # TODO: change this behaviour
-        logger.info("Celery task failed cause ZIP archive did not contain any CSV file.")
-        db.update_processing_request(
-            processing_request=processing_request,
-            status=StatusOption.FAILED,
-            task_id=task_id,
+def drop_known_urls(
+    web_resources: List[UrlPartsDict],
+    seen_urls: Set[str],
+    url_filter: Optional[UrlBloomFilter],
+) -> List[UrlPartsDict]:
+    """
+    Drop urls already seen by the task and urls already saved in the database.
+    Only urls found in the bloom filter are looked up in the database, the rest are definitely new.
+    Without filter every url is sent to the database, where duplicates are skipped on insert.
+    """
+    new_resources = []
+    for web_resource in web_resources:
+        if web_resource["full_url"] in seen_urls:
+            continue
+        if len(seen_urls) >= app.config["FILE_PROCESSING"]["SEEN_URLS_SIZE"]:
+            seen_urls.clear()
+        seen_urls.add(web_resource["full_url"])
+        new_resources.append(web_resource)
+
+    if url_filter is None or not new_resources:
+        return new_resources
+
+    found = url_filter.might_contain([web_resource["full_url"] for web_resource in new_resources])
+    maybe_existing = [web_resource["full_url"] for web_resource, is_found in zip(new_resources, found) if is_found]
+
+    existing = db.get_existing_full_urls(maybe_existing)
+    url_filter.record_false_positives(len(maybe_existing) - len(existing))
+
+    return [web_resource for web_resource in new_resources if web_resource["full_url"] not in existing]
+
+
+def make_upload_store() -> UploadStore:
+    """Create storage of uploaded files with the backend from app config."""
+    store_conf = app.config["UPLOAD_STORE"]
+    if store_conf["BACKEND"] == "redis":
+        return RedisUploadStore(
+            storage_client=app.extensions["redis"],
+            chunk_size=store_conf["CHUNK_SIZE"],
+            ttl=store_conf["REDIS_TTL"],
         )
+
+    return LocalUploadStore(folder=app.config["UPLOAD_FOLDER"], chunk_size=store_conf["CHUNK_SIZE"])
+
+
+def make_url_filter() -> Optional[UrlBloomFilter]:
+    """Create bloom filter of urls of resources with the size from app config. Return None if it is disabled."""
+    filter_conf = app.config["URL_FILTER"]
+    if not filter_conf["ENABLED"]:
+        return None
+
+    return UrlBloomFilter(
+        storage_client=app.extensions["redis"],
+        capacity=filter_conf["CAPACITY"],
+        error_rate=filter_conf["ERROR_RATE"],
+    )
+
+
+def make_processing_progress(task_id: str, request_id: int) -> ProcessingProgress:
+    """
+    Create progress of file processing with the flush cadence from app config.
+    Every flush is pushed to the socketio room of the request, through the message queue to web nodes.
+    """
+    progress_conf = app.config["FILE_PROCESSING"]["PROGRESS"]
+
+    def push_update(update: dict):
+        celery_socketio.emit("progress", update, namespace=PROGRESS_NAMESPACE, to=progress_room(request_id))
+
+    return ProcessingProgress(
+        storage_client=app.extensions["redis"],
+        task_id=task_id,
+        flush_every_lines=progress_conf["FLUSH_EVERY_LINES"],
+        flush_interval=progress_conf["FLUSH_INTERVAL"],
+        errors_sample_size=progress_conf["ERRORS_SAMPLE_SIZE"],
+        on_update=push_update,
+    )
@@ -1,3 +1,8 @@
+import hashlib
+
+from flask import Response, request
+
+
 def make_int(value) -> int | None:
     if value is not None:
         try:
@@ -17,3 +22,12 @@ def convert_to_serializable(value):
         return [convert_to_serializable(item) for item in value]
     else:
         return value
+
+
+def conditional_response(response: Response) -> Response:
+    """
+    Set strong ETag computed from hash of the response body. Response is replaced by 304 Not Modified
+    without body if the client sent the same ETag in If-None-Match.
+    """
+    response.set_etag(hashlib.blake2b(response.get_data(), digest_size=16).hexdigest())
+    return response.make_conditional(request)
@@ -1,23 +1,34 @@
+from typing import TypedDict
 from urllib.parse import parse_qsl, urlparse
 
 from src.schemes.web_resources import ResourceNoUUIDSchema
 
 
-def parse_url(url: str) -> ResourceNoUUIDSchema:
-    """Exctracts protocol, domain, domain zone, path and query params from a given url."""
+class UrlPartsDict(TypedDict):
+    full_url: str
+    protocol: str
+    domain: str
+    domain_zone: str
+    url_path: str
+    query_params: dict
+
+
+def split_url(url: str) -> UrlPartsDict:
+    """Split already validated url into fields of WebResource without building a schema."""
     parsed_url = urlparse(url)
 
     domain = parsed_url.netloc
-    domain_zone = domain.split(".")[-1]
-    path = parsed_url.path
-    protocol = parsed_url.scheme
-    query_params = parse_qsl(parsed_url.query)
-
-    return ResourceNoUUIDSchema(
-        full_url=url,
-        protocol=protocol,
-        domain=domain,
-        domain_zone=domain_zone,
-        url_path=path,
-        query_params=query_params,
-    )
+
+    return {
+        "full_url": url,
+        "protocol": parsed_url.scheme,
+        "domain": domain,
+        "domain_zone": domain.split(".")[-1],
+        "url_path": parsed_url.path,
+        "query_params": dict(parse_qsl(parsed_url.query)),
+    }
+
+
+def parse_url(url: str) -> ResourceNoUUIDSchema:
+    """Exctracts protocol, domain, domain zone, path and query params from a given url."""
+    return ResourceNoUUIDSchema(**split_url(url))
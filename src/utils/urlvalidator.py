@@ -0,0 +1,185 @@
+from typing import Dict, List, Match, NamedTuple, Optional, Tuple
+from urllib.parse import parse_qsl
+
+from pydantic import AnyHttpUrl
+from pydantic.networks import ascii_domain_regex, int_domain_regex, url_regex
+
+from src.utils.urlparser import UrlPartsDict, split_url
+
+# compiled regexes of pydantic, so accepted urls are exactly the same as for AnyHttpUrl
+_url_regex = url_regex()
+_ascii_domain_regex = ascii_domain_regex()
+_int_domain_regex = int_domain_regex()
+
+# domain validation is the slowest step and domains repeat a lot in uploaded files
+_INVALID_DOMAIN = ""
+_domain_cache: Dict[str, Optional[str]] = {}
+DOMAIN_CACHE_SIZE = 100000
+
+
+# types of errors as pydantic names them
+MIN_LENGTH_ERROR = "value_error.any_str.min_length"
+MAX_LENGTH_ERROR = "value_error.any_str.max_length"
+SCHEME_ERROR = "value_error.url.scheme"
+PORT_ERROR = "value_error.url.port"
+EXTRA_ERROR = "value_error.url.extra"
+HOST_ERROR = "value_error.url.host"
+# url accepted by pydantic but rejected by urlparse, so it can not be split into fields
+UNPARSABLE_ERROR = "value_error.url.unparsable"
+
+
+class InvalidUrl(NamedTuple):
+    """Invalid line with its index in the parsed list and type of the error."""
+    index: int
+    line: str
+    reason: str
+
+
+class ParsedUrls(NamedTuple):
+    """Result of parsing of multiple lines with urls."""
+    valid: List[UrlPartsDict]
+    invalid: List[InvalidUrl]
+
+
+class _UrlMatch(NamedTuple):
+    url: Optional[str]
+    match: Optional[Match[str]]  # None if url had to be rebuilt
+    reason: Optional[str]  # None if url is valid
+
+
+def _validate_domain(domain: str) -> Optional[str]:
+    """
+    Validate domain like `AnyHttpUrl` does. Return None for ascii domain that is kept as is,
+    punycode of international domain, for which url has to be rebuilt, or `_INVALID_DOMAIN`.
+    """
+    domain_match = _ascii_domain_regex.fullmatch(domain)
+    if domain_match is not None and domain_match.group("tld") is not None:
+        return None
+
+    # pydantic treats ascii domains without top level domain as international too
+    domain_match = _int_domain_regex.fullmatch(domain)
+    if domain_match is None:
+        return _INVALID_DOMAIN
+
+    tld = domain_match.group("tld")
+    try:
+        if tld is not None:
+            tld[1:].encode("idna")
+        return domain.encode("idna").decode("ascii")
+    except UnicodeError:
+        return _INVALID_DOMAIN
+
+
+def _match_http_url(value: str) -> _UrlMatch:
+    """
+    Validate url like `AnyHttpUrl` does, in the same order of checks, so the first failed check
+    gives the same type of error. Return normalized url with its regex match or type of error.
+    """
+    url = value.strip()
+    if len(url) < AnyHttpUrl.min_length:
+        return _UrlMatch(None, None, MIN_LENGTH_ERROR)
+    if len(url) > AnyHttpUrl.max_length:
+        return _UrlMatch(None, None, MAX_LENGTH_ERROR)
+
+    match = _url_regex.match(url)
+    scheme, domain, port = match.group("scheme", "domain", "port")
+
+    if scheme is None or scheme.lower() not in AnyHttpUrl.allowed_schemes:
+        return _UrlMatch(None, None, SCHEME_ERROR)
+    if port is not None and int(port) > 65_535:
+        return _UrlMatch(None, None, PORT_ERROR)
+    if match.end() != len(url):
+        return _UrlMatch(None, None, EXTRA_ERROR)
+
+    if domain:
+        try:
+            host = _domain_cache[domain]
+        except KeyError:
+            if len(_domain_cache) >= DOMAIN_CACHE_SIZE:
+                _domain_cache.clear()
+            host = _domain_cache[domain] = _validate_domain(domain)
+
+        if host == _INVALID_DOMAIN:
+            return _UrlMatch(None, None, HOST_ERROR)
+
+        if host is not None:
+            # url with international domain is rebuilt with punycode of the domain
+            return _UrlMatch(AnyHttpUrl.build(host=host, **match.groupdict()), None, None)
+
+    elif not match.group("ipv4") and not match.group("ipv6"):
+        return _UrlMatch(None, None, HOST_ERROR)
+
+    return _UrlMatch(url, match, None)
+
+
+def _parse_url(value: str) -> Tuple[Optional[UrlPartsDict], Optional[str]]:
+    """
+    Validate url like `AnyHttpUrl` does and split it like `split_url` does.
+    Return fields of url or type of error if url is invalid.
+    """
+    url, match, reason = _match_http_url(value)
+    if reason is not None:
+        return None, reason
+
+    if match is not None:
+        scheme, user, domain, port, path, query = match.group("scheme", "user", "domain", "port", "path", "query")
+
+    # rebuilt urls are rare enough for the slow path. So are urls with user info, which urlparse splits
+    # differently if it contains "?" or "#", with ipv6 address, which urlparse validates, with control
+    # characters, which urlparse strips, and with parameters in the last segment of path, which urlparse splits
+    if (
+        match is None
+        or user is not None
+        or match.group("ipv6") is not None
+        or not url.isprintable()
+        or (path and ";" in path[path.rfind("/"):])
+    ):
+        try:
+            return split_url(url), None
+        except ValueError:
+            # urlparse rejects some urls accepted by pydantic, e.g. with unbalanced "[" in user info
+            return None, UNPARSABLE_ERROR
+
+    if port is not None:
+        netloc_end = match.end("port")
+    else:
+        netloc_end = max(match.end("domain"), match.end("ipv4"))
+
+    netloc = url[len(scheme) + 3:netloc_end]
+
+    parts: UrlPartsDict = {
+        "full_url": url,
+        "protocol": scheme.lower(),
+        "domain": netloc,
+        "domain_zone": netloc.split(".")[-1],
+        "url_path": path or "",
+        "query_params": dict(parse_qsl(query)) if query else {},
+    }
+    return parts, None
+
+
+def validate_http_url(value: str) -> Optional[str]:
+    """
+    Validate url the same way as pydantic `AnyHttpUrl` does, but without exceptions and models.
+    Return url normalized by the same rules, i.e. stripped and with international domain encoded
+    to punycode, or None if url is invalid.
+    """
+    return _match_http_url(value).url
+
+
+def parse_urls(lines: List[str]) -> ParsedUrls:
+    """
+    Validate lines as http urls and split valid ones into fields of WebResource in one call.
+    Result is the same as validation by `ResourceAddRequestSchema` followed by `split_url`.
+    """
+    valid: List[UrlPartsDict] = []
+    invalid: List[InvalidUrl] = []
+
+    for index, line in enumerate(lines):
+        parts, reason = _parse_url(line)
+        if parts is None:
+            invalid.append(InvalidUrl(index=index, line=line, reason=reason))
+        else:
+            valid.append(parts)
+
+    return ParsedUrls(valid=valid, invalid=invalid)
@@ -1,38 +1,144 @@
 import csv
+import gzip
 import io
+import itertools
+import json
 import uuid
 import zipfile
-from typing import List
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import BinaryIO, Iterator, List, Optional
 
 from src import app
 from src.service import exceptions
 
+# formats of uploaded files, lines of files in zip archive are read by the extensions of their names
+ZIP = "zip"
+CSV = "csv"
+CSV_GZ = "csv.gz"
+NDJSON = "ndjson"
+NDJSON_GZ = "ndjson.gz"
+
+FILE_FORMATS = (ZIP, CSV_GZ, NDJSON_GZ, CSV, NDJSON)
+ARCHIVED_FORMATS = (CSV, NDJSON)
+
+
+def get_file_format(filename: str, formats=FILE_FORMATS) -> Optional[str]:
+    """Find format of file by extension of its name, double extensions like `.csv.gz` included."""
+    filename = filename.lower()
+    for file_format in formats:
+        if filename.endswith(f".{file_format}"):
+            return file_format
+    return None
+
 
 def allowed_file(filename: str):
-    return '.' in filename and filename.rsplit('.', 1)[1].lower() in app.config["ALLOWED_EXTENSIONS"]
+    file_format = get_file_format(filename)
+    return file_format is not None and file_format in app.config["ALLOWED_EXTENSIONS"]
 
 
 def make_uuid_filename(filename: str) -> str:
     """Extracts file extension from the given filename and make random uuid4 name."""
-    return "{}.{}".format(str(uuid.uuid4()), filename.split('.')[-1])
+    return "{}.{}".format(str(uuid.uuid4()), get_file_format(filename) or filename.split('.')[-1])
+
+
+@dataclass
+class LineChunk:
+    """Lines read from uploaded file with their position in it."""
+    lines: List[str]
+    line_offset: int  # number of lines read before the chunk
+
+
+def _read_lines(data: BinaryIO, file_format: str) -> Iterator[str]:
+    """Read urls from decompressed csv or ndjson data. Empty rows are not counted as lines."""
+    text = io.TextIOWrapper(data, "utf-8")
+    try:
+        if file_format == CSV:
+            yield from (row[0] for row in csv.reader(text) if row)
+        else:
+            yield from (_parse_ndjson_line(line) for line in text if line.strip())
+    finally:
+        # data is closed by its owner. Reading may be abandoned and finished only after the owner has closed data
+        if not data.closed:
+            text.detach()
+
+
+def _parse_ndjson_line(line: str) -> str:
+    """Take url from `url` field of object or from string. Line of other kind is returned as is to be reported."""
+    line = line.strip()
+    try:
+        value = json.loads(line)
+    except ValueError:
+        return line
+
+    if isinstance(value, dict):
+        value = value.get("url")
+    return value if isinstance(value, str) else line
+
+
+def _read_archive(zip_ref: zipfile.ZipFile) -> Iterator[str]:
+    """Read lines of all csv and ndjson files in zip archive one after another, ordered by their names."""
+    members = sorted(
+        (info for info in zip_ref.infolist() if get_file_format(info.filename, ARCHIVED_FORMATS)),
+        key=lambda info: info.filename,
+    )
+    if not members:
+        raise exceptions.NoCSVFileError('No CSV or NDJSON file found in the zip archive.')
+
+    def iter_lines() -> Iterator[str]:
+        for member in members:
+            with zip_ref.open(member) as data:
+                yield from _read_lines(data, get_file_format(member.filename, ARCHIVED_FORMATS))
+
+    return iter_lines()
+
+
+@contextmanager
+def open_lines(file: BinaryIO, filename: str) -> Iterator[Iterator[str]]:
+    """Open seekable uploaded file of format given by its name and yield its lines."""
+    file_format = get_file_format(filename)
+    file.seek(0)
 
+    if file_format == ZIP:
+        with zipfile.ZipFile(file=file, mode="r") as zip_ref:
+            yield _read_archive(zip_ref)
+    elif file_format in (CSV_GZ, NDJSON_GZ):
+        with gzip.GzipFile(fileobj=file, mode="rb") as data:
+            yield _read_lines(data, file_format[:-len(".gz")])
+    elif file_format in (CSV, NDJSON):
+        yield _read_lines(file, file_format)
+    else:
+        raise exceptions.InvalidFileFormatError(f"Format of file {filename} is not supported.")
 
-def get_lines_from_csv(zip_file: str) -> List[str]:
-    """Get list of lines from csv file."""
 
-    with zipfile.ZipFile(file=zip_file, mode='r') as zip_ref:
-        # search CSV files in archive
-        csv_files = [file for file in zip_ref.namelist() if file.endswith('.csv')]
-        if len(csv_files) == 0:
-            raise exceptions.NoCSVFileError('No CSV file found in the zip archive.')
+def count_lines(file: BinaryIO, filename: str) -> int:
+    """Count lines of uploaded file without keeping them in memory."""
+    with open_lines(file, filename) as file_lines:
+        return sum(1 for _ in file_lines)
 
-        csv_file = csv_files[0]
 
-        lines = []
+def iter_line_chunks(
+    file: BinaryIO,
+    filename: str,
+    chunk_size: int = 1000,
+    start_line: int = 0,
+    stop_line: Optional[int] = None,
+) -> Iterator[LineChunk]:
+    """
+    Stream lines of uploaded file in chunks of `chunk_size` lines. Lines of all files in zip archive
+    are numbered as one file.
+    Only the current chunk is kept in memory, so memory usage does not depend on size of the file.
+    If line range is given, only lines from `start_line` up to `stop_line` exclusive are yielded,
+    previous lines are still decompressed but skipped without being kept.
+    """
+    with open_lines(file, filename) as file_lines:
+        lines_iter = itertools.islice(file_lines, start_line, stop_line)
+        line_offset = start_line
 
-        with zip_ref.open(csv_file) as csv_data:
-            csv_reader = csv.reader(io.TextIOWrapper(csv_data, 'utf-8'))
-            for row in csv_reader:
-                lines.append(row[0])
+        while True:
+            lines = list(itertools.islice(lines_iter, chunk_size))
+            if not lines:
+                return
 
-    return lines
+            yield LineChunk(lines=lines, line_offset=line_offset)
+            line_offset += len(lines)
@@ -62,12 +62,17 @@ def create_app(conf_file: str = "config.yaml"):
             result_backend="redis://{}:6379".format(os.getenv("RESULT_BACKEND_HOST")),
             task_ignore_result=True,
             broker_connection_retry_on_startup=True,
+            # tasks with acks_late are not reserved by a worker before it can start them
+            worker_prefetch_multiplier=1,
         ),
     )
 
     redis_client = Redis(host=os.getenv("BROKER_URL_HOST"), port=6379)
     app.extensions["redis"] = redis_client
 
+    # events emitted by celery workers with `celery_socketio` reach clients of web nodes through this queue
+    app.config["SOCKETIO_MESSAGE_QUEUE"] = "redis://{}:6379".format(os.getenv("BROKER_URL_HOST"))
+
     celery_init_app(app)
     return app
 
@@ -1,8 +1,9 @@
-from flask import redirect, render_template, request, url_for
+from flask import make_response, redirect, render_template, request, url_for
+from pydantic import ValidationError
 
 from src import app, forms
-from src.service import db, exceptions, handlers
-from src.tasks import process_zip_archive
+from src.service import exceptions, handlers
+from src.utils.helpers import conditional_response
 
 
 @app.route("/resources/", methods=["GET"])
@@ -13,6 +14,7 @@ def index():
     availability = request.args.get('availability', None)
     page = request.args.get('page', default=1, type=int)
     per_page = request.args.get('per_page', default=10, type=int)
+    cursor = request.args.get('cursor', type=int)
 
     response = handlers.handle_get_resources_with_filters(
         domain_zone=domain_zone,
@@ -21,9 +23,12 @@ def index():
         page=page,
         per_page=per_page,
         uuid=uuid,
+        cursor=cursor,
+        use_cursor='cursor' in request.args,
+        endpoint='index',
     )
 
-    return render_template('index.html', data=response.dict())
+    return conditional_response(make_response(render_template('index.html', data=response.dict())))
 
 
 @app.route("/logs/", methods=["GET"])
@@ -42,7 +47,7 @@ def add_resource():
         if form_text.submit_text.data and form_text.validate():
             url = form_text.url.data
             try:
-                web_resource = db.create_web_resource(validated_url=url)
+                web_resource = handlers.handle_post_url_form(url)
                 app.logger.info(f"201 - User posted new URL: {url}")
                 return redirect(url_for('get_resource_page', resource_uuid=web_resource.uuid))
             except exceptions.AlreadyExistsError:
@@ -50,16 +55,13 @@ def add_resource():
 
         # process second form with file
         if form_file.submit_file.data and form_file.validate():
-            file = form_file.file.data
-            # create ZipFileProcessingRequest model instance
-            processing_request_id = db.create_file_processing_request()
-            # create celery task and pass id of created request to it as argument
-            process_zip_archive.delay(
-                zip_file=file.read(),
-                request_id=processing_request_id,
-            )
-            app.logger.info("File processing request created.")
-            return redirect(url_for('get_processing_request_page', request_id=processing_request_id))
+            # file is streamed to the upload store and processed by the same task as files posted to API
+            try:
+                processing_request = handlers.handle_post_url_file({"file": form_file.file.data})
+                app.logger.info("File processing request created.")
+                return redirect(url_for('get_processing_request_page', request_id=processing_request.id))
+            except (ValidationError, exceptions.InvalidFileFormatError):
+                form_file.file.errors.append("Файл должен быть в формате ZIP, CSV, CSV.GZ, NDJSON или NDJSON.GZ")
 
     return render_template('add_resource.html', form_text=form_text, form_file=form_file)
 
@@ -78,11 +80,13 @@ def test_logs():
 def get_resource_page(resource_uuid):
     try:
         resource_data = handlers.handle_get_resource_data(resource_uuid)
-    except exceptions.NotFoundError:
+    except exceptions.ResourceNotFoundError:
         return render_template('404.html'), 404
 
     app.logger.info(f"GET - resource page {request.url} visited")
-    return render_template("resource_page.html", resource_data=resource_data)
+    return conditional_response(
+        make_response(render_template("resource_page.html", resource_data=resource_data))
+    )
 
 
 @app.route("/processing-requests/<int:request_id>", methods=["GET"])
@@ -92,8 +96,8 @@ def get_processing_request_page(request_id):
             request_id=request_id,
             storage_client=app.extensions["redis"]
         )
-        return render_template("request_page.html", resource_data=status_info)
-    except exceptions.NotFoundError:
+        return render_template("request_page.html", resource_data=status_info, request_id=request_id)
+    except exceptions.ResourceNotFoundError:
         return render_template('404.html'), 404
 
 
@@ -0,0 +1,44 @@
+import asyncio
+
+from src.checker.circuit_breaker import DomainCircuitBreaker
+from src.db.models import ProbeOutcome
+
+
+def test_breaker_opens_after_consecutive_failures():
+    async def scenario():
+        breaker = DomainCircuitBreaker(failure_threshold=3, cooldown=60)
+        async with breaker:
+            for _ in range(2):
+                assert await breaker.allow("down.com")
+                await breaker.record("down.com", ProbeOutcome.TIMEOUT)
+
+            # http response resets counter of consecutive failures
+            assert await breaker.allow("down.com")
+            await breaker.record("down.com", ProbeOutcome.RESPONDED)
+
+            for _ in range(3):
+                assert await breaker.allow("down.com")
+                await breaker.record("down.com", ProbeOutcome.CONNECTION_ERROR)
+
+            assert not await breaker.allow("down.com")
+            assert await breaker.allow("up.com")
+
+    asyncio.run(scenario())
+
+
+def test_half_open_breaker_lets_one_probe_through():
+    async def scenario():
+        breaker = DomainCircuitBreaker(failure_threshold=1, cooldown=0)
+        async with breaker:
+            assert await breaker.allow("flaky.com")
+            await breaker.record("flaky.com", ProbeOutcome.TIMEOUT)
+
+            # cooldown is over, so breaker is half-open and allows only one probe
+            assert await breaker.allow("flaky.com")
+            assert not await breaker.allow("flaky.com")
+
+            await breaker.record("flaky.com", ProbeOutcome.RESPONDED)
+            assert await breaker.allow("flaky.com")
+            assert await breaker.allow("flaky.com")
+
+    asyncio.run(scenario())
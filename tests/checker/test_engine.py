@@ -0,0 +1,185 @@
+import asyncio
+from contextlib import asynccontextmanager
+
+from aiohttp import web
+
+from src.checker.engine import AvailabilityChecker, CheckTarget
+from src.db.models import ProbeOutcome
+
+
+async def run_with_stub_server(handler, make_targets, checker: AvailabilityChecker):
+    """Start stub server on a random port, run checker against it and return results."""
+    stub_app = web.Application()
+    stub_app.router.add_route("*", "/{tail:.*}", handler)
+    runner = web.AppRunner(stub_app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    base_url = "http://127.0.0.1:{}".format(runner.addresses[0][1])
+
+    results = []
+    try:
+        await checker.run(make_targets(base_url), on_result=results.append)
+    finally:
+        await runner.cleanup()
+    return results
+
+
+async def status_from_path(request: web.Request) -> web.Response:
+    return web.Response(status=int(request.match_info["tail"]))
+
+
+def test_check_statuses():
+    def make_targets(base_url):
+        return [
+            CheckTarget(resource_id=1, url=f"{base_url}/200", was_available=True),
+            CheckTarget(resource_id=2, url=f"{base_url}/500", was_available=True),
+            CheckTarget(resource_id=3, url="http://127.0.0.1:1/unreachable", was_available=None),
+        ]
+
+    results = asyncio.run(
+        run_with_stub_server(status_from_path, make_targets, AvailabilityChecker(total_timeout=5))
+    )
+    results = {result.resource_id: result for result in results}
+
+    assert results[1].status_code == 200
+    assert results[1].is_available
+    assert not results[1].status_changed
+
+    assert results[2].status_code == 500
+    assert not results[2].is_available
+    assert results[2].status_changed
+
+    assert results[3].status_code is None
+    assert results[3].outcome == ProbeOutcome.CONNECTION_ERROR
+    assert not results[3].is_available
+    assert results[3].status_changed
+
+
+def test_concurrency_limit():
+    in_flight = 0
+    max_in_flight = 0
+
+    async def slow_handler(request: web.Request) -> web.Response:
+        nonlocal in_flight, max_in_flight
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.05)
+        in_flight -= 1
+        return web.Response(status=200)
+
+    def make_targets(base_url):
+        return (CheckTarget(resource_id=i, url=f"{base_url}/{i}") for i in range(30))
+
+    checker = AvailabilityChecker(concurrency=20, per_host_concurrency=5, total_timeout=5)
+    results = asyncio.run(run_with_stub_server(slow_handler, make_targets, checker))
+
+    assert len(results) == 30
+    assert all(result.is_available for result in results)
+    assert max_in_flight <= 5
+
+    # connections to the same host are kept alive between probes
+    assert checker.connection_stats.connections_created <= 5
+    assert checker.connection_stats.connections_reused >= 25
+
+
+class SlowDomainLimiter:
+    """Rate limiter that lets requests to slow.test through one by one after a wait."""
+    max_in_flight = 1
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        pass
+
+    @asynccontextmanager
+    async def limit(self, domain: str):
+        if domain == "slow.test":
+            await asyncio.sleep(0.1)
+        yield
+
+
+def test_throttled_domain_does_not_hold_global_slots():
+    def make_targets(base_url):
+        # targets come sorted by domain
+        return [
+            CheckTarget(resource_id=i, url=f"{base_url}/200", domain="slow.test" if i < 5 else "fast.test")
+            for i in range(10)
+        ]
+
+    checker = AvailabilityChecker(concurrency=1, total_timeout=5, rate_limiter=SlowDomainLimiter())
+    results = asyncio.run(run_with_stub_server(status_from_path, make_targets, checker))
+
+    # probes of fast.test are made while probes of slow.test wait for their domain
+    assert {result.resource_id for result in results[:5]} == {5, 6, 7, 8, 9}
+    assert all(result.is_available for result in results)
+
+
+def test_timeout_outcome():
+    async def hanging_handler(request: web.Request) -> web.Response:
+        await asyncio.sleep(5)
+        return web.Response(status=200)
+
+    def make_targets(base_url):
+        return [CheckTarget(resource_id=1, url=f"{base_url}/hang")]
+
+    checker = AvailabilityChecker(read_timeout=0.2, total_timeout=1)
+    results = asyncio.run(run_with_stub_server(hanging_handler, make_targets, checker))
+
+    assert results[0].status_code is None
+    assert results[0].outcome == ProbeOutcome.TIMEOUT
+    assert not results[0].is_available
+
+
+def test_large_body_is_not_downloaded():
+    async def large_file_handler(request: web.Request) -> web.StreamResponse:
+        response = web.StreamResponse(status=200)
+        await response.prepare(request)
+        # body that would take far longer than the deadline to send
+        for _ in range(1000):
+            await response.write(b"x" * 65536)
+            await asyncio.sleep(0.01)
+        return response
+
+    def make_targets(base_url):
+        return [CheckTarget(resource_id=1, url=f"{base_url}/large.iso")]
+
+    checker = AvailabilityChecker(max_body_bytes=1024, total_timeout=3)
+    results = asyncio.run(run_with_stub_server(large_file_handler, make_targets, checker))
+
+    assert results[0].status_code == 200
+    assert results[0].outcome == ProbeOutcome.RESPONDED
+    assert results[0].is_available
+
+
+def test_get_fallback_for_domain_rejecting_head():
+    requests_log = []
+
+    async def head_rejecting_handler(request: web.Request) -> web.Response:
+        requests_log.append((request.method, request.headers.get("If-None-Match")))
+        if request.method == "HEAD":
+            return web.Response(status=405)
+        if request.headers.get("If-None-Match") == '"v1"':
+            return web.Response(status=304)
+        return web.Response(status=200, headers={"ETag": '"v2"'})
+
+    def make_targets(base_url):
+        return [
+            CheckTarget(resource_id=1, url=f"{base_url}/1", domain="example.com", etag='"v1"'),
+            CheckTarget(resource_id=2, url=f"{base_url}/2", domain="example.com"),
+        ]
+
+    checker = AvailabilityChecker(concurrency=1, total_timeout=5)
+    results = asyncio.run(run_with_stub_server(head_rejecting_handler, make_targets, checker))
+    results = {result.resource_id: result for result in results}
+
+    # HEAD is tried once, then the domain is known to reject it
+    assert requests_log == [("HEAD", None), ("GET", '"v1"'), ("GET", None)]
+
+    assert results[1].status_code == 304
+    assert results[1].is_available
+    assert results[1].etag == '"v1"'
+
+    assert results[2].status_code == 200
+    assert results[2].etag == '"v2"'
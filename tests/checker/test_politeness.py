@@ -0,0 +1,72 @@
+import asyncio
+
+import pytest
+
+from src.checker import politeness
+from src.checker.engine import CheckTarget
+from src.checker.politeness import DomainRateLimiter, interleave_by_domain
+
+
+def make_target(resource_id: int, domain: str) -> CheckTarget:
+    return CheckTarget(resource_id=resource_id, url=f"http://{domain}/{resource_id}", domain=domain)
+
+
+def test_interleave_by_domain():
+    targets = [
+        make_target(1, "a.com"),
+        make_target(2, "a.com"),
+        make_target(3, "a.com"),
+        make_target(4, "b.com"),
+        make_target(5, "c.com"),
+        make_target(6, "b.com"),
+    ]
+
+    interleaved = [target.resource_id for target in interleave_by_domain(targets)]
+
+    assert interleaved == [1, 4, 5, 2, 6, 3]
+
+
+def test_interleave_by_domain_in_windows():
+    targets = (make_target(i, "a.com" if i < 4 else "b.com") for i in range(8))
+
+    interleaved = [target.resource_id for target in interleave_by_domain(targets, window=4)]
+
+    # the first window contains only one domain, so it keeps its order
+    assert interleaved == [0, 1, 2, 3, 4, 5, 6, 7]
+
+
+def test_slot_that_is_never_released_expires(monkeypatch):
+    fakeredis = pytest.importorskip("fakeredis")
+    # scripts of the limiter are run by fakeredis with lua interpreter
+    pytest.importorskip("lupa")
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(politeness.redis, "from_url", lambda url: fakeredis.aioredis.FakeRedis(server=server))
+
+    async def check():
+        async with DomainRateLimiter(
+            redis_url="redis://test", requests_per_second=100, burst=100, max_in_flight=2, slot_ttl=1,
+        ) as limiter:
+            # worker is killed while its probe is in flight
+            leaked = limiter.limit("a.com")
+            await leaked.__aenter__()
+
+            # the other slot of the domain is taken all the time, so the domain is never idle
+            deadline = asyncio.get_running_loop().time() + 1.5
+            while asyncio.get_running_loop().time() < deadline:
+                async with limiter.limit("a.com"):
+                    await asyncio.sleep(0.05)
+
+            async def hold_slot(entered: asyncio.Event, release: asyncio.Event):
+                async with limiter.limit("a.com"):
+                    entered.set()
+                    await release.wait()
+
+            # both slots can be held at once after the leaked one expired
+            entered = [asyncio.Event(), asyncio.Event()]
+            release = asyncio.Event()
+            holders = [asyncio.create_task(hold_slot(event, release)) for event in entered]
+            await asyncio.wait_for(asyncio.gather(*(event.wait() for event in entered)), timeout=0.5)
+            release.set()
+            await asyncio.gather(*holders)
+
+    asyncio.run(check())
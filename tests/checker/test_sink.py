@@ -0,0 +1,28 @@
+import threading
+import time
+
+from src.checker import sink as sink_module
+from src.checker.engine import CheckResult
+from src.checker.sink import CheckResultSink
+
+
+def test_batches_are_written_in_background(monkeypatch):
+    written = []
+    writer_threads = set()
+
+    def save_check_results(results, **kwargs):
+        time.sleep(0.1)
+        writer_threads.add(threading.current_thread().name)
+        written.append([result.resource_id for result in results])
+
+    monkeypatch.setattr(sink_module.db, "save_check_results", save_check_results)
+
+    started_at = time.monotonic()
+    with CheckResultSink(batch_size=2) as sink:
+        for resource_id in range(5):
+            sink.add(CheckResult(resource_id=resource_id, status_code=200, is_available=True))
+        # results are only handed over to the writer, so adding them does not wait for DB
+        assert time.monotonic() - started_at < 0.1
+
+    assert written == [[0, 1], [2, 3], [4]]
+    assert threading.current_thread().name not in writer_threads
@@ -0,0 +1,32 @@
+import os
+
+import pytest
+from sqlalchemy import create_engine
+
+from src import app
+from src.web.app import db
+
+# tables are created in this database and dropped after every test, so it must not be the working one
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+
+@pytest.fixture
+def database(monkeypatch):
+    """
+    Session of the app bound to an empty schema in the test database. Skipped if it is not given.
+    Cache of responses is disabled, so writes do not need redis.
+    """
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+    monkeypatch.setitem(app.config["RESPONSE_CACHE"], "ENABLED", False)
+
+    engine = create_engine(TEST_DATABASE_URL)
+    with app.app_context():
+        monkeypatch.setitem(db.engines, None, engine)
+        db.metadata.create_all(engine)
+        try:
+            yield db
+        finally:
+            db.session.remove()
+            db.metadata.drop_all(engine)
+            engine.dispose()
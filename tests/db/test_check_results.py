@@ -0,0 +1,108 @@
+from src.checker.engine import CheckResult
+from src.db.models import (EventType, NewsFeedItem, ProbeOutcome, WebResource,
+                           WebResourceStatus)
+from src.service import db as db_service
+
+
+def make_resource(url: str) -> WebResource:
+    return WebResource(full_url=url, protocol="https", domain="down.com", domain_zone="com")
+
+
+def test_save_batch_without_status_codes(database):
+    resources = [make_resource(f"https://down.com/{i}") for i in range(3)]
+    database.session.add_all(resources)
+    database.session.commit()
+
+    # the whole batch has no http status, so the column of VALUES has only NULLs
+    outcomes = [ProbeOutcome.TIMEOUT, ProbeOutcome.CONNECTION_ERROR, ProbeOutcome.TIMEOUT]
+    db_service.save_check_results(
+        results=[
+            CheckResult(resource_id=resource.id, status_code=None, is_available=False, outcome=outcome)
+            for resource, outcome in zip(resources, outcomes)
+        ],
+        min_interval=600,
+        max_interval=3600,
+        backoff_factor=2,
+    )
+
+    database.session.expire_all()
+    for resource in resources:
+        assert resource.last_status_code is None
+        assert resource.last_is_available is False
+        assert resource.unavailable_count == 1
+        assert resource.check_interval == 600
+    assert WebResourceStatus.query.count() == 3
+
+
+def test_circuit_open_does_not_make_resource_deletable(database):
+    resource = make_resource("https://down.com/")
+    resource.last_status_code = 200
+    resource.last_is_available = True
+    resource.unavailable_count = 1
+    resource.check_interval = 1200
+    database.session.add(resource)
+    database.session.commit()
+    scheduled_at = resource.next_check_at
+
+    # breaker of the host stays open for several sweeps
+    for _ in range(3):
+        db_service.save_check_results(
+            results=[
+                CheckResult(
+                    resource_id=resource.id,
+                    status_code=None,
+                    is_available=False,
+                    was_available=True,
+                    outcome=ProbeOutcome.CIRCUIT_OPEN,
+                )
+            ],
+            min_interval=600,
+            max_interval=3600,
+            backoff_factor=2,
+        )
+
+    database.session.expire_all()
+    assert resource.unavailable_count == 1
+    assert resource.last_status_code == 200
+    assert resource.last_is_available is True
+    assert resource.check_interval == 1200
+    assert resource.next_check_at > scheduled_at
+    # skipped checks are still recorded
+    assert WebResourceStatus.query.filter_by(outcome=ProbeOutcome.CIRCUIT_OPEN).count() == 3
+    assert NewsFeedItem.query.filter_by(event_type=EventType.STATUS_CHANGED).count() == 0
+
+    deleted = db_service.delete_unavailable_web_resources(unavailable_count=2, batch_size=10)
+    assert deleted["resources"] == 0
+
+
+def test_claimed_resources_are_not_claimed_again(database):
+    resources = [make_resource(f"https://down.com/{i}") for i in range(3)]
+    database.session.add_all(resources)
+    database.session.commit()
+
+    claimed_ids = db_service.claim_due_web_resources(limit=10, claim_timeout=3600)
+
+    assert sorted(claimed_ids) == sorted(resource.id for resource in resources)
+    # claim is held until the check is saved or the claim times out
+    assert db_service.claim_due_web_resources(limit=10, claim_timeout=3600) == []
+
+
+def test_check_interval_grows_up_to_max_and_resets_after_status_change(database):
+    resource = make_resource("https://down.com/")
+    database.session.add(resource)
+    database.session.commit()
+
+    def save_check(is_available: bool) -> int:
+        db_service.save_check_results(
+            results=[CheckResult(resource_id=resource.id, status_code=200 if is_available else 503,
+                                 is_available=is_available, was_available=resource.last_is_available)],
+            min_interval=600,
+            max_interval=3600,
+            backoff_factor=2,
+        )
+        database.session.expire_all()
+        return resource.check_interval
+
+    assert [save_check(is_available=True) for _ in range(5)] == [600, 1200, 2400, 3600, 3600]
+    assert save_check(is_available=False) == 600
+    assert save_check(is_available=False) == 1200
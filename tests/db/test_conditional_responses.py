@@ -0,0 +1,53 @@
+import pytest
+from werkzeug.test import Client
+
+from src import app
+from src.db.models import FileProcessingRequest, StatusOption, WebResource
+
+
+@pytest.fixture
+def client(database):
+    return Client(app)
+
+
+@pytest.fixture
+def resource(database) -> WebResource:
+    resource = WebResource(full_url="https://example.com/", protocol="https", domain="example.com", domain_zone="com")
+    database.session.add(resource)
+    database.session.commit()
+    return resource
+
+
+def assert_not_modified_on_repeat(client: Client, url: str):
+    response = client.get(url)
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+
+    repeated = client.get(url, headers={"If-None-Match": etag})
+    assert repeated.status_code == 304
+    assert repeated.data == b""
+
+    changed = client.get(url, headers={"If-None-Match": '"other"'})
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] == etag
+
+
+@pytest.mark.parametrize("url", ["/api/resources", "/api/resources?cursor=", "/resources/"])
+def test_resource_lists(client, resource, url):
+    assert_not_modified_on_repeat(client, url)
+
+
+def test_resource_page(client, resource):
+    assert_not_modified_on_repeat(client, f"/resources/{resource.uuid}")
+
+    assert client.get("/resources/00000000-0000-0000-0000-000000000000").status_code == 404
+
+
+def test_processing_request_status(client, database):
+    processing_request = FileProcessingRequest(
+        status=StatusOption.SUCCEEDED, total_count=10, processed_count=10, errors_count=0,
+    )
+    database.session.add(processing_request)
+    database.session.commit()
+
+    assert_not_modified_on_repeat(client, f"/api/processing-requests/{processing_request.id}")
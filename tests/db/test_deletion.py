@@ -0,0 +1,43 @@
+from src import app, tasks
+from src.db.models import EventType, NewsFeedItem, WebResource, WebResourceStatus
+
+
+def test_unavailable_resources_are_deleted_in_batches(database, monkeypatch):
+    monkeypatch.setitem(app.config["PERIODIC_TASKS"]["DELETE_UNAVAILABLE_URLS"], "BATCH_SIZE", 2)
+
+    unavailable_counts = [2, 0, 3, 2, 1, 2, 5]
+    resources = [
+        WebResource(
+            full_url=f"https://example.com/{i}",
+            protocol="https",
+            domain="example.com",
+            domain_zone="com",
+            unavailable_count=unavailable_count,
+        )
+        for i, unavailable_count in enumerate(unavailable_counts)
+    ]
+    database.session.add_all(resources)
+    database.session.flush()
+    for resource in resources:
+        database.session.add(WebResourceStatus(resource_id=resource.id, status_code=503, is_available=False))
+        database.session.add(NewsFeedItem(resource_id=resource.id, event_type=EventType.STATUS_CHANGED))
+    database.session.commit()
+    kept_ids = {resource.id for resource in resources if resource.unavailable_count < 2}
+    deleted_urls = {resource.full_url for resource in resources if resource.unavailable_count >= 2}
+
+    summary = tasks.delete_unavailable_resources(unavailable_count=2)
+
+    assert summary["batches"] == 3
+    assert summary["resources"] == 5
+    assert summary["statuses"] == 5
+    assert summary["news_feed_items"] == 5
+
+    database.session.expire_all()
+    assert {resource_id for resource_id, in database.session.query(WebResource.id)} == kept_ids
+    assert {status.resource_id for status in WebResourceStatus.query} == kept_ids
+    assert NewsFeedItem.query.filter_by(event_type=EventType.STATUS_CHANGED).count() == 2
+
+    # one event per batch keeps urls of its deleted resources
+    deletion_items = NewsFeedItem.query.filter_by(event_type=EventType.RESOURCE_DELETED).all()
+    assert len(deletion_items) == 3
+    assert {url for item in deletion_items for url in item.details["urls"]} == deleted_urls
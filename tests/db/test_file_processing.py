@@ -0,0 +1,88 @@
+import io
+
+from src import app, tasks
+from src.db.models import (EventType, FileProcessingRequest, NewsFeedItem,
+                           StatusOption, WebResource)
+from src.service import db as db_service
+from src.utils.urlparser import split_url
+
+
+class FakeProgress:
+    """Progress that is not stored in redis."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+    def start(self, status, total=None, processed=0, errors=0):
+        pass
+
+    def add(self, processed, error_urls):
+        pass
+
+    def finish(self, status, total=None):
+        pass
+
+
+def test_failed_processing_is_retried_from_checkpoints(database, monkeypatch, tmp_path):
+    monkeypatch.setitem(app.config, "UPLOAD_FOLDER", str(tmp_path))
+    monkeypatch.setitem(app.config["UPLOAD_STORE"], "BACKEND", "local")
+    monkeypatch.setitem(app.config["FILE_PROCESSING"], "LINES_PER_TASK", 5)
+    monkeypatch.setitem(app.config["FILE_PROCESSING"], "CHUNK_SIZE", 2)
+    monkeypatch.setitem(app.config["URL_FILTER"], "ENABLED", False)
+    monkeypatch.setattr(tasks, "make_processing_progress", lambda task_id, request_id: FakeProgress())
+    monkeypatch.setattr(app.extensions["celery"].conf, "task_always_eager", True)
+
+    urls = [f"https://example{i}.com/" for i in range(12)]
+    upload_key = "urls.csv"
+    tasks.make_upload_store().save(upload_key, io.BytesIO("".join(f"{url}\n" for url in urls).encode()))
+    request_id = db_service.create_file_processing_request()
+
+    # the second batch of lines from 5 to 10 fails once, after its first batch is saved
+    save_processed_lines = db_service.save_processed_lines
+    calls = {"count": 0}
+
+    def fail_once(checkpoint, **kwargs):
+        if checkpoint.start_line == 5 and checkpoint.next_line == 7 and not calls["count"]:
+            calls["count"] += 1
+            raise RuntimeError("database is gone")
+        save_processed_lines(checkpoint=checkpoint, **kwargs)
+
+    monkeypatch.setattr(db_service, "save_processed_lines", fail_once)
+
+    tasks.process_uploaded_file.apply(kwargs={"upload_key": upload_key, "request_id": request_id})
+
+    processing_request = database.session.get(FileProcessingRequest, request_id)
+    assert processing_request.status == StatusOption.FAILED
+    assert processing_request.processed_count == 9
+    # file of failed processing is kept for retry
+    assert (tmp_path / upload_key).exists()
+
+    tasks.process_uploaded_file.apply(kwargs={"upload_key": upload_key, "request_id": request_id})
+
+    database.session.expire_all()
+    processing_request = database.session.get(FileProcessingRequest, request_id)
+    assert processing_request.status == StatusOption.SUCCEEDED
+    assert processing_request.total_count == 12
+    assert processing_request.processed_count == 12
+    assert sorted(url for url, in database.session.query(WebResource.full_url)) == sorted(urls)
+    assert not (tmp_path / upload_key).exists()
+
+
+def test_existing_urls_are_not_inserted_again(database):
+    existing = WebResource(full_url="https://example.com/", protocol="https", domain="example.com", domain_zone="com")
+    database.session.add(existing)
+    database.session.commit()
+
+    urls = ["https://example.com/", "https://example.org/", "https://example.net/", "https://example.org/"]
+    inserted_count = db_service.insert_web_resources([split_url(url) for url in urls])
+    database.session.commit()
+
+    assert inserted_count == 2
+    assert sorted(url for url, in database.session.query(WebResource.full_url)) == [
+        "https://example.com/", "https://example.net/", "https://example.org/",
+    ]
+    added_items = NewsFeedItem.query.filter_by(event_type=EventType.RESOURCE_ADDED).all()
+    assert sorted(item.resource.full_url for item in added_items) == ["https://example.net/", "https://example.org/"]
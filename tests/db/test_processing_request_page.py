@@ -0,0 +1,23 @@
+import pytest
+from werkzeug.test import Client
+
+from src import app
+from src.db.models import FileProcessingRequest, StatusOption
+from src.service import handlers
+
+
+@pytest.mark.parametrize("status", [StatusOption.PENDING, StatusOption.INPROCESS])
+def test_page_of_request_without_progress(database, monkeypatch, status):
+    # progress of processing is not in redis yet
+    monkeypatch.setattr(handlers, "get_processing_progress", lambda storage_client, task_id: None)
+    processing_request = FileProcessingRequest(status=status)
+    database.session.add(processing_request)
+    database.session.commit()
+
+    response = Client(app).get(f"/processing-requests/{processing_request.id}")
+
+    assert response.status_code == 200
+    page = response.get_data(as_text=True)
+    assert '<span id="processed">0</span>' in page
+    assert '<span id="progress">0</span>' in page
+    assert '<span id="errors-count">0</span>' in page
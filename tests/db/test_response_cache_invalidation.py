@@ -0,0 +1,52 @@
+import pytest
+
+from src import app
+from src.service import db as db_service
+from src.service import handlers
+from src.service.response_cache import ResponseCache
+
+
+class FakeRedis:
+    """Strings of redis that are enough for the generation of the cache."""
+
+    def __init__(self):
+        self.values = {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def incr(self, key):
+        self.values[key] = int(self.values.get(key, 0)) + 1
+        return self.values[key]
+
+
+@pytest.fixture
+def response_cache(database, monkeypatch) -> ResponseCache:
+    storage_client = FakeRedis()
+    monkeypatch.setitem(app.config["RESPONSE_CACHE"], "ENABLED", True)
+    monkeypatch.setitem(app.config["URL_FILTER"], "ENABLED", False)
+    monkeypatch.setitem(app.extensions, "redis", storage_client)
+    return ResponseCache(storage_client=storage_client)
+
+
+def test_created_resources_invalidate_cache(response_cache):
+    # resource added with the web form
+    db_service.create_web_resource("https://example.com/")
+    assert response_cache.get_generation() == 1
+
+    # resource posted to API
+    handlers.handle_post_url_json({"full_url": "https://example.org/"})
+    assert response_cache.get_generation() == 2
+
+    # resource inserted by import
+    checkpoint = db_service.get_or_create_file_processing_checkpoint(
+        request_id=db_service.create_file_processing_request(), start_line=0, stop_line=1,
+    )
+    db_service.save_processed_lines(
+        checkpoint=checkpoint,
+        web_resources=[dict(full_url="https://example.net/", protocol="https", domain="example.net",
+                            domain_zone="net", url_path="", query_params=None)],
+        errors=[],
+        processed_count=1,
+    )
+    assert response_cache.get_generation() == 3
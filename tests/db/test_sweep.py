@@ -0,0 +1,82 @@
+import time
+
+import pytest
+
+from src import app, tasks
+from src.checker.engine import CheckResult, ConnectionStats
+from src.db.models import WebResource
+
+
+class FakeChecker:
+    """Checker that makes no requests, resources with even index are available."""
+
+    def __init__(self):
+        self.connection_stats = ConnectionStats(connections_created=1, connections_reused=3)
+
+    def check(self, targets, on_result):
+        for target in targets:
+            if target.url.endswith("/fail"):
+                raise RuntimeError("worker lost")
+
+            time.sleep(0.01)
+            is_available = int(target.url.rsplit("/", 1)[-1]) % 2 == 0
+            on_result(CheckResult(
+                resource_id=target.resource_id,
+                status_code=200 if is_available else 503,
+                is_available=is_available,
+                was_available=target.was_available,
+            ))
+
+
+@pytest.fixture
+def summaries(database, monkeypatch) -> dict:
+    monkeypatch.setitem(app.config["CHECKER"], "CHUNK_SIZE", 3)
+    monkeypatch.setattr(tasks, "make_availability_checker", FakeChecker)
+    monkeypatch.setattr(app.extensions["celery"].conf, "task_always_eager", True)
+
+    # results of tasks are kept by spying on the chord callback
+    summaries = {}
+    summarize_sweep = tasks.summarize_sweep.run
+
+    def spy(chunk_summaries, started_at):
+        summaries["chunks"] = chunk_summaries
+        summaries["sweep"] = summarize_sweep(chunk_summaries, started_at=started_at)
+        return summaries["sweep"]
+
+    monkeypatch.setattr(tasks.summarize_sweep, "run", spy)
+    return summaries
+
+
+def test_sweep_is_split_into_id_ranges(database, summaries):
+    urls = [f"https://example.com/{i}" for i in range(7)] + ["https://example.com/fail"]
+    resources = [WebResource(full_url=url, protocol="https", domain="example.com", domain_zone="com") for url in urls]
+    database.session.add_all(resources)
+    database.session.commit()
+    # ranges contain the given number of resources regardless of gaps in ids
+    database.session.delete(resources[3])
+    database.session.commit()
+    ids = [resource.id for resource in resources if resource is not resources[3]]
+
+    tasks.get_response_from_resources.apply()
+
+    chunks = summaries["chunks"]
+    assert [(chunk["first_id"], chunk["last_id"]) for chunk in chunks] == [
+        (ids[0], ids[2]), (ids[3], ids[5]), (ids[6], ids[6]),
+    ]
+    assert [chunk["checked"] for chunk in chunks] == [3, 3, 0]
+    assert chunks[2]["error"] == "RuntimeError('worker lost')"
+
+    sweep = summaries["sweep"]
+    assert sweep["chunks"] == 3
+    assert sweep["failed_chunks"] == 1
+    assert sweep["checked"] == 6
+    # resources 0, 2, 4 and 6 are available
+    assert sweep["available"] == 4
+    assert sweep["unavailable"] == 2
+    assert sweep["status_changed"] == 6
+    assert sweep["connection_reuse_rate"] == 0.75
+    # chunks are run one by one by eager tasks
+    assert sweep["duration"] >= sum(chunk["duration"] for chunk in chunks)
+
+    database.session.expire_all()
+    assert WebResource.query.filter(WebResource.last_is_available.is_(True)).count() == 4
@@ -0,0 +1,20 @@
+from src.service import handlers
+
+
+class FakeUrlFilter:
+
+    def __init__(self):
+        self.urls = set()
+
+    def add(self, urls):
+        self.urls.update(urls)
+
+
+def test_resource_added_with_web_form_is_added_to_filter(database, monkeypatch):
+    url_filter = FakeUrlFilter()
+    monkeypatch.setattr(handlers, "make_url_filter", lambda: url_filter)
+
+    web_resource = handlers.handle_post_url_form("https://example.com/")
+
+    assert web_resource.uuid is not None
+    assert url_filter.urls == {"https://example.com/"}
@@ -0,0 +1,120 @@
+from src.service.progress import ProcessingProgress, get_processing_progress
+
+
+class FakePipeline:
+
+    def __init__(self, storage_client: "FakeRedis"):
+        self.storage_client = storage_client
+        self.commands = []
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.commands.append((name, args, kwargs))
+
+    def execute(self):
+        return [getattr(self.storage_client, name)(*args, **kwargs) for name, args, kwargs in self.commands]
+
+
+class FakeRedis:
+    """Hashes and lists of redis, values are returned as bytes like redis returns them."""
+
+    def __init__(self):
+        self.hashes = {}
+        self.lists = {}
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def delete(self, *keys):
+        for key in keys:
+            self.hashes.pop(key, None)
+            self.lists.pop(key, None)
+
+    def hset(self, key, field=None, value=None, mapping=None):
+        fields = self.hashes.setdefault(key, {})
+        for name, value in (mapping or {field: value}).items():
+            fields[name.encode()] = str(value).encode()
+
+    def hincrby(self, key, field, amount):
+        fields = self.hashes.setdefault(key, {})
+        fields[field.encode()] = str(int(fields.get(field.encode(), 0)) + amount).encode()
+        return int(fields[field.encode()])
+
+    def hgetall(self, key):
+        return self.hashes.get(key, {})
+
+    def rpush(self, key, *values):
+        self.lists.setdefault(key, []).extend(value.encode() for value in values)
+
+    def ltrim(self, key, start, stop):
+        self.lists[key] = self.lists.get(key, [])[start:stop + 1]
+
+    def lrange(self, key, start, stop):
+        return self.lists.get(key, [])[start:None if stop == -1 else stop + 1]
+
+
+def test_updates_are_flushed_every_lines():
+    updates = []
+    progress = ProcessingProgress(
+        storage_client=FakeRedis(), task_id="task", flush_every_lines=10, flush_interval=3600, on_update=updates.append,
+    )
+    progress.start(status="in_process")
+
+    progress.add(processed=4, error_urls=[])
+    progress.add(processed=4, error_urls=["bad"])
+    assert len(updates) == 1
+
+    progress.add(processed=4, error_urls=[])
+    assert updates[1:] == [{"processed": 12, "errors": 1, "error_urls": ["bad"]}]
+
+    # the rest is flushed when progress is closed
+    with progress:
+        progress.add(processed=1, error_urls=[])
+    assert updates[2:] == [{"processed": 13, "errors": 1, "error_urls": []}]
+
+
+def test_updates_are_flushed_after_interval():
+    updates = []
+    progress = ProcessingProgress(
+        storage_client=FakeRedis(), task_id="task", flush_every_lines=10000, flush_interval=0, on_update=updates.append,
+    )
+
+    progress.add(processed=1, error_urls=[])
+    progress.add(processed=1, error_urls=[])
+
+    assert [update["processed"] for update in updates] == [1, 2]
+
+
+def test_sample_of_error_urls_is_capped():
+    storage_client = FakeRedis()
+    progress = ProcessingProgress(storage_client=storage_client, task_id="task", errors_sample_size=3, flush_interval=0)
+    progress.start(status="in_process", total=10)
+
+    progress.add(processed=5, error_urls=["bad 1", "bad 2"])
+    progress.add(processed=5, error_urls=["bad 3", "bad 4", "bad 5"])
+
+    status = get_processing_progress(storage_client, "task")
+    assert status["errors"] == {"count": 5, "error_urls": ["bad 1", "bad 2", "bad 3"]}
+
+
+def test_counters_of_several_tasks_are_summed():
+    storage_client = FakeRedis()
+    updates = []
+    first, second = [
+        ProcessingProgress(
+            storage_client=storage_client, task_id="task", errors_sample_size=2, on_update=updates.append,
+        )
+        for _ in range(2)
+    ]
+    first.start(status="in_process", total=20)
+
+    with first, second:
+        first.add(processed=10, error_urls=["bad 1"])
+        second.add(processed=6, error_urls=["bad 2", "bad 3"])
+
+    status = get_processing_progress(storage_client, "task")
+    assert status["processed"] == 16
+    assert status["progress"] == 0.8
+    # the second task is closed first, and the sample is capped for all tasks
+    assert status["errors"] == {"count": 3, "error_urls": ["bad 2", "bad 3"]}
+    # update of every task carries counters summed by redis
+    assert [update["processed"] for update in updates[1:]] == [6, 16]
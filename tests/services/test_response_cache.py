@@ -0,0 +1,100 @@
+from src.service.response_cache import ResponseCache
+
+
+class FakePipeline:
+
+    def __init__(self, storage_client: "FakeRedis"):
+        self.storage_client = storage_client
+        self.commands = []
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.commands.append((name, args, kwargs))
+
+    def execute(self):
+        return [getattr(self.storage_client, name)(*args, **kwargs) for name, args, kwargs in self.commands]
+
+
+class FakeRedis:
+    """Commands of redis used by the cache, values are stored as bytes like redis returns them."""
+
+    def __init__(self):
+        self.values = {}
+        self.hashes = {}
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def set(self, key, value, ex=None):
+        self.values[key] = value
+
+    def incr(self, key):
+        self.values[key] = str(int(self.values.get(key, 0)) + 1).encode()
+
+    def hincrby(self, key, field, amount):
+        self._hincr(key, field, int(amount))
+
+    def hincrbyfloat(self, key, field, amount):
+        self._hincr(key, field, float(amount))
+
+    def _hincr(self, key, field, amount):
+        fields = self.hashes.setdefault(key, {})
+        fields[field.encode()] = str(float(fields.get(field.encode(), 0)) + amount).encode()
+
+    def hgetall(self, key):
+        return self.hashes.get(key, {})
+
+
+def test_params_are_normalized():
+    first = ResponseCache.normalize_params({"page": 1, "per_page": 10, "domain_zone": "ru", "uuid": None})
+    second = ResponseCache.normalize_params({"domain_zone": "ru", "availability": "", "per_page": 10, "page": 1})
+
+    assert first == second
+    assert first != ResponseCache.normalize_params({"page": 2, "per_page": 10, "domain_zone": "ru"})
+
+
+def test_response_is_built_once():
+    cache = ResponseCache(storage_client=FakeRedis())
+    builds = []
+
+    def build():
+        builds.append(1)
+        return b"response"
+
+    assert cache.get_or_build("resources", {"page": 1}, build) == b"response"
+    assert cache.get_or_build("resources", {"page": 1}, build) == b"response"
+    assert len(builds) == 1
+    # response of other parameters is built separately
+    cache.get_or_build("resources", {"page": 2}, build)
+    assert len(builds) == 2
+
+
+def test_invalidated_response_is_built_again():
+    cache = ResponseCache(storage_client=FakeRedis())
+
+    assert cache.get_or_build("resources", {}, lambda: b"old") == b"old"
+    cache.invalidate()
+
+    assert cache.get_generation() == 1
+    assert cache.get_or_build("resources", {}, lambda: b"new") == b"new"
+    assert cache.get_or_build("resources", {}, lambda: b"newer") == b"new"
+
+
+def test_hits_and_misses_are_counted():
+    cache = ResponseCache(storage_client=FakeRedis(), ttl=30)
+    for _ in range(3):
+        cache.get_or_build("resources", {}, lambda: b"response")
+    cache.invalidate()
+    cache.get_or_build("resources", {}, lambda: b"response")
+
+    stats = cache.get_stats()
+
+    assert stats["ttl"] == 30
+    assert stats["generation"] == 1
+    assert stats["hits"] == 2
+    assert stats["misses"] == 2
+    assert stats["hit_rate"] == 0.5
+    assert stats["average_hit_ms"] is not None
+    assert stats["average_miss_ms"] is not None
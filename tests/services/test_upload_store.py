@@ -0,0 +1,22 @@
+import io
+
+import pytest
+
+from src.service.upload_store import LocalUploadStore
+
+
+def test_local_upload_store(tmp_path):
+    store = LocalUploadStore(folder=str(tmp_path / "uploads"), chunk_size=10)
+    data = bytes(range(256)) * 3
+
+    assert store.save("upload.zip", io.BytesIO(data)) == len(data)
+    # partial file is not left after upload is complete
+    assert [path.name for path in (tmp_path / "uploads").iterdir()] == ["upload.zip"]
+
+    with store.open("upload.zip") as file:
+        file.seek(-6, io.SEEK_END)
+        assert file.read() == data[-6:]
+
+    store.delete("upload.zip")
+    with pytest.raises(FileNotFoundError):
+        store.open("upload.zip")
@@ -0,0 +1,44 @@
+from src.service.url_filter import UrlBloomFilter
+
+
+class FakeRedis:
+    """Commands of redis used by the filter besides its bitmap."""
+
+    def __init__(self):
+        self.values = {}
+        self.hashes = {}
+
+    def exists(self, key):
+        return int(key in self.values)
+
+    def hincrby(self, key, field, amount):
+        fields = self.hashes.setdefault(key, {})
+        fields[field] = fields.get(field, 0) + amount
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.values:
+            return None
+        self.values[key] = value
+        return True
+
+
+def test_rebuild_is_requested_once():
+    storage_client = FakeRedis()
+    url_filter = UrlBloomFilter(storage_client=storage_client, capacity=1000)
+
+    assert url_filter.request_rebuild()
+    # another worker sees that rebuild is pending already
+    assert not UrlBloomFilter(storage_client=storage_client, capacity=1000).request_rebuild()
+
+
+def test_false_positives_are_not_counted_until_filter_is_built():
+    storage_client = FakeRedis()
+    url_filter = UrlBloomFilter(storage_client=storage_client, capacity=1000)
+
+    # filter that is not built contains every url
+    url_filter.record_false_positives(3)
+    assert storage_client.hashes == {}
+
+    storage_client.values[url_filter.key] = b"bitmap"
+    url_filter.record_false_positives(3)
+    assert storage_client.hashes == {url_filter.stats_key: {"false_positives": 3}}
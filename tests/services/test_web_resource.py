@@ -39,6 +39,22 @@ class FakeProcessingRequestRepository(AbstractRepository):
         pass
 
 
+class FakeUrlFilter:
+
+    def __init__(self, urls: List[str]):
+        self.urls = set(urls)
+        self.false_positives = 0
+
+    def might_contain(self, urls):
+        return [url in self.urls for url in urls]
+
+    def record_false_positives(self, count):
+        self.false_positives += count
+
+    def add(self, urls):
+        self.urls.update(urls)
+
+
 empty_resource_repo = FakeResourceRepository([])
 processing_request_repo = FakeProcessingRequestRepository()
 
@@ -76,6 +92,27 @@ def test_error_while_creating_existing_resource():
         service.create_resource_from_url("http://example.com")
 
 
+def test_url_filter_skips_lookup_of_new_resource():
+    class NoLookupResourceRepository(FakeResourceRepository):
+        def get_by_full_url(self, url):
+            raise AssertionError("url missing in filter must not be looked up")
+
+    url_filter = FakeUrlFilter(["http://example.org"])
+    service = WebResourceService(NoLookupResourceRepository([]), processing_request_repo, url_filter=url_filter)
+    service.create_resource_from_url("http://example.com")
+
+    assert url_filter.urls == {"http://example.org", "http://example.com"}
+
+
+def test_url_filter_false_positive_is_checked_exactly():
+    url_filter = FakeUrlFilter(["http://example.com"])
+    service = WebResourceService(FakeResourceRepository([]), processing_request_repo, url_filter=url_filter)
+    result = service.create_resource_from_url("http://example.com")
+
+    assert result.full_url == "http://example.com"
+    assert url_filter.false_positives == 1
+
+
 def test_delete_resource():
     resource_repo = FakeResourceRepository(
         [
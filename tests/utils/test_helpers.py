@@ -0,0 +1,20 @@
+from flask import Flask, Response
+
+from src.utils.helpers import conditional_response
+
+app = Flask(__name__)
+
+
+def test_conditional_response():
+    with app.test_request_context("/"):
+        response = conditional_response(Response(b'{"items": []}', mimetype="application/json"))
+    etag, is_weak = response.get_etag()
+    assert response.status_code == 200 and etag and not is_weak
+
+    with app.test_request_context("/", headers={"If-None-Match": f'"{etag}"'}):
+        response = conditional_response(Response(b'{"items": []}', mimetype="application/json"))
+    assert response.status_code == 304
+
+    with app.test_request_context("/", headers={"If-None-Match": f'"{etag}"'}):
+        response = conditional_response(Response(b'{"items": [1]}', mimetype="application/json"))
+    assert response.status_code == 200
@@ -0,0 +1,83 @@
+import itertools
+import random
+from typing import Optional, Tuple
+
+from pydantic import ValidationError
+
+from src.schemes.web_resources import ResourceAddRequestSchema
+from src.utils.urlparser import split_url
+from src.utils.urlvalidator import (SCHEME_ERROR, UNPARSABLE_ERROR, InvalidUrl,
+                                   parse_urls, validate_http_url)
+
+SCHEMES = ["http://", "HTTPS://", "ftp://", "", "http:/"]
+USERINFO = ["", "user:pass@", "@", "us er@", "us?er@", "u[@"]
+HOSTS = [
+    "example.com", "sub.example.co.uk", "localhost", "127.0.0.1", "999.1.1.1", "[::1]", "[:a]",
+    "exa_mple.com", "-bad.com", "a" * 64 + ".com", "xn--80ak6aa92e.com", "пример.рф", "例子.测试",
+    "example.c0m", "example.com.", "ex..ample.com", "", "EXAMPLE.COM", "1.2.3",
+]
+PORTS = ["", ":65535", ":65536", ":", ":8a"]
+PATHS = ["", "/path/to/page", "/a b", "/путь", "/a;p", "/a;p/b", "/a\x01"]
+QUERIES = ["", "?", "?a=1&b=2", "?q=a b", "?x=1#frag", "#a#b"]
+PADDING = ["", " ", "\t", " \n"]
+
+
+def pydantic_url(line: str) -> Tuple[Optional[str], Optional[str]]:
+    """Return url validated by pydantic or type of its error."""
+    try:
+        return ResourceAddRequestSchema.parse_obj({"full_url": line}).full_url, None
+    except ValidationError as e:
+        return None, e.errors()[0]["type"]
+
+
+def split_pydantic_url(line: str) -> Tuple[Optional[dict], Optional[str]]:
+    url, reason = pydantic_url(line)
+    if url is None:
+        return None, reason
+    try:
+        return split_url(url), None
+    except ValueError:
+        return None, UNPARSABLE_ERROR
+
+
+def assert_same_as_pydantic(lines):
+    parsed = parse_urls(lines)
+    expected = [split_pydantic_url(line) for line in lines]
+
+    assert parsed.valid == [parts for parts, _ in expected if parts is not None]
+    assert parsed.invalid == [
+        InvalidUrl(index=index, line=line, reason=reason)
+        for index, (line, (parts, reason)) in enumerate(zip(lines, expected)) if parts is None
+    ]
+
+    for line in lines:
+        assert validate_http_url(line) == pydantic_url(line)[0], line
+
+
+def test_validator_matches_pydantic_on_url_grid():
+    lines = [
+        "".join(parts)
+        for parts in itertools.product(SCHEMES, USERINFO, HOSTS, PORTS, PATHS, QUERIES)
+    ]
+
+    assert_same_as_pydantic(lines)
+
+
+def test_validator_matches_pydantic_on_random_lines():
+    rng = random.Random(42)
+    alphabet = "ab.-_:/?#@[];%=&1 9ü\t\x1f"
+    lines = [
+        rng.choice(PADDING) + rng.choice(SCHEMES) + "".join(rng.choices(alphabet, k=rng.randint(0, 20)))
+        for _ in range(20000)
+    ]
+
+    assert_same_as_pydantic(lines)
+
+
+def test_parse_urls():
+    lines = [" https://example.com/path?a=1 ", "not a url", "http://пример.рф/"]
+
+    parsed = parse_urls(lines)
+
+    assert parsed.invalid == [InvalidUrl(index=1, line="not a url", reason=SCHEME_ERROR)]
+    assert parsed.valid == [split_url("https://example.com/path?a=1"), split_url("http://xn--e1afmkfd.xn--p1ai/")]
@@ -0,0 +1,112 @@
+import gzip
+import io
+import json
+import zipfile
+
+import pytest
+
+from src.service import exceptions
+from src.utils import ziploader
+
+
+def make_archive(lines, name="urls.csv") -> io.BytesIO:
+    return make_multi_file_archive({name: lines})
+
+
+def make_multi_file_archive(files) -> io.BytesIO:
+    file = io.BytesIO()
+    with zipfile.ZipFile(file, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, lines in files.items():
+            archive.writestr(name, "".join(f"{line}\n" for line in lines))
+    return file
+
+
+def test_iter_line_chunks():
+    lines = [f"https://example{i}.com/" for i in range(25)]
+    zip_file = make_archive(lines)
+
+    chunks = list(ziploader.iter_line_chunks(zip_file, "urls.zip", chunk_size=10))
+
+    assert [len(chunk.lines) for chunk in chunks] == [10, 10, 5]
+    assert [chunk.line_offset for chunk in chunks] == [0, 10, 20]
+    assert [line for chunk in chunks for line in chunk.lines] == lines
+
+
+def test_iter_line_chunks_without_csv():
+    zip_file = make_archive(["https://example.com/"], name="urls.txt")
+
+    with pytest.raises(exceptions.NoCSVFileError):
+        list(ziploader.iter_line_chunks(zip_file, "urls.zip"))
+
+
+def test_iter_line_chunks_line_range():
+    lines = [f"https://example{i}.com/" for i in range(25)]
+    zip_file = make_archive(lines)
+
+    chunks = list(ziploader.iter_line_chunks(zip_file, "urls.zip", chunk_size=4, start_line=5, stop_line=15))
+
+    assert ziploader.count_lines(zip_file, "urls.zip") == 25
+    assert [chunk.line_offset for chunk in chunks] == [5, 9, 13]
+    assert [line for chunk in chunks for line in chunk.lines] == lines[5:15]
+
+
+def test_all_files_of_archive_are_read():
+    first_lines = [f"https://first{i}.com/" for i in range(7)]
+    second_lines = [json.dumps({"url": f"https://second{i}.com/"}) for i in range(5)]
+    zip_file = make_multi_file_archive({
+        "b/second.ndjson": second_lines,
+        "a/first.csv": first_lines,
+        "readme.txt": ["not urls"],
+    })
+
+    chunks = list(ziploader.iter_line_chunks(zip_file, "urls.zip", chunk_size=4, start_line=5))
+
+    # files are read in order of their names and numbered as one file
+    assert ziploader.count_lines(zip_file, "urls.zip") == 12
+    assert [chunk.line_offset for chunk in chunks] == [5, 9]
+    assert [line for chunk in chunks for line in chunk.lines] == (
+        first_lines[5:] + [f"https://second{i}.com/" for i in range(5)]
+    )
+
+
+@pytest.mark.parametrize("filename", ["urls.csv", "urls.csv.gz", "urls.ndjson", "urls.ndjson.gz"])
+def test_line_formats(filename):
+    urls = [f"https://example{i}.com/" for i in range(10)]
+    if "ndjson" in filename:
+        # urls are taken from objects or strings, other lines are kept as is to be reported as invalid
+        lines = [json.dumps({"url": url}) if i % 2 else json.dumps(url) for i, url in enumerate(urls)]
+        lines += ['{"link": "https://example.com/"}', "not json", ""]
+        expected = urls + ['{"link": "https://example.com/"}', "not json"]
+    else:
+        lines = urls + [""]
+        expected = urls
+
+    data = "".join(f"{line}\n" for line in lines).encode()
+    file = io.BytesIO(gzip.compress(data) if filename.endswith(".gz") else data)
+
+    chunks = list(ziploader.iter_line_chunks(file, filename, chunk_size=4))
+
+    assert [line for chunk in chunks for line in chunk.lines] == expected
+
+
+def test_get_file_format():
+    assert ziploader.get_file_format("URLS.CSV.GZ") == ziploader.CSV_GZ
+    assert ziploader.get_file_format("urls.ndjson") == ziploader.NDJSON
+    assert ziploader.get_file_format("urls.gz") is None
+    assert ziploader.make_uuid_filename("urls.csv.gz").endswith(".csv.gz")
+
+
+@pytest.mark.filterwarnings("error::pytest.PytestUnraisableExceptionWarning")
+@pytest.mark.parametrize("filename", ["urls.zip", "urls.csv", "urls.csv.gz"])
+def test_reading_is_abandoned_after_file_is_closed(filename):
+    data = "".join(f"https://example{i}.com/\n" for i in range(10)).encode()
+    if filename == "urls.zip":
+        file = make_archive([f"https://example{i}.com/" for i in range(10)])
+    else:
+        file = io.BytesIO(gzip.compress(data) if filename.endswith(".gz") else data)
+
+    chunks = ziploader.iter_line_chunks(file, filename, chunk_size=4)
+    next(chunks)
+    # a task failed while processing the chunk, its file is closed before the reader is collected
+    file.close()
+    chunks.close()